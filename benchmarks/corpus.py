@@ -0,0 +1,85 @@
+"""Deterministic synthetic corpus shaped like Dataiku documentation exports."""
+
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+
+TOPICS = {
+    "preparation": ["processors", "formulas", "filtering", "dates"],
+    "recipes": ["join", "group", "window", "stack", "sync"],
+    "ml": ["models", "features", "evaluation", "deployment"],
+    "flow": ["zones", "datasets", "scenarios", "partitions"],
+    "administration": ["security", "connections", "code-envs", "logs"],
+}
+VERSIONS = ["12", "13", "14"]
+VOCABULARY = (
+    "dataset recipe flow scenario partition column schema visual prepare join group window "
+    "stack sync model feature deploy api notebook project bundle connection plugin trigger "
+    "metric check webapp dashboard insight variable python sql spark kubernetes cluster "
+    "managed folder output input build run job step filter formula aggregate sample"
+).split()
+QUESTIONS = [
+    "How do I create a join recipe between two datasets?",
+    "How can I schedule a scenario to rebuild a partitioned dataset?",
+    "Which processors clean date columns in a prepare recipe?",
+    "How do I deploy a model to an API node?",
+    "How do I configure a SQL connection for a project?",
+    "How can I aggregate values with a group recipe?",
+    "How do I add a metric check to a dataset?",
+    "Where do I manage code environments for Python recipes?",
+]
+
+
+def generate_corpus(
+    target_dir: str | Path,
+    num_chunks: int,
+    chunk_size: int = 500,
+    chunk_overlap: int = 100,
+    chunks_per_document: int = 4,
+    documents_per_file: int = 500,
+    seed: int = 7,
+) -> dict[str, int]:
+    """Write JSON-list export files that chunk into approximately ``num_chunks`` chunks."""
+    target = Path(target_dir)
+    target.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    stride = chunk_size - chunk_overlap
+    words_per_document = chunk_size + stride * (chunks_per_document - 1)
+    num_documents = max(1, -(-num_chunks // chunks_per_document))
+    topics = sorted(TOPICS)
+
+    files = 0
+    batch: list[dict[str, str]] = []
+    for index in range(num_documents):
+        topic = topics[index % len(topics)]
+        subtopic = TOPICS[topic][rng.randrange(len(TOPICS[topic]))]
+        version = VERSIONS[index % len(VERSIONS)]
+        words = rng.choices(VOCABULARY, k=words_per_document)
+        batch.append(
+            {
+                "id": f"doc-{index}",
+                "url": f"https://doc.dataiku.com/dss/{version}/{topic}/{subtopic}/{index}.html",
+                "title": f"{topic.title()} {subtopic} guide {index}",
+                "topic": topic,
+                "subtopic": subtopic,
+                "version": version,
+                "page_name": f"{index}.html",
+                "content": " ".join(words),
+            }
+        )
+        if len(batch) >= documents_per_file:
+            _write_batch(target, files, batch)
+            files += 1
+            batch = []
+    if batch:
+        _write_batch(target, files, batch)
+        files += 1
+
+    return {"documents": num_documents, "files": files, "chunks": num_documents * chunks_per_document}
+
+
+def _write_batch(target: Path, file_index: int, batch: list[dict[str, str]]) -> None:
+    path = target / f"export_{file_index:05d}.json"
+    path.write_text(json.dumps(batch), encoding="utf-8")
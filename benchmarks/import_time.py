@@ -0,0 +1,83 @@
+"""Cold-start import profile based on ``python -X importtime``.
+
+Usage::
+
+    python -m benchmarks.import_time dataiku_tutor.ingestion.pipeline dataiku_tutor.main --top 15
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Modules that must only be imported when their feature is actually used.
+HEAVY_MODULES = ("torch", "sentence_transformers", "transformers", "faiss", "numpy", "gradio", "httpx")
+
+
+@dataclass
+class ImportProfile:
+    """Per-module import cost of one cold interpreter start."""
+
+    target: str
+    cumulative_us: dict[str, int] = field(default_factory=dict)
+    self_us: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total_ms(self) -> float:
+        """Cumulative import time of the target module itself."""
+        return self.cumulative_us.get(self.target, 0) / 1000.0
+
+    def heavy_modules(self) -> list[str]:
+        return sorted(name for name in self.cumulative_us if name.split(".")[0] in HEAVY_MODULES)
+
+    def top(self, count: int) -> list[tuple[str, int]]:
+        return sorted(self.self_us.items(), key=lambda item: item[1], reverse=True)[:count]
+
+
+def profile_imports(target: str, setup: str = "") -> ImportProfile:
+    """Import ``target`` (after running ``setup``) in a fresh interpreter with ``-X importtime``."""
+    code = f"{setup}\nimport {target}" if setup else f"import {target}"
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(REPO_ROOT), os.environ.get("PYTHONPATH")])))
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    profile = ImportProfile(target=target)
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_part, cumulative_part, name = line[len("import time:") :].split("|", 2)
+        if not self_part.strip().isdigit():
+            continue  # header row
+        module = name.strip()
+        profile.self_us[module] = int(self_part)
+        profile.cumulative_us[module] = int(cumulative_part)
+    return profile
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("targets", nargs="*", default=["dataiku_tutor.ingestion.pipeline", "dataiku_tutor.main"])
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    for target in args.targets:
+        profile = profile_imports(target)
+        heavy = profile.heavy_modules()
+        print(f"{target}: {profile.total_ms:.1f} ms cumulative; heavy modules: {', '.join(heavy) or 'none'}")
+        for module, self_us in profile.top(args.top):
+            print(f"  {self_us / 1000.0:8.2f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
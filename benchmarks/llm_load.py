@@ -0,0 +1,83 @@
+"""Offline load test of ``HTTPLLMClient`` against the mock completions server.
+
+Usage::
+
+    python -m benchmarks.llm_load --requests 500 --concurrency 32 --distinct 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.run import percentile
+from dataiku_tutor.generation.llm_client import HTTPLLMClient, LLMClientError
+from dataiku_tutor.generation.mock_llm_server import MockLLMServer
+
+
+def run_load(
+    base_url: str,
+    requests: int,
+    concurrency: int,
+    distinct: int,
+    max_connections: int,
+) -> dict[str, float]:
+    client = HTTPLLMClient(base_url, model="mock", max_connections=max_connections, backoff_base=0.01)
+    prompts = [f"Question: how do I build dataset {idx % distinct}?" for idx in range(requests)]
+    latencies: list[float] = []
+    errors = 0
+
+    def call(prompt: str) -> float | None:
+        started = time.perf_counter()
+        try:
+            client.complete(prompt)
+        except LLMClientError:
+            return None
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for latency in pool.map(call, prompts):
+            if latency is None:
+                errors += 1
+            else:
+                latencies.append(latency)
+    elapsed = time.perf_counter() - started
+    client.close()
+
+    return {
+        "requests": requests,
+        "errors": errors,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default=None, help="Target server; an in-process mock is started when omitted")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--distinct", type=int, default=50, help="Number of distinct prompts (lower = more coalescing)")
+    parser.add_argument("--max-connections", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    if args.base_url:
+        result = run_load(args.base_url, args.requests, args.concurrency, args.distinct, args.max_connections)
+    else:
+        with MockLLMServer(latency=args.latency_ms / 1000.0, fail_rate=args.fail_rate) as server:
+            result = run_load(server.url, args.requests, args.concurrency, args.distinct, args.max_connections)
+            result["upstream_requests"] = server.requests
+            result["upstream_connections"] = server.connections
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""Reproducible ingestion, search and end-to-end latency benchmarks.
+
+Usage::
+
+    python -m benchmarks.run --chunks 10000 100000 --backends faiss sharded \\
+        --output bench_results.json
+
+Every (size, backend) case runs in a fresh process so peak RSS is attributable to it.
+Embeddings use the deterministic hash provider, so no model is downloaded. Results are
+compared against the committed reference run in ``benchmarks/baseline.json``; timings are
+machine-dependent, so re-record it with ``--update-baseline`` on the host that runs the
+comparison.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import math
+import multiprocessing
+import platform
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from benchmarks.corpus import QUESTIONS, generate_corpus
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+CORPUS_PARAMETERS = ("chunks", "backends", "queries", "chunk_size", "chunk_overlap", "seed")
+
+# Metric name -> True when larger is better.
+METRIC_DIRECTIONS = {
+    "docs_per_sec": True,
+    "chunks_per_sec": True,
+    "search_qps": True,
+    "search_p50_ms": False,
+    "search_p95_ms": False,
+    "search_p99_ms": False,
+    "query_p50_ms": False,
+    "query_p95_ms": False,
+    "query_p99_ms": False,
+    "peak_rss_mb": False,
+    "index_bytes": False,
+}
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = math.ceil(pct / 100.0 * len(ordered))
+    return ordered[max(0, min(len(ordered), rank) - 1)]
+
+
+def _store_config(backend: str, store_dir: Path) -> dict[str, Any]:
+    if backend == "sharded":
+        return {"type": "sharded", "shard_dir": str(store_dir / "shards"), "shard_key": "version"}
+    return {
+        "type": backend,
+        "index_path": str(store_dir / "faiss.index"),
+        "metadata_path": str(store_dir / "faiss_metadata.json"),
+    }
+
+
+def _directory_size(path: Path) -> int:
+    return sum(item.stat().st_size for item in path.rglob("*") if item.is_file())
+
+
+def run_case(num_chunks: int, backend: str, queries: int, chunk_size: int, chunk_overlap: int, seed: int) -> dict[str, Any]:
+    """Index a synthetic corpus into ``backend`` and measure throughput and latency."""
+    from dataiku_tutor.embeddings.embedding_service import HashEmbeddingService
+    from dataiku_tutor.ingestion.chunker import DocumentationChunker
+    from dataiku_tutor.ingestion.loader import DocumentationLoader
+    from dataiku_tutor.ingestion.updater import IndexUpdater
+    from dataiku_tutor.vectorstore.faiss_store import VectorStoreFactory
+
+    with tempfile.TemporaryDirectory(prefix="dataiku-tutor-bench-") as tmp:
+        tmp_path = Path(tmp)
+        corpus = generate_corpus(
+            tmp_path / "docs", num_chunks, chunk_size=chunk_size, chunk_overlap=chunk_overlap, seed=seed
+        )
+        store_dir = tmp_path / "store"
+        embedding_service = HashEmbeddingService()
+        vector_store = VectorStoreFactory.create(_store_config(backend, store_dir))
+        updater = IndexUpdater(
+            DocumentationLoader(),
+            DocumentationChunker(chunk_size=chunk_size, overlap=chunk_overlap),
+            embedding_service,
+            vector_store,
+        )
+
+        started = time.perf_counter()
+        indexed = updater.run_full_reindex(str(tmp_path / "docs"))
+        ingest_seconds = time.perf_counter() - started
+
+        rng = random.Random(seed)
+        questions = [rng.choice(QUESTIONS) + f" #{idx}" for idx in range(queries)]
+        query_vectors = embedding_service.embed(questions)
+
+        search_latencies: list[float] = []
+        search_started = time.perf_counter()
+        for vector in query_vectors:
+            started = time.perf_counter()
+            vector_store.search(vector, k=5)
+            search_latencies.append((time.perf_counter() - started) * 1000.0)
+        search_seconds = time.perf_counter() - search_started
+
+        # End-to-end retrieval: query embedding plus vector search, as served by /query.
+        query_latencies: list[float] = []
+        for question in questions:
+            started = time.perf_counter()
+            vector_store.search(embedding_service.embed([question])[0], k=5)
+            query_latencies.append((time.perf_counter() - started) * 1000.0)
+
+        close = getattr(vector_store, "close", None)
+        if callable(close):
+            close()
+
+        return {
+            "backend": backend,
+            "chunks": indexed,
+            "documents": corpus["documents"],
+            "ingest_seconds": round(ingest_seconds, 4),
+            "docs_per_sec": round(corpus["documents"] / ingest_seconds, 2),
+            "chunks_per_sec": round(indexed / ingest_seconds, 2),
+            "search_p50_ms": round(percentile(search_latencies, 50), 4),
+            "search_p95_ms": round(percentile(search_latencies, 95), 4),
+            "search_p99_ms": round(percentile(search_latencies, 99), 4),
+            "search_mean_ms": round(statistics.fmean(search_latencies), 4) if search_latencies else 0.0,
+            "search_qps": round(queries / search_seconds, 2) if search_seconds > 0 else 0.0,
+            "query_p50_ms": round(percentile(query_latencies, 50), 4),
+            "query_p95_ms": round(percentile(query_latencies, 95), 4),
+            "query_p99_ms": round(percentile(query_latencies, 99), 4),
+            "index_bytes": _directory_size(store_dir),
+            "peak_rss_mb": round(_peak_rss_mb(), 2),
+        }
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes on Linux.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    """Return human-readable regressions of ``results`` against ``baseline`` beyond ``tolerance``."""
+    regressions: list[str] = []
+    baseline_cases = {case_key(case): case for case in baseline.get("cases", [])}
+    for case in results.get("cases", []):
+        reference = baseline_cases.get(case_key(case))
+        if reference is None:
+            continue
+        for metric, higher_is_better in METRIC_DIRECTIONS.items():
+            current, previous = case.get(metric), reference.get(metric)
+            if not isinstance(current, (int, float)) or not isinstance(previous, (int, float)) or previous <= 0:
+                continue
+            change = (current - previous) / previous
+            if (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance):
+                regressions.append(f"{case_key(case)} {metric}: {previous} -> {current} ({change:+.1%})")
+    return regressions
+
+
+def case_key(case: dict[str, Any]) -> str:
+    return f"{case['backend']}:{case['requested_chunks']}"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, nargs="+", default=[10000])
+    parser.add_argument("--backends", nargs="+", default=["faiss", "sharded"])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--chunk-overlap", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="baseline JSON to compare against")
+    parser.add_argument("--no-baseline", action="store_true", help="skip the baseline comparison")
+    parser.add_argument("--update-baseline", action="store_true", help="write the results to --baseline instead")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression")
+    args = parser.parse_args(argv)
+
+    cases: list[dict[str, Any]] = []
+    context = multiprocessing.get_context("spawn")
+    for num_chunks in args.chunks:
+        for backend in args.backends:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                case = executor.submit(
+                    run_case, num_chunks, backend, args.queries, args.chunk_size, args.chunk_overlap, args.seed
+                ).result()
+            case["requested_chunks"] = num_chunks
+            cases.append(case)
+            print(
+                f"{backend:>8} {case['chunks']:>8} chunks: {case['docs_per_sec']:>9.1f} docs/s, "
+                f"search p50/p95/p99 {case['search_p50_ms']:.2f}/{case['search_p95_ms']:.2f}/"
+                f"{case['search_p99_ms']:.2f} ms, {case['search_qps']:.0f} qps, "
+                f"rss {case['peak_rss_mb']:.0f} MB, index {case['index_bytes'] / 1e6:.1f} MB"
+            )
+
+    results = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "faiss": importlib.util.find_spec("faiss") is not None,
+        },
+        "parameters": {name: getattr(args, name) for name in CORPUS_PARAMETERS},
+        "cases": cases,
+    }
+    Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"Wrote {args.output}")
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        baseline_path.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"Updated baseline {baseline_path}")
+        return 0
+    if args.no_baseline:
+        return 0
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; record one with --update-baseline")
+        return 0
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    recorded = baseline.get("environment", {})
+    if recorded.get("faiss", results["environment"]["faiss"]) != results["environment"]["faiss"]:
+        # The pure-Python fallback index is orders of magnitude slower; the numbers are not comparable.
+        print(f"Baseline {baseline_path} was recorded with faiss={recorded['faiss']}; skipping the comparison")
+        return 0
+    print(f"Comparing against {baseline_path} (recorded on {recorded.get('platform', 'unknown')})")
+    regressions = compare(results, baseline, args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
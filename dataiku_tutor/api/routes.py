@@ -1,35 +1,106 @@
 """FastAPI route definitions for query and index management endpoints."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel, Field
 
+from dataiku_tutor.domain.models import QueryRequest
+from dataiku_tutor.orchestration.admission import Overloaded
+
 
 class QueryPayload(BaseModel):
     question: str = Field(..., description="User question about Dataiku workflows")
     top_k: int = Field(default=5, ge=1, le=20)
     mode: str = Field(default="hybrid", pattern="^(semantic|keyword|hybrid)$")
+    priority: int = Field(default=0, ge=0, le=9, description="Lower values are served first when queued")
+    deadline_ms: int | None = Field(default=None, ge=1, description="Reject early if no answer is possible in time")
 
 
 class QueryResult(BaseModel):
     answer: str
     sources: list[dict]
+    mode: str
+    degraded: bool = False
+    usage: dict[str, int] = Field(default_factory=dict)
+
+
+class ReindexPayload(BaseModel):
+    source_path: str | None = Field(
+        default=None, description="Sub-path of the configured documentation source to index instead of all of it"
+    )
 
 
 class ReindexResult(BaseModel):
-    indexed_chunks: int
+    job_id: str
     status: str
+    source_path: str
+    progress: dict[str, int]
+    indexed_chunks: int
+    error: str | None = None
+    created_at: float
+    started_at: float | None = None
+    finished_at: float | None = None
 
 
-def build_router(tutor_service, index_updater) -> APIRouter:
+def build_router(tutor_service, reindex_jobs) -> APIRouter:
     """Create API router with injected application services."""
     router = APIRouter()
 
+    def jobs_manager():
+        if reindex_jobs is None:
+            raise HTTPException(status_code=503, detail="Reindexing is not configured")
+        return reindex_jobs
+
+    def job_result(job) -> ReindexResult:
+        if job is None:
+            raise HTTPException(status_code=404, detail="Unknown reindex job")
+        return ReindexResult(**job.as_dict())
+
     @router.post("/query", response_model=QueryResult)
-    def query(payload: QueryPayload) -> QueryResult:
-        raise NotImplementedError
+    def query(payload: QueryPayload, request: Request) -> QueryResult:
+        if tutor_service is None:
+            raise HTTPException(status_code=503, detail="Query service is not configured")
+        # Per-client limits key on the peer address; a client-supplied header would let callers pick fresh ids.
+        client_id = request.client.host if request.client else "anonymous"
+        try:
+            response = tutor_service.answer(
+                QueryRequest(
+                    question=payload.question,
+                    top_k=payload.top_k,
+                    mode=payload.mode,
+                    client_id=client_id,
+                    priority=payload.priority,
+                    deadline_ms=payload.deadline_ms,
+                )
+            )
+        except Overloaded as exc:
+            raise HTTPException(
+                status_code=exc.status_code,
+                detail=f"Server busy ({exc.reason}); retry later",
+                headers={"Retry-After": exc.retry_after_header},
+            ) from exc
+        return QueryResult(
+            answer=response.answer,
+            sources=response.sources,
+            mode=response.mode,
+            degraded=response.degraded,
+            usage=response.usage,
+        )
+
+    @router.post("/reindex", response_model=ReindexResult, status_code=202)
+    def reindex(payload: ReindexPayload | None = None) -> ReindexResult:
+        """Start a background full reindex and return its job id immediately."""
+        try:
+            job = jobs_manager().submit(payload.source_path if payload else None)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        return job_result(job)
+
+    @router.get("/reindex/{job_id}", response_model=ReindexResult)
+    def reindex_status(job_id: str) -> ReindexResult:
+        return job_result(jobs_manager().get(job_id))
 
-    @router.post("/reindex", response_model=ReindexResult)
-    def reindex() -> ReindexResult:
-        raise NotImplementedError
+    @router.delete("/reindex/{job_id}", response_model=ReindexResult)
+    def cancel_reindex(job_id: str) -> ReindexResult:
+        return job_result(jobs_manager().cancel(job_id))
 
     return router
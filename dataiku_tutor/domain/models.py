@@ -40,6 +40,9 @@ class QueryRequest:
     question: str
     top_k: int = 5
     mode: str = "hybrid"
+    client_id: str = "anonymous"
+    priority: int = 0
+    deadline_ms: float | None = None
 
 
 @dataclass(frozen=True)
@@ -48,4 +51,7 @@ class QueryResponse:
 
     answer: str
     sources: list[dict[str, Any]] = field(default_factory=list)
+    usage: dict[str, int] = field(default_factory=dict)
+    mode: str = ""
+    degraded: bool = False
     generated_at: datetime = field(default_factory=datetime.utcnow)
@@ -0,0 +1,148 @@
+"""Multi-process embedding pool for CPU-only ingestion hosts."""
+
+from __future__ import annotations
+
+import multiprocessing
+import queue
+from typing import Any
+
+from dataiku_tutor.embeddings.embedding_service import EmbeddingFactory, EmbeddingService
+
+_STOP = None
+
+
+def _worker_loop(provider: str, model_name: str, tasks: Any, results: Any) -> None:
+    """Load the provider once per process and embed batches until a stop sentinel arrives."""
+    try:
+        service = EmbeddingFactory.create(provider=provider, model_name=model_name)
+    except Exception as exc:
+        results.put((-1, None, f"{type(exc).__name__}: {exc}"))
+        return
+
+    while True:
+        task = tasks.get()
+        if task is _STOP:
+            break
+        batch_id, texts = task
+        try:
+            results.put((batch_id, service.embed(texts), None))
+        except Exception as exc:
+            results.put((batch_id, None, f"{type(exc).__name__}: {exc}"))
+
+
+class EmbeddingPool(EmbeddingService):
+    """Shards embedding batches across worker processes, each holding its own model copy.
+
+    At most ``max_pending`` batches are in flight at once, which bounds both queues and
+    applies back-pressure to the caller. Results are reassembled in input order. A call
+    only spreads across workers if it holds several batches, so callers should pass
+    ``texts_per_call()`` texts at a time.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        model_name: str,
+        workers: int,
+        batch_size: int = 32,
+        max_pending: int | None = None,
+        start_method: str = "spawn",
+        result_timeout: float = 300.0,
+    ) -> None:
+        if workers <= 0:
+            raise ValueError("workers must be > 0")
+        if batch_size <= 0:
+            raise ValueError("batch_size must be > 0")
+        self.provider = provider
+        self.model_name = model_name
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_pending = max_pending or workers * 2
+        self.result_timeout = result_timeout
+        self._context = multiprocessing.get_context(start_method)
+        self._processes: list[Any] = []
+        self._tasks: Any = None
+        self._results: Any = None
+        self.peak_in_flight = 0
+
+    def texts_per_call(self, batch_size: int | None = None) -> int:
+        """Texts that fill every in-flight slot with a ``batch_size`` worker batch."""
+        return self.max_pending * self.batch_size
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        if not texts:
+            return []
+        self._ensure_started()
+
+        batches = [texts[start : start + self.batch_size] for start in range(0, len(texts), self.batch_size)]
+        completed: dict[int, list[list[float]]] = {}
+        next_batch = 0
+        in_flight = 0
+
+        while len(completed) < len(batches):
+            while next_batch < len(batches) and in_flight < self.max_pending:
+                self._tasks.put((next_batch, batches[next_batch]))
+                next_batch += 1
+                in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, in_flight)
+
+            batch_id, vectors, error = self._next_result()
+            in_flight -= 1
+            if error is not None:
+                self.close()
+                raise RuntimeError(f"embedding worker failed: {error}")
+            completed[batch_id] = vectors
+
+        return [vector for batch_id in range(len(batches)) for vector in completed[batch_id]]
+
+    def close(self) -> None:
+        """Stop worker processes; the pool restarts them on the next ``embed`` call."""
+        if not self._processes:
+            return
+        for _ in self._processes:
+            try:
+                self._tasks.put(_STOP, timeout=1.0)
+            except queue.Full:
+                break
+        for process in self._processes:
+            process.join(timeout=5.0)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self._processes = []
+        self._tasks = None
+        self._results = None
+
+    def __enter__(self) -> "EmbeddingPool":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _ensure_started(self) -> None:
+        if self._processes:
+            return
+        self._tasks = self._context.Queue(maxsize=self.max_pending)
+        self._results = self._context.Queue(maxsize=self.max_pending)
+        for _ in range(self.workers):
+            process = self._context.Process(
+                target=_worker_loop,
+                args=(self.provider, self.model_name, self._tasks, self._results),
+                daemon=True,
+            )
+            process.start()
+            self._processes.append(process)
+
+    def _next_result(self) -> tuple[int, list[list[float]] | None, str | None]:
+        waited = 0.0
+        while True:
+            try:
+                return self._results.get(timeout=1.0)
+            except queue.Empty:
+                waited += 1.0
+                if any(not process.is_alive() for process in self._processes):
+                    self.close()
+                    raise RuntimeError("embedding worker exited unexpectedly")
+                if waited >= self.result_timeout:
+                    self.close()
+                    raise TimeoutError("timed out waiting for embedding workers")
@@ -3,6 +3,9 @@
 from __future__ import annotations
 
 import hashlib
+import math
+import struct
+import threading
 from abc import ABC, abstractmethod
 
 
@@ -13,6 +16,13 @@ class EmbeddingService(ABC):
     def embed(self, texts: list[str]) -> list[list[float]]:
         """Convert texts into dense vectors."""
 
+    def close(self) -> None:
+        """Release provider resources such as worker processes; no-op by default."""
+
+    def texts_per_call(self, batch_size: int) -> int:
+        """Number of texts to pass to each ``embed`` call to keep the provider busy."""
+        return batch_size
+
 
 class OpenAIEmbeddingService(EmbeddingService):
     """Embedding service placeholder for OpenAI embedding APIs."""
@@ -24,51 +34,93 @@ class OpenAIEmbeddingService(EmbeddingService):
         raise NotImplementedError("OpenAI embedding integration intentionally not implemented yet.")
 
 
+class HashEmbeddingService(EmbeddingService):
+    """Deterministic hash-derived embeddings computed in bulk for offline and CI indexing.
+
+    Each text maps to one SHA-256 counter stream decoded as big-endian uint32 values;
+    batches are converted to a float32 matrix and row-normalized when NumPy is available.
+    """
+
+    _DIGEST_VALUES = hashlib.sha256().digest_size // 4
+
+    def __init__(self, dimension: int = 384) -> None:
+        if dimension <= 0:
+            raise ValueError("dimension must be > 0")
+        self.dimension = dimension
+        self._blocks = -(-dimension // self._DIGEST_VALUES)
+        self._counters = [counter.to_bytes(4, "big") for counter in range(self._blocks)]
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        if not texts:
+            return []
+
+        try:
+            import numpy as np
+        except ImportError:
+            return [self._embed_pure_python(text) for text in texts]
+
+        buffer = b"".join(self._digest_stream(text) for text in texts)
+        raw = np.frombuffer(buffer, dtype=">u4").reshape(len(texts), self._blocks * self._DIGEST_VALUES)
+        matrix = raw[:, : self.dimension].astype(np.float32)
+        matrix *= np.float32(2.0 / 2**32)
+        matrix -= np.float32(1.0)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix /= norms
+        return matrix.tolist()
+
+    def _digest_stream(self, text: str) -> bytes:
+        seed = text.encode("utf-8")
+        return b"".join(hashlib.sha256(seed + counter).digest() for counter in self._counters)
+
+    def _embed_pure_python(self, text: str) -> list[float]:
+        values = struct.unpack_from(f">{self.dimension}I", self._digest_stream(text))
+        scale = 2.0 / 2**32
+        vector = [value * scale - 1.0 for value in values]
+        norm = math.sqrt(math.fsum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+
 class SentenceTransformerEmbeddingService(EmbeddingService):
-    """Embedding service for sentence-transformers backends with deterministic fallback."""
+    """Embedding service for sentence-transformers backends with deterministic fallback.
+
+    The model (and torch) is imported and loaded on the first ``embed`` call, not at
+    construction, so building the service stays cheap for CLI and API startup.
+    """
 
     def __init__(self, model_name: str) -> None:
         self.model_name = model_name
         self._model = None
         self._load_error: Exception | None = None
-        self._fallback_dimension = 384
-        try:
-            from sentence_transformers import SentenceTransformer  # type: ignore
-
-            self._model = SentenceTransformer(model_name)
-        except Exception as exc:  # pragma: no cover - environment dependent branch
-            self._load_error = exc
+        self._loaded = False
+        self._load_lock = threading.Lock()
+        self._fallback = HashEmbeddingService(dimension=384)
 
     def embed(self, texts: list[str]) -> list[list[float]]:
         if not texts:
             return []
 
-        if self._model is not None:
-            vectors = self._model.encode(texts, normalize_embeddings=True)
+        model = self._load_model()
+        if model is not None:
+            vectors = model.encode(texts, normalize_embeddings=True)
             return [list(map(float, vector)) for vector in vectors]
 
         # deterministic fallback allows local testing even when dependency isn't installed.
-        return [self._hash_embedding(text, self._fallback_dimension) for text in texts]
+        return self._fallback.embed(texts)
 
-    @staticmethod
-    def _hash_embedding(text: str, dim: int) -> list[float]:
-        seed = text.encode("utf-8")
-        values: list[float] = []
-        counter = 0
-        while len(values) < dim:
-            digest = hashlib.sha256(seed + counter.to_bytes(4, "big")).digest()
-            for idx in range(0, len(digest), 4):
-                chunk = digest[idx : idx + 4]
-                if len(chunk) < 4:
-                    continue
-                val = int.from_bytes(chunk, "big") / 2**32
-                values.append((val * 2.0) - 1.0)
-                if len(values) >= dim:
-                    break
-            counter += 1
-
-        norm = sum(v * v for v in values) ** 0.5 or 1.0
-        return [v / norm for v in values]
+    def _load_model(self):
+        if self._loaded:
+            return self._model
+        with self._load_lock:
+            if not self._loaded:
+                try:
+                    from sentence_transformers import SentenceTransformer  # type: ignore
+
+                    self._model = SentenceTransformer(self.model_name)
+                except Exception as exc:  # pragma: no cover - environment dependent branch
+                    self._load_error = exc
+                self._loaded = True
+        return self._model
 
 
 class EmbeddingFactory:
@@ -79,6 +131,8 @@ class EmbeddingFactory:
         normalized_provider = provider.strip().lower()
         if normalized_provider in {"sentence_transformers", "sentence-transformers"}:
             return SentenceTransformerEmbeddingService(model_name=model_name)
+        if normalized_provider in {"hash", "hashing"}:
+            return HashEmbeddingService()
         if normalized_provider == "openai":
             return OpenAIEmbeddingService(model_name=model_name)
         raise ValueError(f"Unsupported embedding provider: {provider}")
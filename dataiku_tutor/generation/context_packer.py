@@ -0,0 +1,185 @@
+"""Token-budgeted assembly of retrieved chunks into prompt context."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from dataiku_tutor.domain.models import RetrievedChunk
+
+
+def count_words(text: str) -> int:
+    """Approximate token count in word units, matching ``DocumentationChunker``."""
+    return len(text.split())
+
+
+@dataclass(frozen=True)
+class ContextSegment:
+    """Contiguous span of one document built from one or more merged chunks."""
+
+    document_id: str
+    chunk_ids: tuple[str, ...]
+    content: str
+    score: float
+    tokens: int
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class PackedContext:
+    """Selected segments plus token accounting for one request."""
+
+    segments: list[ContextSegment]
+    tokens_used: int
+    tokens_unpacked: int
+
+    @property
+    def tokens_saved(self) -> int:
+        """Tokens avoided versus concatenating every retrieved chunk as-is."""
+        return max(0, self.tokens_unpacked - self.tokens_used)
+
+
+class ContextPacker:
+    """Merges overlapping chunks per document and fills a token budget greedily.
+
+    Chunks of the same ``document_id`` whose ``chunk_index`` values are consecutive are
+    stitched together, dropping the words they share (the chunker's overlap window).
+    Segments are then picked by relevance per token until ``token_budget`` is reached.
+    """
+
+    def __init__(
+        self,
+        token_budget: int = 2000,
+        max_segments: int | None = None,
+        token_counter: Callable[[str], int] = count_words,
+    ) -> None:
+        if token_budget <= 0:
+            raise ValueError("token_budget must be > 0")
+        self.token_budget = token_budget
+        self.max_segments = max_segments
+        self.token_counter = token_counter
+
+    def pack(self, retrieved_chunks: list[RetrievedChunk]) -> PackedContext:
+        unique: dict[str, RetrievedChunk] = {}
+        for result in retrieved_chunks:
+            current = unique.get(result.chunk.id)
+            if current is None or result.score > current.score:
+                unique[result.chunk.id] = result
+        if not unique:
+            return PackedContext(segments=[], tokens_used=0, tokens_unpacked=0)
+
+        tokens_unpacked = sum(self.token_counter(result.chunk.content) for result in unique.values())
+        segments = self._deduplicate(self._merge(list(unique.values())))
+        selected = self._select(segments)
+        return PackedContext(
+            segments=selected,
+            tokens_used=sum(segment.tokens for segment in selected),
+            tokens_unpacked=tokens_unpacked,
+        )
+
+    def _merge(self, results: list[RetrievedChunk]) -> list[ContextSegment]:
+        by_document: dict[str, list[RetrievedChunk]] = {}
+        for result in results:
+            by_document.setdefault(result.chunk.document_id, []).append(result)
+
+        segments: list[ContextSegment] = []
+        for document_id, members in by_document.items():
+            members.sort(key=lambda result: (self._chunk_index(result) is None, self._chunk_index(result) or 0))
+            run: list[RetrievedChunk] = []
+            words: list[str] = []
+            for result in members:
+                index = self._chunk_index(result)
+                previous = self._chunk_index(run[-1]) if run else None
+                next_words = result.chunk.content.split()
+                if run and index is not None and previous is not None and index == previous + 1:
+                    hint = result.chunk.metadata.get("chunk_overlap")
+                    words.extend(next_words[self._overlap(words, next_words, hint) :])
+                    run.append(result)
+                    continue
+                if run:
+                    segments.append(self._segment(document_id, run, words))
+                run, words = [result], list(next_words)
+            if run:
+                segments.append(self._segment(document_id, run, words))
+        return segments
+
+    def _segment(self, document_id: str, run: list[RetrievedChunk], words: list[str]) -> ContextSegment:
+        content = " ".join(words)
+        return ContextSegment(
+            document_id=document_id,
+            chunk_ids=tuple(result.chunk.id for result in run),
+            content=content,
+            score=max(result.score for result in run),
+            tokens=self.token_counter(content),
+            metadata=dict(run[0].chunk.metadata),
+        )
+
+    @staticmethod
+    def _deduplicate(segments: list[ContextSegment]) -> list[ContextSegment]:
+        """Drop segments whose text is already covered, e.g. the same page in two doc versions."""
+        kept: list[ContextSegment] = []
+        for segment in sorted(segments, key=lambda item: (-item.score, -item.tokens)):
+            # Pad with spaces so containment only matches whole words ("join" is not in "joining").
+            normalized = f" {' '.join(segment.content.lower().split())} "
+            if any(normalized in f" {' '.join(other.content.lower().split())} " for other in kept):
+                continue
+            kept.append(segment)
+        return kept
+
+    def _select(self, segments: list[ContextSegment]) -> list[ContextSegment]:
+        if not segments:
+            return []
+        scores = [segment.score for segment in segments]
+        low, spread = min(scores), max(scores) - min(scores)
+
+        def density(segment: ContextSegment) -> float:
+            relevance = (segment.score - low) / spread if spread > 0 else 1.0
+            return (relevance + 1e-6) / max(segment.tokens, 1)
+
+        selected: list[ContextSegment] = []
+        remaining = self.token_budget
+        for segment in sorted(segments, key=density, reverse=True):
+            if self.max_segments is not None and len(selected) >= self.max_segments:
+                break
+            if segment.tokens <= remaining:
+                selected.append(segment)
+                remaining -= segment.tokens
+
+        if not selected:
+            # Nothing fits whole: keep the budget-sized head of the most relevant segment.
+            best = max(segments, key=lambda segment: segment.score)
+            words = best.content.split()[: self.token_budget]
+            content = " ".join(words)
+            selected = [
+                ContextSegment(
+                    document_id=best.document_id,
+                    chunk_ids=best.chunk_ids,
+                    content=content,
+                    score=best.score,
+                    tokens=self.token_counter(content),
+                    metadata=best.metadata,
+                )
+            ]
+
+        return sorted(selected, key=lambda segment: segment.score, reverse=True)
+
+    @staticmethod
+    def _chunk_index(result: RetrievedChunk) -> int | None:
+        value = result.chunk.metadata.get("chunk_index")
+        return value if isinstance(value, int) else None
+
+    @staticmethod
+    def _overlap(previous: list[str], following: list[str], hint: Any) -> int:
+        """Length of the longest suffix of ``previous`` that prefixes ``following``.
+
+        A ``hint`` of 0 means the chunker configured no overlap, so nothing is trimmed.
+        """
+        if hint == 0:
+            return 0
+        if isinstance(hint, int) and 0 < hint <= min(len(previous), len(following)):
+            if previous[-hint:] == following[:hint]:
+                return hint
+        for size in range(min(len(previous), len(following)), 0, -1):
+            if previous[-size:] == following[:size]:
+                return size
+        return 0
@@ -0,0 +1,310 @@
+"""Pooled, retrying HTTP client for OpenAI-compatible completion endpoints."""
+
+from __future__ import annotations
+
+import http.client
+import json
+import queue
+import random
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Iterator
+from urllib.parse import urlsplit
+
+from dataiku_tutor.observability.metrics import METRICS
+
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+class LLMClientError(RuntimeError):
+    """Raised when the completion endpoint fails after all retries."""
+
+    def __init__(self, message: str, status: int | None = None) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class _Retry(Exception):
+    def __init__(self, status: int, retry_after: float | None) -> None:
+        super().__init__(f"retryable status {status}")
+        self.retry_after = retry_after
+
+
+class _Response:
+    """Minimal response view shared by the stdlib and httpx transports."""
+
+    def __init__(self, status: int, headers: Any, read, iter_lines) -> None:
+        self.status = status
+        self._headers = headers
+        self.read = read
+        self.iter_lines = iter_lines
+
+    def header(self, name: str) -> str | None:
+        return self._headers.get(name)
+
+
+class _PooledHTTPTransport:
+    """HTTP/1.1 keep-alive connections reused LIFO across requests."""
+
+    def __init__(self, base_url: str, timeout: float) -> None:
+        parsed = urlsplit(base_url)
+        self._connection_class = (
+            http.client.HTTPSConnection if parsed.scheme == "https" else http.client.HTTPConnection
+        )
+        self._host = parsed.hostname or "localhost"
+        self._port = parsed.port
+        self._prefix = parsed.path.rstrip("/")
+        self._timeout = timeout
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+
+    @contextmanager
+    def post(self, path: str, body: bytes, headers: dict[str, str]) -> Iterator[_Response]:
+        connection = self._checkout()
+        response = None
+        try:
+            connection.request("POST", self._prefix + path, body=body, headers=headers)
+            response = connection.getresponse()
+            yield _Response(
+                response.status,
+                response.headers,
+                response.read,
+                lambda: (raw.decode("utf-8").rstrip("\r\n") for raw in response),
+            )
+            response.read()
+        finally:
+            # A connection is only reusable once its response body has been fully consumed.
+            if response is not None and response.isclosed() and not response.will_close:
+                self._idle.put(connection)
+            else:
+                connection.close()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _checkout(self) -> http.client.HTTPConnection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._connection_class(self._host, self._port, timeout=self._timeout)
+
+
+class _HttpxTransport:
+    """HTTP/2-capable transport used when ``httpx`` (with ``h2``) is installed.
+
+    ``transport`` replaces httpx's network layer, e.g. with ``httpx.MockTransport`` in tests.
+    """
+
+    def __init__(self, base_url: str, timeout: float, max_connections: int, transport: Any = None) -> None:
+        import httpx  # type: ignore
+
+        self._transport_error = httpx.TransportError
+        self._client = httpx.Client(
+            base_url=base_url,
+            http2=transport is None,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            transport=transport,
+        )
+
+    @contextmanager
+    def post(self, path: str, body: bytes, headers: dict[str, str]) -> Iterator[_Response]:
+        try:
+            with self._client.stream("POST", path, content=body, headers=headers) as response:
+                yield _Response(response.status_code, response.headers, response.read, response.iter_lines)
+        except self._transport_error as exc:
+            # Connection errors and timeouts surface as OSError, like the stdlib transport's.
+            raise OSError(f"{type(exc).__name__}: {exc}") from exc
+
+    def close(self) -> None:
+        self._client.close()
+
+
+class HTTPLLMClient:
+    """Completion client with connection reuse, bounded concurrency, retries and coalescing.
+
+    At most ``max_connections`` requests are in flight; further callers wait up to ``timeout``.
+    Retryable failures back off exponentially with full jitter (honouring ``Retry-After``).
+    Concurrent ``complete`` calls with an identical prompt share one upstream request.
+    """
+
+    COMPLETIONS_PATH = "/v1/completions"
+
+    def __init__(
+        self,
+        base_url: str,
+        model: str,
+        api_key: str | None = None,
+        timeout: float = 30.0,
+        max_connections: int = 8,
+        max_retries: int = 3,
+        backoff_base: float = 0.25,
+        backoff_max: float = 4.0,
+        max_tokens: int = 512,
+        temperature: float = 0.0,
+        http2: bool = False,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self._headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+        if api_key:
+            self._headers["Authorization"] = f"Bearer {api_key}"
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._inflight: dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self._transport = self._create_transport(http2, max_connections)
+
+    def complete(self, prompt: str) -> str:
+        """Return the completion text, joining an identical in-flight request if present."""
+        with self._inflight_lock:
+            future = self._inflight.get(prompt)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[prompt] = future
+        if not leader:
+            METRICS.inc("llm_coalesced_total")
+            return future.result()
+
+        try:
+            result = self._complete_uncoalesced(prompt)
+            future.set_result(result)
+            return result
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(prompt, None)
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        """Yield completion text fragments as server-sent events arrive."""
+        body = self._body(prompt, stream=True)
+        for attempt in range(self.max_retries + 1):
+            yielded = False
+            try:
+                with self._slot(), self._transport.post(self.COMPLETIONS_PATH, body, self._headers) as response:
+                    if response.status != 200:
+                        self._raise_for_status(response, attempt)
+                    for line in response.iter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        data = line[len("data:") :].strip()
+                        if data == "[DONE]":
+                            break
+                        text = self._choice_text(json.loads(data))
+                        if text:
+                            yielded = True
+                            yield text
+                METRICS.inc("llm_requests_total", outcome="ok")
+                return
+            except _Retry as retry:
+                self._backoff(attempt, retry.retry_after)
+            except (OSError, http.client.HTTPException) as exc:
+                if yielded or attempt >= self.max_retries:
+                    METRICS.inc("llm_requests_total", outcome="error")
+                    raise LLMClientError(f"streaming completion failed: {exc}") from exc
+                self._backoff(attempt, None)
+        METRICS.inc("llm_requests_total", outcome="error")
+        raise LLMClientError("streaming completion failed after retries")
+
+    def close(self) -> None:
+        self._transport.close()
+
+    def _complete_uncoalesced(self, prompt: str) -> str:
+        body = self._body(prompt, stream=False)
+        last_error: Exception | None = None
+        for attempt in range(self.max_retries + 1):
+            try:
+                with self._slot(), self._transport.post(self.COMPLETIONS_PATH, body, self._headers) as response:
+                    if response.status != 200:
+                        self._raise_for_status(response, attempt)
+                    payload = json.loads(response.read())
+                METRICS.inc("llm_requests_total", outcome="ok")
+                return self._choice_text(payload)
+            except _Retry as retry:
+                last_error = retry
+                self._backoff(attempt, retry.retry_after)
+            except (OSError, http.client.HTTPException) as exc:
+                last_error = exc
+                if attempt >= self.max_retries:
+                    break
+                self._backoff(attempt, None)
+        METRICS.inc("llm_requests_total", outcome="error")
+        raise LLMClientError(f"completion failed after {self.max_retries + 1} attempts: {last_error}")
+
+    @contextmanager
+    def _slot(self) -> Iterator[None]:
+        if not self._slots.acquire(timeout=self.timeout):
+            raise LLMClientError("timed out waiting for an LLM connection slot")
+        try:
+            yield
+        finally:
+            self._slots.release()
+
+    def _raise_for_status(self, response: _Response, attempt: int) -> None:
+        detail = response.read()[:200].decode("utf-8", errors="replace")
+        if response.status in RETRYABLE_STATUSES and attempt < self.max_retries:
+            retry_after = response.header("Retry-After")
+            raise _Retry(response.status, float(retry_after) if retry_after and retry_after.isdigit() else None)
+        METRICS.inc("llm_requests_total", outcome="error")
+        raise LLMClientError(f"completion endpoint returned {response.status}: {detail}", status=response.status)
+
+    def _backoff(self, attempt: int, retry_after: float | None) -> None:
+        METRICS.inc("llm_retries_total")
+        delay = random.uniform(0.0, min(self.backoff_max, self.backoff_base * 2**attempt))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.backoff_max))
+        time.sleep(delay)
+
+    def _body(self, prompt: str, stream: bool) -> bytes:
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature,
+            "stream": stream,
+        }
+        return json.dumps(payload).encode("utf-8")
+
+    @staticmethod
+    def _choice_text(payload: dict[str, Any]) -> str:
+        choices = payload.get("choices") or [{}]
+        return str(choices[0].get("text", ""))
+
+    def _create_transport(self, http2: bool, max_connections: int):
+        if http2:
+            try:
+                return _HttpxTransport(self.base_url, self.timeout, max_connections)
+            except ImportError:
+                pass
+        return _PooledHTTPTransport(self.base_url, self.timeout)
+
+
+class LLMClientFactory:
+    """Factory for constructing the LLM client from the ``llm`` configuration section."""
+
+    @staticmethod
+    def create(config: dict[str, Any]) -> HTTPLLMClient:
+        return HTTPLLMClient(
+            base_url=str(config.get("base_url", "http://127.0.0.1:8001")),
+            model=str(config.get("model", "local-model")),
+            api_key=str(config.get("api_key", "")) or None,
+            timeout=float(config.get("timeout_s", 30)),
+            max_connections=int(config.get("max_connections", 8)),
+            max_retries=int(config.get("max_retries", 3)),
+            backoff_base=float(config.get("backoff_base_ms", 250)) / 1000.0,
+            max_tokens=int(config.get("max_tokens", 512)),
+            http2=bool(config.get("http2", False)),
+        )
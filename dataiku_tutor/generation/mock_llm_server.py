@@ -0,0 +1,173 @@
+"""Local mock of an OpenAI-compatible completions server for offline load testing.
+
+Run standalone with ``python -m dataiku_tutor.generation.mock_llm_server --port 8001``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class MockLLMServer:
+    """Serves ``POST /v1/completions`` with simulated latency, token streaming and failures.
+
+    Responses are deterministic per prompt. ``latency`` is the time to first token,
+    ``token_delay`` the pause between streamed tokens (also applied to non-streaming
+    responses), and ``fail_rate`` the fraction of requests answered with 503.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.05,
+        token_delay: float = 0.002,
+        answer_tokens: int = 24,
+        fail_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        self.latency = latency
+        self.token_delay = token_delay
+        self.answer_tokens = answer_tokens
+        self.fail_rate = fail_rate
+        self.requests = 0
+        self.connections = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), self._handler_class())
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockLLMServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-llm", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "MockLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def answer_for(self, prompt: str) -> list[str]:
+        """Deterministic token list returned for ``prompt``."""
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        question = prompt.rsplit("Question:", 1)[-1].split("\n", 1)[0].strip() or "your task"
+        steps = [f"{n}. Step {n} for {question} ({digest[n * 4 : n * 4 + 4]})." for n in range(1, 4)]
+        words = " ".join(steps).split()
+        return [word + " " for word in words[: self.answer_tokens]]
+
+    def _should_fail(self) -> bool:
+        with self._lock:
+            self.requests += 1
+            return self.fail_rate > 0 and self._random.random() < self.fail_rate
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self) -> None:
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def log_message(self, format: str, *args: object) -> None:  # noqa: A002 - stdlib signature
+                return
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if self.path.rstrip("/") != "/v1/completions":
+                    self._send_json(404, {"error": "not found"})
+                    return
+                if server._should_fail():
+                    self._send_json(503, {"error": "overloaded"}, {"Retry-After": "0"})
+                    return
+
+                time.sleep(server.latency)
+                tokens = server.answer_for(str(payload.get("prompt", "")))
+                tokens = tokens[: int(payload.get("max_tokens", len(tokens)) or len(tokens))]
+                if payload.get("stream"):
+                    self._stream(tokens)
+                    return
+                time.sleep(server.token_delay * len(tokens))
+                self._send_json(200, {"object": "text_completion", "choices": [{"index": 0, "text": "".join(tokens).strip()}]})
+
+            def _send_json(self, status: int, body: dict, headers: dict[str, str] | None = None) -> None:
+                encoded = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(encoded)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(encoded)
+
+            def _stream(self, tokens: list[str]) -> None:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for token in tokens:
+                    time.sleep(server.token_delay)
+                    self._chunk(f"data: {json.dumps({'choices': [{'index': 0, 'text': token}]})}\n\n")
+                self._chunk("data: [DONE]\n\n")
+                self.wfile.write(b"0\r\n\r\n")
+
+            def _chunk(self, text: str) -> None:
+                data = text.encode("utf-8")
+                self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+
+        return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mock OpenAI-compatible completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--token-delay-ms", type=float, default=2.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = MockLLMServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency_ms / 1000.0,
+        token_delay=args.token_delay_ms / 1000.0,
+        fail_rate=args.fail_rate,
+    )
+    print(f"Mock LLM listening on {server.url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
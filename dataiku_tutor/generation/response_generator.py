@@ -1,23 +1,110 @@
 """Prompting and response-shaping for procedural Dataiku guidance."""
 
 from dataiku_tutor.domain.models import RetrievedChunk
+from dataiku_tutor.generation.context_packer import ContextPacker, PackedContext
+from dataiku_tutor.observability.metrics import METRICS
+
+SYSTEM_INSTRUCTIONS = (
+    "You are a Dataiku tutor. Answer only from the documentation excerpts below. "
+    "Respond with numbered, step-by-step instructions a user can follow in Dataiku DSS, "
+    "cite excerpts as [n], and say so when the excerpts do not cover the question."
+)
 
 
 class ResponseGenerator:
     """Builds grounded prompts and returns step-by-step task instructions."""
 
-    def __init__(self, llm_client, max_sources: int = 5) -> None:
+    def __init__(
+        self,
+        llm_client,
+        max_sources: int = 5,
+        context_packer: ContextPacker | None = None,
+    ) -> None:
         self.llm_client = llm_client
         self.max_sources = max_sources
+        self.context_packer = context_packer or ContextPacker(max_segments=max_sources)
 
-    def generate(self, query: str, retrieved_chunks: list[RetrievedChunk]) -> str:
+    def generate(
+        self,
+        query: str,
+        retrieved_chunks: list[RetrievedChunk],
+        context: PackedContext | None = None,
+    ) -> str:
         """Generate procedural answer with references to retrieved docs."""
-        raise NotImplementedError
+        prompt = self.build_prompt(query, retrieved_chunks, context=context)
+        with METRICS.timer("query_stage_seconds", stage="llm_call"):
+            return self.llm_client.complete(prompt)
+
+    def pack_context(self, retrieved_chunks: list[RetrievedChunk]) -> PackedContext:
+        """Merge overlapping chunks and select excerpts within the prompt token budget."""
+        with METRICS.timer("query_stage_seconds", stage="context_pack"):
+            context = self.context_packer.pack(retrieved_chunks)
+        METRICS.inc("context_tokens_total", context.tokens_used)
+        METRICS.inc("context_tokens_saved_total", context.tokens_saved)
+        return context
 
-    def build_prompt(self, query: str, retrieved_chunks: list[RetrievedChunk]) -> str:
+    def build_prompt(
+        self,
+        query: str,
+        retrieved_chunks: list[RetrievedChunk],
+        context: PackedContext | None = None,
+    ) -> str:
         """Construct constrained prompt enforcing operational step output."""
-        raise NotImplementedError
+        if context is None:
+            context = self.pack_context(retrieved_chunks)
+        with METRICS.timer("query_stage_seconds", stage="prompt_build"):
+            excerpts = []
+            for position, segment in enumerate(context.segments, start=1):
+                title = segment.metadata.get("title") or segment.metadata.get("source_path", "")
+                excerpts.append(f"[{position}] {title}\n{segment.content}")
+            documentation = "\n\n".join(excerpts) or "(no documentation excerpts retrieved)"
+            return f"{SYSTEM_INSTRUCTIONS}\n\nDocumentation:\n{documentation}\n\nQuestion: {query}\nAnswer:"
+
+    def format_sources(self, retrieved_chunks: list[RetrievedChunk], context: PackedContext | None = None) -> list[dict]:
+        """Extract source metadata for API/UI rendering.
+
+        With ``context``, sources follow the packed segments so entry ``n - 1`` is the excerpt
+        cited as ``[n]`` in the prompt; merged segments list all their ``chunk_ids``.
+        """
+        if context is None:
+            return [
+                self._source(
+                    [result.chunk.id],
+                    result.chunk.document_id,
+                    result.chunk.metadata,
+                    result.score,
+                    result.source,
+                )
+                for result in retrieved_chunks[: self.max_sources]
+            ]
+        retrievers = {result.chunk.id: result.source for result in retrieved_chunks}
+        return [
+            self._source(
+                list(segment.chunk_ids),
+                segment.document_id,
+                segment.metadata,
+                segment.score,
+                retrievers.get(segment.chunk_ids[0], ""),
+            )
+            for segment in context.segments
+        ]
 
-    def format_sources(self, retrieved_chunks: list[RetrievedChunk]) -> list[dict]:
-        """Extract source metadata for API/UI rendering."""
-        raise NotImplementedError
+    @staticmethod
+    def _source(
+        chunk_ids: list[str],
+        document_id: str,
+        metadata: dict,
+        score: float,
+        retriever: str,
+    ) -> dict:
+        return {
+            "chunk_id": chunk_ids[0],
+            "chunk_ids": chunk_ids,
+            "document_id": document_id,
+            "title": metadata.get("title", ""),
+            "url": metadata.get("url", ""),
+            "section": metadata.get("section", ""),
+            "source_path": metadata.get("source_path", ""),
+            "score": score,
+            "retriever": retriever,
+        }
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from typing import Iterable, Iterator
+
 from dataiku_tutor.domain.models import Chunk, Document
 
 
@@ -18,9 +20,12 @@ class DocumentationChunker:
         self.chunk_size = chunk_size
         self.overlap = overlap
 
-    def chunk(self, documents: list[Document]) -> list[Chunk]:
+    def chunk(self, documents: Iterable[Document]) -> list[Chunk]:
         """Produce chunks with inherited metadata and section breadcrumbs."""
-        chunks: list[Chunk] = []
+        return list(self.iter_chunks(documents))
+
+    def iter_chunks(self, documents: Iterable[Document]) -> Iterator[Chunk]:
+        """Lazily chunk a document stream, one document at a time."""
         for doc in documents:
             split_texts = self._split_text(doc.content)
             for idx, text in enumerate(split_texts):
@@ -30,15 +35,12 @@ class DocumentationChunker:
                     "chunk_size": self.chunk_size,
                     "chunk_overlap": self.overlap,
                 }
-                chunks.append(
-                    Chunk(
-                        id=f"{doc.id}:{idx}",
-                        document_id=doc.id,
-                        content=text,
-                        metadata=metadata,
-                    )
+                yield Chunk(
+                    id=f"{doc.id}:{idx}",
+                    document_id=doc.id,
+                    content=text,
+                    metadata=metadata,
                 )
-        return chunks
 
     def _split_text(self, text: str) -> list[str]:
         """Token-aware splitting helper with overlap windows."""
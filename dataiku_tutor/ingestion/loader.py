@@ -3,12 +3,86 @@
 from __future__ import annotations
 
 import hashlib
+import io
 import json
+import re
+import tarfile
+import zipfile
 from pathlib import Path
-from typing import Protocol
+from typing import Any, Iterable, Iterator, Protocol, TextIO
 
 from dataiku_tutor.domain.models import Document
 
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def iter_json_array(stream: TextIO, read_size: int = 1 << 16) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array one at a time.
+
+    Only the element being decoded (plus one read) is buffered, so memory stays flat
+    for arbitrarily large exports. Raises ``json.JSONDecodeError`` on malformed input.
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos = "", 0
+
+    def read_more() -> bool:
+        nonlocal buffer, pos
+        data = stream.read(max(read_size, len(buffer) - pos))
+        if not data:
+            return False
+        buffer, pos = buffer[pos:] + data, 0
+        return True
+
+    def next_char() -> str:
+        nonlocal pos
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos < len(buffer):
+                return buffer[pos]
+            if not read_more():
+                raise json.JSONDecodeError("unexpected end of JSON array", buffer, pos)
+
+    if next_char() != "[":
+        raise json.JSONDecodeError("expected a top-level JSON array", buffer, pos)
+    pos += 1
+    if next_char() == "]":
+        return
+
+    while True:
+        next_char()
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if read_more():
+                    continue
+                raise
+            # A number ending exactly at the buffer edge may continue in the next read.
+            if end == len(buffer) and read_more():
+                continue
+            break
+        pos = end
+        yield item
+
+        separator = next_char()
+        pos += 1
+        if separator == "]":
+            return
+        if separator != ",":
+            raise json.JSONDecodeError("expected ',' or ']'", buffer, pos - 1)
+
+
+def iter_json_lines(stream: Iterable[str]) -> Iterator[Any]:
+    """Yield one decoded value per non-blank JSON Lines record, skipping malformed lines."""
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            continue
+
 
 class DocumentationParser(Protocol):
     """Pluggable parser contract for HTML, Markdown, and JSON formats."""
@@ -20,49 +94,147 @@ class DocumentationParser(Protocol):
 class DocumentationLoader:
     """Loads raw documentation files and normalizes metadata-rich documents."""
 
-    SUPPORTED_EXTENSIONS = {".html", ".htm", ".md", ".markdown", ".json"}
+    SUPPORTED_EXTENSIONS = {".html", ".htm", ".md", ".markdown", ".json", ".jsonl"}
+    ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+    ARCHIVE_MEMBER_SEPARATOR = "!/"
 
     def __init__(self, parsers: dict[str, DocumentationParser] | None = None) -> None:
         self.parsers = parsers or {}
 
     def load_documents(self, source_path: str) -> list[Document]:
         """Load and normalize documentation from a path into Document models."""
+        return list(self.iter_documents(source_path))
+
+    def iter_documents(self, source_path: str) -> Iterator[Document]:
+        """Lazily yield documents; JSON array and JSON Lines exports are parsed element by element."""
+        for file_path in self.list_source_files(source_path):
+            yield from self.iter_file_documents(file_path)
+
+    def iter_file_documents(
+        self,
+        file_path: Path,
+        raw: str | None = None,
+        metadata: dict[str, str] | None = None,
+    ) -> Iterator[Document]:
+        """Yield the documents of one file, streaming it from disk when ``raw`` is not given.
+
+        ``metadata`` is merged into every document (e.g. archive member hashes).
+        """
+        if raw is None and self.is_archive(file_path):
+            for member_path, member_raw, member_metadata in self.iter_archive_members(file_path):
+                yield from self.iter_file_documents(member_path, member_raw, member_metadata)
+            return
+        if raw is None and self.is_streamed(file_path):
+            yield from self._stream_json_documents(file_path)
+            return
+        if raw is None:
+            try:
+                raw = self.read_file(file_path)
+            except OSError:
+                return
+        for document in self.parse_file(file_path, raw):
+            if metadata:
+                document = Document(
+                    id=document.id, content=document.content, metadata={**document.metadata, **metadata}
+                )
+            yield document
+
+    def is_archive(self, file_path: Path) -> bool:
+        """Whether the path is a zip or (optionally compressed) tar bundle of documentation files."""
+        return file_path.name.lower().endswith(self.ARCHIVE_SUFFIXES)
+
+    def iter_archive_members(self, archive_path: Path) -> Iterator[tuple[Path, str, dict[str, str]]]:
+        """Yield ``(member path, text, metadata)`` for supported members in one sequential pass.
+
+        Members are read into memory one at a time, never extracted to disk. Member paths
+        use the ``<archive>!/<member>`` form, and each member's SHA-256 ``content_hash`` is
+        computed from the bytes read, for change detection. A corrupt archive stops the
+        iteration; members already yielded are kept.
+        """
+        try:
+            for name, data in self._read_archive(archive_path):
+                if Path(name).suffix.lower() not in self.SUPPORTED_EXTENSIONS:
+                    continue
+                member_path = Path(f"{archive_path}{self.ARCHIVE_MEMBER_SEPARATOR}{name}")
+                metadata = {
+                    "archive_path": str(archive_path),
+                    "content_hash": hashlib.sha256(data).hexdigest(),
+                }
+                yield member_path, data.decode("utf-8", errors="ignore"), metadata
+        except (OSError, EOFError, tarfile.TarError, zipfile.BadZipFile):
+            return
+
+    @staticmethod
+    def _read_archive(archive_path: Path) -> Iterator[tuple[str, bytes]]:
+        if archive_path.name.lower().endswith(".zip"):
+            with zipfile.ZipFile(archive_path) as archive:
+                for info in archive.infolist():
+                    if not info.is_dir():
+                        yield info.filename, archive.read(info)
+            return
+
+        # Stream mode reads the (possibly compressed) tar strictly front to back without seeking.
+        with tarfile.open(archive_path, mode="r|*") as archive:
+            for member in archive:
+                if not member.isfile():
+                    continue
+                handle = archive.extractfile(member)
+                if handle is not None:
+                    yield member.name, handle.read()
+
+    def is_streamed(self, file_path: Path) -> bool:
+        """Whether the file is a JSON Lines or top-level JSON array export handled by the streaming parser."""
+        extension = file_path.suffix.lower()
+        if self._select_parser(extension) is not None:
+            return False
+        if extension == ".jsonl":
+            return True
+        if extension != ".json":
+            return False
+        try:
+            with file_path.open(encoding="utf-8-sig", errors="ignore") as handle:
+                while True:
+                    head = handle.read(4096)
+                    if not head:
+                        return False
+                    stripped = head.lstrip()
+                    if stripped:
+                        return stripped.startswith("[")
+        except OSError:
+            return False
+
+    def list_source_files(self, source_path: str) -> list[Path]:
+        """Resolve a file or directory into the sorted list of supported documentation files."""
         root = Path(source_path)
         if not root.exists():
             return []
 
-        files: list[Path] = []
         if root.is_file():
-            files = [root]
-        else:
-            files = [
-                path
-                for path in root.rglob("*")
-                if path.is_file() and path.suffix.lower() in self.SUPPORTED_EXTENSIONS
-            ]
-        files = sorted(files)
+            return [root]
+        return sorted(
+            path
+            for path in root.rglob("*")
+            if path.is_file() and (path.suffix.lower() in self.SUPPORTED_EXTENSIONS or self.is_archive(path))
+        )
 
-        documents: list[Document] = []
-        for file_path in files:
-            try:
-                raw = file_path.read_text(encoding="utf-8", errors="ignore")
-                parser = self._select_parser(file_path.suffix)
-                if parser:
-                    parsed = parser.parse(raw, str(file_path))
-                    metadata = {"source_path": str(file_path), **parsed.metadata}
-                    documents.append(
-                        Document(id=parsed.id, content=parsed.content.strip(), metadata=metadata)
-                    )
-                    continue
+    @staticmethod
+    def read_file(file_path: Path) -> str:
+        """Read raw file content; I/O is kept separate from parsing for pipelined ingestion."""
+        return file_path.read_text(encoding="utf-8", errors="ignore")
 
-                documents.extend(
-                    self._parse_with_builtin(file_path=file_path, raw_content=raw)
-                )
-            except Exception:
-                # Skip malformed files and continue indexing; caller can add logging.
-                continue
+    def parse_file(self, file_path: Path, raw: str) -> list[Document]:
+        """Parse raw file content into normalized documents, skipping malformed input."""
+        try:
+            parser = self._select_parser(file_path.suffix)
+            if parser:
+                parsed = parser.parse(raw, str(file_path))
+                metadata = {"source_path": str(file_path), **parsed.metadata}
+                return [Document(id=parsed.id, content=parsed.content.strip(), metadata=metadata)]
 
-        return documents
+            return self._parse_with_builtin(file_path=file_path, raw_content=raw)
+        except Exception:
+            # Skip malformed files and continue indexing; caller can add logging.
+            return []
 
     def _select_parser(self, extension: str) -> DocumentationParser | None:
         """Choose parser implementation by file extension."""
@@ -77,6 +249,9 @@ class DocumentationLoader:
             "extension": extension,
         }
 
+        if extension == ".jsonl":
+            return self._parse_json_documents_list(file_path, iter_json_lines(io.StringIO(raw_content)))
+
         if extension in {".json"}:
             try:
                 payload = json.loads(raw_content)
@@ -112,35 +287,51 @@ class DocumentationLoader:
         document_id = hashlib.sha1(str(file_path).encode("utf-8")).hexdigest()
         return [Document(id=document_id, content=normalized_text.strip(), metadata=metadata)]
 
-    def _parse_json_documents_list(self, file_path: Path, payload: list) -> list[Document]:
+    def _stream_json_documents(self, file_path: Path) -> Iterator[Document]:
+        try:
+            with file_path.open(encoding="utf-8-sig", errors="ignore") as handle:
+                items = iter_json_lines(handle) if file_path.suffix.lower() == ".jsonl" else iter_json_array(handle)
+                for index, item in enumerate(items):
+                    document = self._json_item_document(file_path, index, item)
+                    if document is not None:
+                        yield document
+        except (OSError, ValueError):
+            # Stop at the first malformed element; documents already yielded are kept.
+            return
+
+    def _parse_json_documents_list(self, file_path: Path, payload: Iterable) -> list[Document]:
         documents: list[Document] = []
         for index, item in enumerate(payload):
-            if not isinstance(item, dict):
-                continue
+            document = self._json_item_document(file_path, index, item)
+            if document is not None:
+                documents.append(document)
+        return documents
 
-            content = self._extract_json_text(item).strip()
-            if not content:
-                continue
+    def _json_item_document(self, file_path: Path, index: int, item: Any) -> Document | None:
+        if not isinstance(item, dict):
+            return None
 
-            document_id = str(item.get("id", "")).strip() or hashlib.sha1(
-                f"{file_path}:{index}".encode("utf-8")
-            ).hexdigest()
-            metadata = {
-                "source_path": str(file_path),
-                "file_name": file_path.name,
-                "extension": file_path.suffix.lower(),
-                "url": str(item.get("url", "")),
-                "section": str(item.get("section", "")),
-                "version": str(item.get("version", "")),
-                "recipe_name": str(item.get("recipe_name", "")),
-                "topic": str(item.get("topic", "")),
-                "subtopic": str(item.get("subtopic", "")),
-                "page_name": str(item.get("page_name", "")),
-                "title": str(item.get("title", "")),
-            }
-            documents.append(Document(id=document_id, content=content, metadata=metadata))
+        content = self._extract_json_text(item).strip()
+        if not content:
+            return None
 
-        return documents
+        document_id = str(item.get("id", "")).strip() or hashlib.sha1(
+            f"{file_path}:{index}".encode("utf-8")
+        ).hexdigest()
+        metadata = {
+            "source_path": str(file_path),
+            "file_name": file_path.name,
+            "extension": file_path.suffix.lower(),
+            "url": str(item.get("url", "")),
+            "section": str(item.get("section", "")),
+            "version": str(item.get("version", "")),
+            "recipe_name": str(item.get("recipe_name", "")),
+            "topic": str(item.get("topic", "")),
+            "subtopic": str(item.get("subtopic", "")),
+            "page_name": str(item.get("page_name", "")),
+            "title": str(item.get("title", "")),
+        }
+        return Document(id=document_id, content=content, metadata=metadata)
 
     @staticmethod
     def _extract_json_text(payload: dict) -> str:
@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Callable
 
 from dataiku_tutor.config.settings import Settings
-from dataiku_tutor.embeddings.embedding_service import EmbeddingFactory
+from dataiku_tutor.embeddings.embedding_service import EmbeddingFactory, EmbeddingService
 from dataiku_tutor.ingestion.chunker import DocumentationChunker
 from dataiku_tutor.ingestion.loader import DocumentationLoader
+from dataiku_tutor.ingestion.staged import PipelineReport, StagedIngestion
 from dataiku_tutor.ingestion.updater import IndexUpdater
 from dataiku_tutor.vectorstore.faiss_store import VectorStoreFactory
 
@@ -17,6 +19,7 @@ class IngestionPipeline:
     """Builds and executes the indexing pipeline from YAML configuration."""
 
     settings: Settings
+    last_report: PipelineReport | None = field(default=None, init=False)
 
     def build_index_updater(self) -> IndexUpdater:
         ingestion_cfg = self.settings.section("ingestion")
@@ -28,23 +31,77 @@ class IngestionPipeline:
             chunk_size=int(ingestion_cfg.get("chunk_size", 500)),
             overlap=int(ingestion_cfg.get("chunk_overlap", 100)),
         )
-        embedding_service = EmbeddingFactory.create(
-            provider=str(embedding_cfg.get("provider", "sentence_transformers")),
-            model_name=str(embedding_cfg.get("model_name", "all-MiniLM-L6-v2")),
-        )
+        embedding_service = self.build_embedding_service(embedding_cfg)
         vector_store = VectorStoreFactory.create(vectorstore_cfg)
-        return IndexUpdater(loader, chunker, embedding_service, vector_store)
+        return IndexUpdater(
+            loader,
+            chunker,
+            embedding_service,
+            vector_store,
+            # An embedding pool needs several worker batches per call to use more than one process.
+            batch_size=embedding_service.texts_per_call(int(embedding_cfg.get("batch_size", 32))),
+        )
+
+    @staticmethod
+    def build_embedding_service(embedding_cfg: dict) -> EmbeddingService:
+        """Create the configured provider, sharded over worker processes when ``workers > 1``."""
+        provider = str(embedding_cfg.get("provider", "sentence_transformers"))
+        model_name = str(embedding_cfg.get("model_name", "all-MiniLM-L6-v2"))
+        workers = int(embedding_cfg.get("workers", 1))
+        if workers > 1:
+            from dataiku_tutor.embeddings.embedding_pool import EmbeddingPool
+
+            return EmbeddingPool(
+                provider=provider,
+                model_name=model_name,
+                workers=workers,
+                batch_size=int(embedding_cfg.get("batch_size", 32)),
+                max_pending=int(embedding_cfg.get("max_pending_batches", 0)) or None,
+            )
+        return EmbeddingFactory.create(provider=provider, model_name=model_name)
+
+    def run_full_reindex(
+        self,
+        source_path: str | None = None,
+        progress: Callable[[dict[str, int]], None] | None = None,
+        pause: Callable[[], None] | None = None,
+    ) -> int:
+        """Rebuild the configured store from ``source_path`` and return the indexed chunk count.
 
-    def run_full_reindex(self) -> int:
+        The index is built into an empty ``staging()`` store and promoted over the configured
+        one only on success, so a failed or cancelled run leaves the previous index in place.
+        ``progress`` and ``pause`` are passed to the sequential or pipelined (``ingestion.pipelined``)
+        run.
+        """
         ingestion_cfg = self.settings.section("ingestion")
-        source_path = str(ingestion_cfg.get("source_path", "./data/docs"))
+        source_path = source_path or str(ingestion_cfg.get("source_path", "./data/docs"))
         updater = self.build_index_updater()
-        return updater.run_full_reindex(source_path=source_path)
+        target = updater.vector_store
+        updater.vector_store = target.staging()
+        try:
+            if not ingestion_cfg.get("pipelined", True):
+                indexed = updater.run_full_reindex(source_path=source_path, progress=progress, pause=pause)
+            else:
+                staged = StagedIngestion.from_updater(
+                    updater,
+                    queue_size=int(ingestion_cfg.get("queue_size", 8)),
+                    batch_size=updater.batch_size,
+                )
+                self.last_report = staged.run(source_path, progress=progress, pause=pause)
+                indexed = self.last_report.indexed_chunks
+            target.promote(updater.vector_store)
+            IndexUpdater.publish_index_stats(target)
+            return indexed
+        finally:
+            updater.embedding_service.close()
 
 
 def run_pipeline(config_path: str = "dataiku_tutor/config/settings.yaml") -> int:
     pipeline = IngestionPipeline(settings=Settings(config_path))
-    return pipeline.run_full_reindex()
+    indexed = pipeline.run_full_reindex()
+    if pipeline.last_report is not None:
+        print(pipeline.last_report.summary())
+    return indexed
 
 
 if __name__ == "__main__":
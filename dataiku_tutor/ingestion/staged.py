@@ -0,0 +1,296 @@
+"""Concurrent staged ingestion joined by bounded queues, with per-stage metrics."""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from dataiku_tutor.domain.models import Chunk
+from dataiku_tutor.ingestion.updater import IndexUpdater
+from dataiku_tutor.observability.metrics import METRICS
+
+_DONE = object()
+
+
+@dataclass
+class StageMetrics:
+    """Throughput and queueing counters for one pipeline stage."""
+
+    name: str
+    items: int = 0
+    busy_seconds: float = 0.0
+    starved_seconds: float = 0.0
+    blocked_seconds: float = 0.0
+    max_queue_depth: int = 0
+    queue_depth_samples: int = 0
+    queue_depth_total: int = 0
+
+    @property
+    def throughput(self) -> float:
+        """Items handled per second of busy time."""
+        return self.items / self.busy_seconds if self.busy_seconds > 0 else 0.0
+
+    @property
+    def mean_queue_depth(self) -> float:
+        """Average depth of this stage's output queue, sampled after each put."""
+        return self.queue_depth_total / self.queue_depth_samples if self.queue_depth_samples else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "items": self.items,
+            "busy_seconds": round(self.busy_seconds, 6),
+            "starved_seconds": round(self.starved_seconds, 6),
+            "blocked_seconds": round(self.blocked_seconds, 6),
+            "throughput": round(self.throughput, 3),
+            "max_queue_depth": self.max_queue_depth,
+            "mean_queue_depth": round(self.mean_queue_depth, 3),
+        }
+
+
+@dataclass
+class PipelineReport:
+    """Outcome of a staged reindex run."""
+
+    indexed_chunks: int
+    elapsed_seconds: float
+    stages: list[StageMetrics] = field(default_factory=list)
+
+    @property
+    def bottleneck(self) -> str | None:
+        """Stage with the most busy time; downstream stages starve, upstream ones block on it."""
+        if not self.stages:
+            return None
+        return max(self.stages, key=lambda stage: stage.busy_seconds).name
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "indexed_chunks": self.indexed_chunks,
+            "elapsed_seconds": round(self.elapsed_seconds, 6),
+            "bottleneck": self.bottleneck,
+            "stages": [stage.as_dict() for stage in self.stages],
+        }
+
+    def summary(self) -> str:
+        lines = [f"Indexed {self.indexed_chunks} chunks in {self.elapsed_seconds:.2f}s (bottleneck: {self.bottleneck})"]
+        for stage in self.stages:
+            lines.append(
+                f"  {stage.name:<6} items={stage.items:<7} busy={stage.busy_seconds:.2f}s "
+                f"starved={stage.starved_seconds:.2f}s blocked={stage.blocked_seconds:.2f}s "
+                f"queue_max={stage.max_queue_depth}"
+            )
+        return "\n".join(lines)
+
+
+class StagedIngestion:
+    """Runs load, parse, chunk, embed and index-write concurrently, one thread per stage.
+
+    Stages are connected by queues of at most ``queue_size`` items so a slow stage applies
+    back-pressure upstream instead of letting intermediate data pile up in memory.
+    """
+
+    STAGES = ("load", "parse", "chunk", "embed", "write")
+
+    def __init__(
+        self,
+        loader,
+        chunker,
+        embedding_service,
+        vector_store,
+        queue_size: int = 8,
+        batch_size: int = 32,
+        poll_interval: float = 0.1,
+    ) -> None:
+        if queue_size <= 0:
+            raise ValueError("queue_size must be > 0")
+        if batch_size <= 0:
+            raise ValueError("batch_size must be > 0")
+        self.loader = loader
+        self.chunker = chunker
+        self.embedding_service = embedding_service
+        self.vector_store = vector_store
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._errors: list[BaseException] = []
+        self._pause: Callable[[], None] | None = None
+
+    @classmethod
+    def from_updater(cls, updater: IndexUpdater, **kwargs: Any) -> "StagedIngestion":
+        return cls(updater.loader, updater.chunker, updater.embedding_service, updater.vector_store, **kwargs)
+
+    def run(
+        self,
+        source_path: str,
+        progress: Callable[[dict[str, int]], None] | None = None,
+        pause: Callable[[], None] | None = None,
+    ) -> PipelineReport:
+        """Index ``source_path`` through the concurrent stages and persist the store.
+
+        ``progress`` receives ``documents``/``chunks``/``embeddings`` counts from the write stage
+        after every batch, like ``IndexUpdater.run_full_reindex``; raising from it stops all stages.
+        Every stage thread calls ``pause`` after each item it handles, e.g. to throttle the run.
+        """
+        self._stop.clear()
+        self._errors = []
+        self._pause = pause
+        metrics = {name: StageMetrics(name=name) for name in self.STAGES}
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.STAGES) - 1)]
+        pending_chunks: list[Chunk] = []
+        written = [0]
+        counts = {"documents": 0, "chunks": 0, "embeddings": 0}
+
+        def load(path: Path) -> Iterable[tuple[Path, str | None, dict[str, str] | None]]:
+            if self.loader.is_archive(path):
+                # Members are read sequentially and handed downstream one at a time.
+                return self.loader.iter_archive_members(path)
+            if self.loader.is_streamed(path):
+                # Large JSON exports are parsed element by element in the parse stage.
+                return [(path, None, None)]
+            try:
+                return [(path, self.loader.read_file(path), None)]
+            except OSError:
+                return []
+
+        def parse(item: tuple[Path, str | None, dict[str, str] | None]) -> Iterable:
+            for document in self.loader.iter_file_documents(*item):
+                counts["documents"] += 1
+                yield document
+
+        def chunk(document) -> list[list[Chunk]]:
+            chunks = self.chunker.chunk([document])
+            counts["chunks"] += len(chunks)
+            pending_chunks.extend(chunks)
+            batches: list[list[Chunk]] = []
+            while len(pending_chunks) >= self.batch_size:
+                batches.append(pending_chunks[: self.batch_size])
+                del pending_chunks[: self.batch_size]
+            return batches
+
+        def flush_chunks() -> list[list[Chunk]]:
+            batch = list(pending_chunks)
+            pending_chunks.clear()
+            return [batch] if batch else []
+
+        def embed(batch: list[Chunk]) -> list[tuple[list[Chunk], list[list[float]]]]:
+            return [(batch, self.embedding_service.embed([chunk.content for chunk in batch]))]
+
+        def write(item: tuple[list[Chunk], list[list[float]]]) -> list:
+            batch, embeddings = item
+            self.vector_store.add(embeddings=embeddings, metadata=IndexUpdater.chunk_metadata(batch))
+            written[0] += len(batch)
+            counts["embeddings"] += len(embeddings)
+            if progress is not None:
+                progress(dict(counts))
+            return []
+
+        handlers: list[tuple[Callable[[Any], Iterable], Callable[[], list] | None]] = [
+            (load, None),
+            (parse, None),
+            (chunk, flush_chunks),
+            (embed, None),
+            (write, None),
+        ]
+
+        started = time.perf_counter()
+        threads = []
+        for position, name in enumerate(self.STAGES):
+            handle, finish = handlers[position]
+            inbox = self.loader.list_source_files(source_path) if position == 0 else queues[position - 1]
+            outbox = queues[position] if position < len(queues) else None
+            thread = threading.Thread(
+                target=self._run_stage,
+                args=(metrics[name], inbox, outbox, handle, finish),
+                name=f"ingestion-{name}",
+                daemon=True,
+            )
+            thread.start()
+            threads.append(thread)
+
+        for thread in threads:
+            thread.join()
+        if self._errors:
+            raise self._errors[0]
+
+        with METRICS.timer("ingestion_stage_seconds", stage="save"):
+            self.vector_store.save()
+        IndexUpdater.publish_index_stats(self.vector_store)
+        return PipelineReport(
+            indexed_chunks=written[0],
+            elapsed_seconds=time.perf_counter() - started,
+            stages=[metrics[name] for name in self.STAGES],
+        )
+
+    def _run_stage(
+        self,
+        metrics: StageMetrics,
+        inbox: Iterable | queue.Queue,
+        outbox: queue.Queue | None,
+        handle: Callable[[Any], Iterable],
+        finish: Callable[[], list] | None,
+    ) -> None:
+        try:
+            for item in self._iterate(inbox, metrics):
+                started = time.perf_counter()
+                blocked_before = metrics.blocked_seconds
+                # Handlers may return generators; time spent blocked on the outbox is not busy time.
+                for output in handle(item):
+                    self._put(outbox, output, metrics)
+                elapsed = time.perf_counter() - started - (metrics.blocked_seconds - blocked_before)
+                metrics.busy_seconds += elapsed
+                METRICS.observe("ingestion_stage_seconds", elapsed, stage=metrics.name)
+                metrics.items += 1
+                if self._pause is not None:
+                    self._pause()
+            if finish is not None and not self._stop.is_set():
+                for output in finish():
+                    self._put(outbox, output, metrics)
+        except BaseException as exc:
+            self._errors.append(exc)
+            self._stop.set()
+        finally:
+            if outbox is not None:
+                self._put(outbox, _DONE, metrics)
+
+    def _iterate(self, inbox: Iterable | queue.Queue, metrics: StageMetrics):
+        if not isinstance(inbox, queue.Queue):
+            for item in inbox:
+                if self._stop.is_set():
+                    return
+                yield item
+            return
+
+        while not self._stop.is_set():
+            waited = time.perf_counter()
+            try:
+                item = inbox.get(timeout=self.poll_interval)
+            except queue.Empty:
+                metrics.starved_seconds += time.perf_counter() - waited
+                continue
+            metrics.starved_seconds += time.perf_counter() - waited
+            if item is _DONE:
+                return
+            yield item
+
+    def _put(self, outbox: queue.Queue | None, item: Any, metrics: StageMetrics) -> None:
+        if outbox is None:
+            return
+        waited = time.perf_counter()
+        while True:
+            try:
+                outbox.put(item, timeout=self.poll_interval)
+                break
+            except queue.Full:
+                if self._stop.is_set():
+                    return
+        metrics.blocked_seconds += time.perf_counter() - waited
+        if item is not _DONE:
+            depth = outbox.qsize()
+            metrics.max_queue_depth = max(metrics.max_queue_depth, depth)
+            metrics.queue_depth_total += depth
+            metrics.queue_depth_samples += 1
@@ -2,37 +2,67 @@
 
 from __future__ import annotations
 import sys
+import time
+from itertools import islice
+from typing import Callable, Iterable, Iterator
+
 from dataiku_tutor.domain.models import Chunk
+from dataiku_tutor.observability.metrics import METRICS
 
 
 class IndexUpdater:
     """Coordinates document loading, chunking, embedding, and vector updates."""
 
-    def __init__(self, loader, chunker, embedding_service, vector_store) -> None:
+    def __init__(self, loader, chunker, embedding_service, vector_store, batch_size: int = 256) -> None:
+        if batch_size <= 0:
+            raise ValueError("batch_size must be > 0")
         self.loader = loader
         self.chunker = chunker
         self.embedding_service = embedding_service
         self.vector_store = vector_store
+        self.batch_size = batch_size
 
-    def run_full_reindex(self, source_path: str) -> int:
-        """Rebuild index from scratch and return indexed chunk count."""
-        documents = self.loader.load_documents(source_path)
-        chunks = self.chunker.chunk(documents)
-        embeddings = self._prepare_embeddings(chunks)
+    def run_full_reindex(
+        self,
+        source_path: str,
+        progress: Callable[[dict[str, int]], None] | None = None,
+        pause: Callable[[], None] | None = None,
+    ) -> int:
+        """Rebuild index from scratch and return indexed chunk count.
 
-        metadata = [
-            {
-                "id": chunk.id,
-                "document_id": chunk.document_id,
-                "content": chunk.content,
-                "metadata": chunk.metadata,
-            }
-            for chunk in chunks
-        ]
+        Documents and chunks are streamed and embedded ``batch_size`` chunks at a time, so
+        only one batch is held in memory regardless of the size of the export. ``progress``
+        receives ``documents``/``chunks``/``embeddings`` counts after every batch; raising
+        from it aborts the run before the store is saved. ``pause`` is called before it, e.g. to
+        throttle the run.
+        """
+        seconds = {"load": 0.0, "chunk": 0.0}
+        counts = {"documents": 0, "chunks": 0, "embeddings": 0}
+        documents = self._timed(self.loader.iter_documents(source_path), seconds, "load", counts, "documents")
+        chunks = self._timed(self.chunker.iter_chunks(documents), seconds, "chunk", counts, "chunks")
 
-        self.vector_store.add(embeddings=embeddings, metadata=metadata)
-        self.vector_store.save()
-        return len(chunks)
+        indexed = 0
+        while True:
+            batch = list(islice(chunks, self.batch_size))
+            if not batch:
+                break
+            embeddings = self._prepare_embeddings(batch)
+            counts["embeddings"] += len(embeddings)
+            with METRICS.timer("ingestion_stage_seconds", stage="write"):
+                self.vector_store.add(embeddings=embeddings, metadata=self.chunk_metadata(batch))
+            indexed += len(batch)
+            if pause is not None:
+                pause()
+            if progress is not None:
+                progress(dict(counts))
+
+        # Chunk time includes pulling documents through the loader; report it exclusively.
+        METRICS.observe("ingestion_stage_seconds", seconds["load"], stage="load")
+        METRICS.observe("ingestion_stage_seconds", seconds["chunk"] - seconds["load"], stage="chunk")
+        with METRICS.timer("ingestion_stage_seconds", stage="write"):
+            self.vector_store.save()
+        self.publish_index_stats(self.vector_store)
+        return indexed
 
     def run_incremental_update(self, changed_sources: list[str]) -> int:
         """Update index only for changed docs and return updated chunk count."""
@@ -41,31 +71,69 @@ class IndexUpdater:
 
         updated_chunks = 0
         for source in changed_sources:
-            documents = self.loader.load_documents(source)
-            chunks = self.chunker.chunk(documents)
+            with METRICS.timer("ingestion_stage_seconds", stage="load"):
+                documents = self.loader.load_documents(source)
+            with METRICS.timer("ingestion_stage_seconds", stage="chunk"):
+                chunks = self.chunker.chunk(documents)
             if not chunks:
                 continue
 
             self.vector_store.delete([chunk.id for chunk in chunks])
             embeddings = self._prepare_embeddings(chunks)
-            metadata = [
-                {
-                    "id": chunk.id,
-                    "document_id": chunk.document_id,
-                    "content": chunk.content,
-                    "metadata": chunk.metadata,
-                }
-                for chunk in chunks
-            ]
-            self.vector_store.add(embeddings=embeddings, metadata=metadata)
+            metadata = self.chunk_metadata(chunks)
+            with METRICS.timer("ingestion_stage_seconds", stage="write"):
+                self.vector_store.add(embeddings=embeddings, metadata=metadata)
             updated_chunks += len(chunks)
 
-        self.vector_store.save()
+        with METRICS.timer("ingestion_stage_seconds", stage="write"):
+            self.vector_store.save()
+        self.publish_index_stats(self.vector_store)
         return updated_chunks
 
+    @staticmethod
+    def _timed(
+        items: Iterable,
+        seconds: dict[str, float],
+        stage: str,
+        counts: dict[str, int],
+        counter: str,
+    ) -> Iterator:
+        """Yield from ``items`` while accumulating the time spent producing them and their count."""
+        iterator = iter(items)
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                seconds[stage] += time.perf_counter() - started
+            counts[counter] += 1
+            yield item
+
+    @staticmethod
+    def publish_index_stats(vector_store) -> None:
+        """Export vector store size gauges after the index changes."""
+        for name, value in vector_store.stats().items():
+            METRICS.set_gauge(f"index_{name}", value)
+
+    @staticmethod
+    def chunk_metadata(chunks: list[Chunk]) -> list[dict]:
+        """Build the vector store metadata rows persisted alongside chunk embeddings."""
+        return [
+            {
+                "id": chunk.id,
+                "document_id": chunk.document_id,
+                "content": chunk.content,
+                "metadata": chunk.metadata,
+            }
+            for chunk in chunks
+        ]
+
     def _prepare_embeddings(self, chunks: list[Chunk]) -> list[list[float]]:
         """Extract chunk content and request embedding vectors."""
         if not chunks:
             return []
         texts = [chunk.content for chunk in chunks]
-        return self.embedding_service.embed(texts)
+        with METRICS.timer("ingestion_stage_seconds", stage="embed"):
+            return self.embedding_service.embed(texts)
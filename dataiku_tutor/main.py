@@ -1,22 +1,78 @@
-"""Application bootstrap for local execution with cloud-ready boundaries."""
+"""Application bootstrap for local execution with cloud-ready boundaries.
 
-from fastapi import FastAPI
+Importing this module is cheap: FastAPI and the API routes are imported inside
+``create_app``. Serve with ``uvicorn dataiku_tutor.main:create_app --factory``; the
+module-level ``app`` attribute is still available and is built on first access.
+"""
+
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator
 
-from dataiku_tutor.api.routes import build_router
 from dataiku_tutor.config.settings import Settings
+from dataiku_tutor.observability.metrics import METRICS
+
+if TYPE_CHECKING:
+    from fastapi import FastAPI
 
 
 def create_app(config_path: str = "dataiku_tutor/config/settings.yaml") -> FastAPI:
     """Compose dependencies and return FastAPI app instance."""
+    from fastapi import FastAPI
+    from fastapi.responses import PlainTextResponse
+
+    from dataiku_tutor.api.routes import build_router
+    from dataiku_tutor.ingestion.pipeline import IngestionPipeline
+    from dataiku_tutor.orchestration.reindex_jobs import ReindexJobManager
+    from dataiku_tutor.orchestration.tutor_service import TutorServiceFactory
+
     settings = Settings(config_path)
+    observability_cfg = settings.section("observability")
+    METRICS.configure(
+        enabled=bool(observability_cfg.get("metrics_enabled", True)),
+        profile_slow_seconds=float(observability_cfg.get("profile_slow_ms", 0)) / 1000.0,
+        profile_interval_seconds=float(observability_cfg.get("profile_interval_ms", 5)) / 1000.0,
+    )
+
+    embedding_service = TutorServiceFactory.create_embedding_service(settings)
+    tutor_service = TutorServiceFactory.create(settings, embedding_service)
+    # Index size gauges are read from the serving store on every scrape.
+    METRICS.register_collector(tutor_service.publish_index_stats)
+
+    # The embedding model and a staging store are built per job, on the job's worker thread;
+    # queries switch to the promoted index (and drop cached answers) once a job succeeds.
+    ingestion_cfg = settings.section("ingestion")
+    reindex_jobs = ReindexJobManager(
+        reindex=IngestionPipeline(settings=settings).run_full_reindex,
+        default_source_path=str(ingestion_cfg.get("source_path", "./data/docs")),
+        max_cpu_fraction=float(ingestion_cfg.get("reindex_max_cpu", 0.5)),
+        nice=int(ingestion_cfg.get("reindex_nice", 10)),
+        on_success=lambda job: tutor_service.reload(TutorServiceFactory.create_retrievers(settings, embedding_service)),
+    )
+
+    @asynccontextmanager
+    async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+        yield
+        reindex_jobs.shutdown(wait=False)
+        METRICS.unregister_collector(tutor_service.publish_index_stats)
+        tutor_service.close()
+
+    app = FastAPI(title=settings.section("app").get("name", "dataiku_tutor"), lifespan=lifespan)
+    app.state.reindex_jobs = reindex_jobs
+    app.include_router(build_router(tutor_service=tutor_service, reindex_jobs=reindex_jobs))
 
-    # Dependency wiring placeholders (to be manually implemented)
-    tutor_service = None
-    index_updater = None
+    @app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+    def metrics() -> PlainTextResponse:
+        return PlainTextResponse(METRICS.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
-    app = FastAPI(title=settings.section("app").get("name", "dataiku_tutor"))
-    app.include_router(build_router(tutor_service=tutor_service, index_updater=index_updater))
     return app
 
 
-app = create_app()
+def __getattr__(name: str) -> Any:
+    """Build the default ``app`` lazily so importing the module does not construct it."""
+    if name == "app":
+        application = create_app()
+        globals()["app"] = application
+        return application
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
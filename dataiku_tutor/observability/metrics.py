@@ -0,0 +1,316 @@
+"""Lightweight in-process metrics with Prometheus text exposition and slow-request profiling."""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import sys
+import threading
+import time
+from collections import Counter, deque
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "dataiku_tutor_"
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+class _NullTimer:
+    """Shared no-op context manager returned while metrics are disabled."""
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ("_registry", "_name", "_labels", "_started")
+
+    def __init__(self, registry: "MetricsRegistry", name: str, labels: dict[str, str]) -> None:
+        self._registry = registry
+        self._name = name
+        self._labels = labels
+
+    def __enter__(self) -> "_Timer":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._registry.observe(self._name, time.perf_counter() - self._started, **self._labels)
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.total += value
+        self.count += 1
+
+
+class SlowRequestProfiler:
+    """Opt-in sampling profiler that keeps collapsed stacks of requests slower than a threshold.
+
+    While a profiled block runs, a daemon thread samples the caller's stack every
+    ``interval_seconds``; samples are discarded unless the block exceeds ``threshold_seconds``.
+    """
+
+    def __init__(self, threshold_seconds: float, interval_seconds: float = 0.005, keep: int = 20) -> None:
+        self.threshold_seconds = threshold_seconds
+        self.interval_seconds = interval_seconds
+        self.profiles: deque[dict[str, Any]] = deque(maxlen=keep)
+
+    def profile(self, name: str) -> "_ProfiledBlock":
+        return _ProfiledBlock(self, name)
+
+
+class _ProfiledBlock:
+    def __init__(self, profiler: SlowRequestProfiler, name: str) -> None:
+        self._profiler = profiler
+        self._name = name
+        self._samples: Counter[str] = Counter()
+        self._done = threading.Event()
+
+    def __enter__(self) -> "_ProfiledBlock":
+        self._thread_id = threading.get_ident()
+        self._started = time.perf_counter()
+        self._sampler = threading.Thread(target=self._sample, name="slow-request-profiler", daemon=True)
+        self._sampler.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        elapsed = time.perf_counter() - self._started
+        self._done.set()
+        self._sampler.join()
+        if elapsed < self._profiler.threshold_seconds or not self._samples:
+            return
+        profile = {
+            "name": self._name,
+            "seconds": round(elapsed, 6),
+            "stacks": dict(self._samples.most_common(50)),
+        }
+        self._profiler.profiles.append(profile)
+        hottest = self._samples.most_common(1)[0][0].rsplit(";", 1)[-1]
+        logger.warning("slow %s took %.3fs; hottest frame: %s", self._name, elapsed, hottest)
+
+    def _sample(self) -> None:
+        while not self._done.wait(self._profiler.interval_seconds):
+            frame = sys._current_frames().get(self._thread_id)
+            frames: list[str] = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{code.co_filename.rsplit('/', 1)[-1]}:{code.co_name}:{frame.f_lineno}")
+                frame = frame.f_back
+            if frames:
+                self._samples[";".join(reversed(frames))] += 1
+
+
+class MetricsRegistry:
+    """Thread-safe histograms, counters and gauges keyed by metric name and labels.
+
+    When disabled, ``timer`` returns a shared no-op context manager and updates return
+    immediately, so instrumented code paths pay a single attribute check.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.profiler: SlowRequestProfiler | None = None
+        self._lock = threading.Lock()
+        self._help: dict[str, tuple[str, str]] = {}
+        self._histograms: dict[str, dict[LabelKey, _Histogram]] = {}
+        self._counters: dict[str, dict[LabelKey, float]] = {}
+        self._gauges: dict[str, dict[LabelKey, float]] = {}
+        self._collectors: list[Callable[["MetricsRegistry"], None]] = []
+
+    def configure(
+        self,
+        enabled: bool = True,
+        profile_slow_seconds: float = 0.0,
+        profile_interval_seconds: float = 0.005,
+    ) -> None:
+        self.enabled = enabled
+        self.profiler = (
+            SlowRequestProfiler(profile_slow_seconds, profile_interval_seconds)
+            if enabled and profile_slow_seconds > 0
+            else None
+        )
+
+    def describe(self, name: str, kind: str, help_text: str) -> None:
+        self._help[name] = (kind, help_text)
+
+    def timer(self, name: str, **labels: str) -> _Timer | _NullTimer:
+        """Time a block into histogram ``name`` (seconds)."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name, labels)
+
+    def profile(self, name: str) -> Any:
+        """Sample the block's stack if slow-request profiling is configured; no-op otherwise."""
+        if not self.enabled or self.profiler is None:
+            return _NULL_TIMER
+        return self.profiler.profile(name)
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        if not self.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(DEFAULT_BUCKETS)
+            histogram.observe(value)
+
+    def inc(self, name: str, amount: float = 1.0, **labels: str) -> None:
+        if not self.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def set_gauge(self, name: str, value: float, **labels: str) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._gauges.setdefault(name, {})[self._key(labels)] = float(value)
+
+    def record_cache_lookup(self, cache: str, hit: bool) -> None:
+        """Count a cache lookup; hit ratios are derived at render time."""
+        self.inc("cache_requests_total", cache=cache, result="hit" if hit else "miss")
+
+    def register_collector(self, collector: Callable[["MetricsRegistry"], None]) -> None:
+        """Register a callback run before rendering, e.g. to refresh index size gauges."""
+        self._collectors.append(collector)
+
+    def unregister_collector(self, collector: Callable[["MetricsRegistry"], None]) -> None:
+        if collector in self._collectors:
+            self._collectors.remove(collector)
+
+    def counter_value(self, name: str, **labels: str) -> float:
+        with self._lock:
+            return self._counters.get(name, {}).get(self._key(labels), 0.0)
+
+    def histogram_count(self, name: str, **labels: str) -> int:
+        with self._lock:
+            histogram = self._histograms.get(name, {}).get(self._key(labels))
+            return histogram.count if histogram else 0
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+    def render(self) -> str:
+        """Render all series in the Prometheus text exposition format (version 0.0.4)."""
+        for collector in list(self._collectors):
+            try:
+                collector(self)
+            except Exception:  # pragma: no cover - collectors must not break scraping
+                logger.exception("metrics collector failed")
+
+        lines: list[str] = []
+        with self._lock:
+            for name in sorted(self._histograms):
+                self._header(lines, name, "histogram")
+                for key, histogram in sorted(self._histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f"{PREFIX}{name}_bucket{self._labels(key, le=_format(bound))} {cumulative}")
+                    lines.append(f"{PREFIX}{name}_bucket{self._labels(key, le='+Inf')} {histogram.count}")
+                    lines.append(f"{PREFIX}{name}_sum{self._labels(key)} {_format(histogram.total)}")
+                    lines.append(f"{PREFIX}{name}_count{self._labels(key)} {histogram.count}")
+            for name in sorted(self._counters):
+                self._header(lines, name, "counter")
+                for key, value in sorted(self._counters[name].items()):
+                    lines.append(f"{PREFIX}{name}{self._labels(key)} {_format(value)}")
+            gauges = {name: dict(series) for name, series in self._gauges.items()}
+            ratios = self._cache_hit_ratios()
+            if ratios:
+                gauges["cache_hit_ratio"] = ratios
+            for name in sorted(gauges):
+                self._header(lines, name, "gauge")
+                for key, value in sorted(gauges[name].items()):
+                    lines.append(f"{PREFIX}{name}{self._labels(key)} {_format(value)}")
+        return "\n".join(lines) + "\n"
+
+    def _cache_hit_ratios(self) -> dict[LabelKey, float]:
+        totals: dict[str, list[float]] = {}
+        for key, value in self._counters.get("cache_requests_total", {}).items():
+            labels = dict(key)
+            hits_and_total = totals.setdefault(labels.get("cache", ""), [0.0, 0.0])
+            if labels.get("result") == "hit":
+                hits_and_total[0] += value
+            hits_and_total[1] += value
+        return {(("cache", cache),): hits / total for cache, (hits, total) in totals.items() if total}
+
+    def _header(self, lines: list[str], name: str, kind: str) -> None:
+        described_kind, help_text = self._help.get(name, (kind, ""))
+        if help_text:
+            lines.append(f"# HELP {PREFIX}{name} {help_text}")
+        lines.append(f"# TYPE {PREFIX}{name} {described_kind}")
+
+    @staticmethod
+    def _key(labels: dict[str, str]) -> LabelKey:
+        return tuple(sorted((str(k), str(v)) for k, v in labels.items()))
+
+    @staticmethod
+    def _labels(key: LabelKey, **extra: str) -> str:
+        pairs = list(key) + list(extra.items())
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format(value: float) -> str:
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+METRICS = MetricsRegistry()
+METRICS.describe("query_stage_seconds", "histogram", "Latency of TutorService.answer stages.")
+METRICS.describe("query_seconds", "histogram", "End-to-end TutorService.answer latency.")
+METRICS.describe("ingestion_stage_seconds", "histogram", "Latency of ingestion stages per batch.")
+METRICS.describe("cache_requests_total", "counter", "Cache lookups by cache and result.")
+METRICS.describe("context_tokens_total", "counter", "Prompt context tokens sent after packing.")
+METRICS.describe("context_tokens_saved_total", "counter", "Context tokens removed by merging and budgeting.")
+METRICS.describe("cache_hit_ratio", "gauge", "Fraction of cache lookups that hit.")
+METRICS.describe("index_vectors", "gauge", "Vectors held by the vector store, including tombstoned rows.")
+METRICS.describe("index_deleted", "gauge", "Tombstoned chunk ids in the vector store.")
+METRICS.describe("index_bytes", "gauge", "On-disk size of the vector store files.")
+METRICS.describe("rerank_fallbacks_total", "counter", "Queries served in fused order because reranking was skipped.")
+METRICS.describe("llm_requests_total", "counter", "LLM completion requests by outcome.")
+METRICS.describe("llm_retries_total", "counter", "LLM request retries after retryable failures.")
+METRICS.describe("llm_coalesced_total", "counter", "LLM calls served by an identical in-flight request.")
+METRICS.describe("admission_requests_total", "counter", "Query admission decisions by outcome.")
+METRICS.describe("admission_queue_seconds", "histogram", "Time queries waited for an admission slot.")
+METRICS.describe("admission_in_flight", "gauge", "Queries currently holding an admission slot.")
+METRICS.describe("admission_queue_depth", "gauge", "Queries waiting for an admission slot.")
+METRICS.describe("query_degraded_total", "counter", "Queries served on a cheaper path under load.")
+METRICS.describe("semantic_cache_similarity", "histogram", "Cosine similarity of semantic cache hits.")
+METRICS.describe("semantic_cache_entries", "gauge", "Answered questions held by the semantic cache.")
+METRICS.describe("semantic_cache_audits_total", "counter", "Audited semantic cache hits by result.")
+METRICS.describe("reindex_jobs_total", "counter", "Finished background reindex jobs by status.")
+METRICS.describe("reindex_throttle_seconds", "histogram", "Time a reindex job slept to stay under its CPU cap.")
@@ -0,0 +1,228 @@
+"""Admission control, priority queueing and load shedding in front of ``TutorService.answer``."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import math
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Collection, Iterator
+
+from dataiku_tutor.observability.metrics import METRICS
+
+CHEAPEST_MODE = "keyword"
+
+
+class Overloaded(Exception):
+    """Raised when a request is shed; carries the HTTP status and a Retry-After hint."""
+
+    def __init__(self, reason: str, retry_after: float, status_code: int = 503) -> None:
+        super().__init__(f"request rejected: {reason}")
+        self.reason = reason
+        self.retry_after = retry_after
+        self.status_code = status_code
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+@dataclass(frozen=True)
+class Admission:
+    """Outcome of admitting one request: the mode to run and whether it was degraded."""
+
+    client_id: str
+    requested_mode: str
+    mode: str
+    skip_rerank: bool
+    queued_seconds: float
+
+    @property
+    def degraded(self) -> bool:
+        return self.skip_rerank or self.mode != self.requested_mode
+
+
+class AdmissionController:
+    """Bounds concurrent queries, queues the rest by priority and sheds what cannot finish in time.
+
+    Up to ``max_concurrent`` requests run at once and at most ``max_queue`` wait, lowest
+    ``priority`` first, then FIFO. Each client may hold ``per_client_limit`` running or queued
+    requests (excess gets 429). Service times are tracked per mode as moving averages; a request
+    whose estimated queue wait plus service time exceeds its deadline is rejected with 503 up
+    front rather than timing out later. As load (running + queued per slot) rises past
+    ``skip_rerank_load`` reranking is skipped, and past ``keyword_load`` (or when only the
+    cheaper path fits the deadline) the request is downgraded to keyword-only retrieval, if the
+    caller lists it in ``modes``. Both decisions are made again when a queued request gets its
+    slot, from the load and time left at that point.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 8,
+        max_queue: int = 64,
+        per_client_limit: int = 4,
+        default_deadline: float = 10.0,
+        skip_rerank_load: float = 0.75,
+        keyword_load: float = 1.5,
+        smoothing: float = 0.2,
+    ) -> None:
+        if max_concurrent <= 0 or per_client_limit <= 0 or max_queue < 0:
+            raise ValueError("max_concurrent and per_client_limit must be > 0, max_queue >= 0")
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.per_client_limit = per_client_limit
+        self.default_deadline = default_deadline
+        self.skip_rerank_load = skip_rerank_load
+        self.keyword_load = keyword_load
+        self.smoothing = smoothing
+        self._condition = threading.Condition()
+        self._active = 0
+        self._waiters: list[tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._per_client: dict[str, int] = {}
+        self._service_seconds: dict[str, float] = {}
+
+    @contextmanager
+    def admit(
+        self,
+        client_id: str,
+        mode: str,
+        deadline: float | None = None,
+        priority: int = 0,
+        modes: Collection[str] | None = None,
+    ) -> Iterator[Admission]:
+        """Hold a slot for the duration of the block, or raise ``Overloaded``.
+
+        ``deadline`` is the time budget in seconds from now (``default_deadline`` if omitted).
+        ``modes`` are the modes the caller can run (any by default); the admitted ``mode`` is
+        always one of them, and its service time is recorded when the block exits.
+        """
+        can_downgrade = modes is None or CHEAPEST_MODE in modes
+        deadline = self.default_deadline if deadline is None else deadline
+        admission = self._acquire(client_id, mode, deadline, priority, can_downgrade)
+        started = time.monotonic()
+        try:
+            yield admission
+        finally:
+            self._release(admission, time.monotonic() - started)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._condition:
+            return {
+                "active": self._active,
+                "queued": len(self._waiters),
+                "service_seconds": dict(self._service_seconds),
+            }
+
+    def estimated_service(self, mode: str) -> float:
+        """Moving average service time of ``mode``; 0 until the first request completes."""
+        return self._service_seconds.get(mode, 0.0)
+
+    def _acquire(self, client_id: str, mode: str, deadline: float, priority: int, can_downgrade: bool) -> Admission:
+        arrived = time.monotonic()
+        expires = arrived + deadline
+        with self._condition:
+            if self._per_client.get(client_id, 0) >= self.per_client_limit:
+                raise self._reject("client_limit", self._expected_wait(len(self._waiters)), status_code=429)
+            if self._active >= self.max_concurrent and len(self._waiters) >= self.max_queue:
+                raise self._reject("queue_full", self._expected_wait(len(self._waiters)))
+
+            entry = (priority, next(self._sequence))
+            ahead = sum(1 for waiter in self._waiters if waiter < entry)
+            wait = self._expected_wait(ahead)
+            load = (self._active + len(self._waiters) + 1) / self.max_concurrent
+            effective = self._choose_mode(mode, load, deadline - wait, can_downgrade)
+            if wait + self.estimated_service(effective) > deadline:
+                raise self._reject("deadline", wait)
+
+            self._per_client[client_id] = self._per_client.get(client_id, 0) + 1
+            heapq.heappush(self._waiters, entry)
+            try:
+                while self._active >= self.max_concurrent or self._waiters[0] != entry:
+                    remaining = expires - self.estimated_service(effective) - time.monotonic()
+                    if remaining <= 0:
+                        raise self._reject("deadline", self._expected_wait(len(self._waiters)))
+                    self._condition.wait(remaining)
+            except Overloaded:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._release_client(client_id)
+                self._condition.notify_all()
+                raise
+
+            heapq.heappop(self._waiters)
+            self._active += 1
+            load = (self._active + len(self._waiters)) / self.max_concurrent
+            effective = self._choose_mode(mode, load, expires - time.monotonic(), can_downgrade)
+            skip_rerank = load > self.skip_rerank_load
+            self._publish()
+            self._condition.notify_all()
+
+        queued = time.monotonic() - arrived
+        admission = Admission(client_id, mode, effective, skip_rerank, queued)
+        METRICS.observe("admission_queue_seconds", queued)
+        METRICS.inc("admission_requests_total", outcome="degraded" if admission.degraded else "admitted")
+        return admission
+
+    def _choose_mode(self, mode: str, load: float, time_left: float, can_downgrade: bool) -> str:
+        """Downgrade to the cheapest mode past ``keyword_load`` or when only it fits ``time_left``."""
+        if not can_downgrade:
+            return mode
+        if load > self.keyword_load or self.estimated_service(mode) > time_left:
+            return CHEAPEST_MODE
+        return mode
+
+    def _release(self, admission: Admission, elapsed: float) -> None:
+        with self._condition:
+            self._active -= 1
+            self._release_client(admission.client_id)
+            previous = self._service_seconds.get(admission.mode)
+            self._service_seconds[admission.mode] = (
+                elapsed if previous is None else (1 - self.smoothing) * previous + self.smoothing * elapsed
+            )
+            self._publish()
+            self._condition.notify_all()
+
+    def _release_client(self, client_id: str) -> None:
+        remaining = self._per_client.get(client_id, 0) - 1
+        if remaining > 0:
+            self._per_client[client_id] = remaining
+        else:
+            self._per_client.pop(client_id, None)
+
+    def _expected_wait(self, ahead: int) -> float:
+        """Queue wait for a request with ``ahead`` waiters before it, from the mean service time."""
+        backlog = ahead + self._active - self.max_concurrent + 1
+        if backlog <= 0:
+            return 0.0
+        services = list(self._service_seconds.values())
+        mean_service = sum(services) / len(services) if services else 0.0
+        return backlog * mean_service / self.max_concurrent
+
+    def _reject(self, reason: str, retry_after: float, status_code: int = 503) -> Overloaded:
+        METRICS.inc("admission_requests_total", outcome=f"rejected_{reason}")
+        return Overloaded(reason, retry_after, status_code=status_code)
+
+    def _publish(self) -> None:
+        METRICS.set_gauge("admission_in_flight", self._active)
+        METRICS.set_gauge("admission_queue_depth", len(self._waiters))
+
+
+class AdmissionFactory:
+    """Build the admission controller from the ``admission`` configuration section."""
+
+    @staticmethod
+    def create(config: dict[str, Any]) -> AdmissionController | None:
+        if not config.get("enabled", True):
+            return None
+        return AdmissionController(
+            max_concurrent=int(config.get("max_concurrent", 8)),
+            max_queue=int(config.get("max_queue", 64)),
+            per_client_limit=int(config.get("per_client_limit", 4)),
+            default_deadline=float(config.get("default_deadline_ms", 10000)) / 1000.0,
+            skip_rerank_load=float(config.get("skip_rerank_load", 0.75)),
+            keyword_load=float(config.get("keyword_load", 1.5)),
+        )
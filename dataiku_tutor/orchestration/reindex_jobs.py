@@ -0,0 +1,236 @@
+"""Background reindex jobs with progress reporting, cancellation and CPU throttling."""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from dataiku_tutor.observability.metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = {SUCCEEDED, FAILED, CANCELLED}
+
+
+class ReindexCancelled(Exception):
+    """Raised inside a running job once cancellation has been requested."""
+
+
+@dataclass
+class ReindexJob:
+    """State and progress counters of one background reindex."""
+
+    id: str
+    source_path: str
+    status: str = QUEUED
+    progress: dict[str, int] = field(default_factory=lambda: {"documents": 0, "chunks": 0, "embeddings": 0})
+    indexed_chunks: int = 0
+    error: str | None = None
+    created_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    cancel_requested: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "source_path": self.source_path,
+            "progress": dict(self.progress),
+            "indexed_chunks": self.indexed_chunks,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class CpuThrottle:
+    """Duty-cycle limiter keeping the combined CPU use of its calling threads near ``max_cpu_fraction``.
+
+    Each ``pause`` adds the CPU time its thread used since that thread's previous call to a
+    shared total (threads first seen are charged from their start, the creating thread from
+    construction) and sleeps until total CPU over elapsed wall time is back under the cap.
+    Debt above ``max_sleep`` is paid by later calls. Work in native thread pools (e.g. torch
+    intra-op threads) or embedding worker processes is not attributed to any caller.
+    """
+
+    def __init__(self, max_cpu_fraction: float = 0.5, max_sleep: float = 1.0) -> None:
+        if not 0 < max_cpu_fraction <= 1:
+            raise ValueError("max_cpu_fraction must be in (0, 1]")
+        self.max_cpu_fraction = max_cpu_fraction
+        self.max_sleep = max_sleep
+        self.slept_seconds = 0.0
+        self._lock = threading.Lock()
+        self._thread_cpu = {threading.get_ident(): time.thread_time()}
+        self._cpu = 0.0
+        self._started = time.monotonic()
+
+    def pause(self, cancelled: threading.Event | None = None) -> float:
+        """Sleep off up to ``max_sleep`` of CPU debt (less if ``cancelled`` is set) and return the delay."""
+        cpu, ident = time.thread_time(), threading.get_ident()
+        with self._lock:
+            self._cpu += cpu - self._thread_cpu.get(ident, 0.0)
+            self._thread_cpu[ident] = cpu
+            owed = self._cpu / self.max_cpu_fraction - (time.monotonic() - self._started)
+        if self.max_cpu_fraction >= 1 or owed <= 0:
+            return 0.0
+        delay = min(owed, self.max_sleep)
+        if cancelled is not None:
+            cancelled.wait(delay)
+        else:
+            time.sleep(delay)
+        with self._lock:
+            self.slept_seconds += delay
+        return delay
+
+
+class ReindexJobManager:
+    """Runs full reindexes on a background worker thread and tracks their progress.
+
+    ``reindex(source_path, progress, pause)`` performs one full rebuild, normally
+    ``IngestionPipeline.run_full_reindex``, which builds into a staging store and promotes it
+    only on success, so a cancelled or failed job leaves the live index untouched. Jobs all
+    rebuild the same store, so they run one at a time; later submissions wait in ``queued``
+    state. ``on_success`` is called with each succeeded job, e.g. to reload query-side state.
+    A submitted ``source_path`` must lie inside ``default_source_path``.
+    The worker runs at a lower OS priority (``nice``, Linux) and is throttled to
+    ``max_cpu_fraction`` to leave CPU for query traffic: every thread of the rebuild calls
+    ``pause`` between items, and the job pays any remaining debt before it is reported done.
+    """
+
+    def __init__(
+        self,
+        reindex: Callable[[str, Callable[[dict[str, int]], None], Callable[[], None]], int],
+        default_source_path: str = "./data/docs",
+        max_cpu_fraction: float = 0.5,
+        nice: int = 10,
+        history_size: int = 50,
+        on_success: Callable[[ReindexJob], None] | None = None,
+    ) -> None:
+        self.reindex = reindex
+        self.default_source_path = default_source_path
+        self.max_cpu_fraction = max_cpu_fraction
+        self.nice = nice
+        self.history_size = history_size
+        self.on_success = on_success
+        self._jobs: OrderedDict[str, ReindexJob] = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="reindex",
+            initializer=self._lower_priority,
+        )
+
+    def submit(self, source_path: str | None = None) -> ReindexJob:
+        """Queue a full reindex of ``source_path`` and return its job immediately.
+
+        Raises ``ValueError`` if ``source_path`` resolves outside ``default_source_path``.
+        """
+        job = ReindexJob(id=uuid.uuid4().hex, source_path=self.resolve_source_path(source_path))
+        with self._lock:
+            self._jobs[job.id] = job
+            self._evict_finished()
+        self._executor.submit(self._run, job)
+        return job
+
+    def resolve_source_path(self, source_path: str | None) -> str:
+        """Resolve ``source_path`` relative to ``default_source_path`` and confine it there."""
+        if not source_path:
+            return self.default_source_path
+        root = Path(self.default_source_path).resolve()
+        resolved = (root / source_path).resolve()
+        if resolved != root and root not in resolved.parents:
+            raise ValueError(f"source_path must be inside {self.default_source_path}")
+        return str(resolved)
+
+    def get(self, job_id: str) -> ReindexJob | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> list[ReindexJob]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> ReindexJob | None:
+        """Request cancellation; queued jobs never start, running ones stop after the current batch."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job.status not in FINISHED_STATES:
+                job.cancel_requested.set()
+                if job.status == QUEUED:
+                    job.status = CANCELLED
+                    job.finished_at = time.time()
+            return job
+
+    def shutdown(self, wait: bool = True) -> None:
+        for job in self.jobs():
+            self.cancel(job.id)
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, job: ReindexJob) -> None:
+        with self._lock:
+            if job.status == CANCELLED:
+                return
+            job.status = RUNNING
+            job.started_at = time.time()
+        throttle = CpuThrottle(self.max_cpu_fraction)
+
+        def on_progress(counts: dict[str, int]) -> None:
+            job.progress = counts
+            if job.cancel_requested.is_set():
+                raise ReindexCancelled(job.id)
+
+        def pause() -> None:
+            throttle.pause(job.cancel_requested)
+
+        try:
+            job.indexed_chunks = self.reindex(job.source_path, on_progress, pause)
+            # Saving and promoting the index happen after the last batch; pay for them too.
+            while not job.cancel_requested.is_set() and throttle.pause(job.cancel_requested):
+                pass
+            status = SUCCEEDED
+            if self.on_success is not None:
+                self.on_success(job)
+        except ReindexCancelled:
+            status = CANCELLED
+        except Exception as exc:
+            logger.exception("reindex job %s failed", job.id)
+            status = FAILED
+            job.error = f"{type(exc).__name__}: {exc}"
+
+        with self._lock:
+            job.status = status
+            job.finished_at = time.time()
+        METRICS.inc("reindex_jobs_total", status=status)
+        METRICS.observe("reindex_throttle_seconds", throttle.slept_seconds)
+
+    def _lower_priority(self) -> None:
+        if self.nice <= 0 or not hasattr(os, "setpriority"):
+            return
+        try:
+            # On Linux a thread id is a valid PRIO_PROCESS target, so only this worker thread is reniced.
+            thread_id = threading.get_native_id()
+            os.setpriority(os.PRIO_PROCESS, thread_id, os.getpriority(os.PRIO_PROCESS, thread_id) + self.nice)
+        except OSError:
+            pass
+
+    def _evict_finished(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in FINISHED_STATES]
+        for job_id in finished[: max(0, len(self._jobs) - self.history_size)]:
+            del self._jobs[job_id]
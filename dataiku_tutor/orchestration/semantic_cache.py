@@ -0,0 +1,246 @@
+"""Semantic near-duplicate cache of answered questions in front of ``TutorService.answer``."""
+
+from __future__ import annotations
+
+import math
+import random
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from dataiku_tutor.domain.models import QueryRequest, QueryResponse
+from dataiku_tutor.observability.metrics import METRICS
+
+
+@dataclass(frozen=True)
+class CacheLookup:
+    """Result of probing the cache; pass it back to ``store`` or ``audit`` to avoid re-embedding."""
+
+    key: tuple[str, int]
+    question: str
+    vector: list[float]
+    generation: int
+    response: QueryResponse | None = None
+    matched_question: str | None = None
+    similarity: float = 0.0
+    audit: bool = False
+
+
+@dataclass(frozen=True)
+class AuditSample:
+    """A sampled cache hit compared against a freshly computed answer."""
+
+    question: str
+    matched_question: str
+    similarity: float
+    source_overlap: float
+    false_hit: bool
+
+
+@dataclass
+class _Entry:
+    question: str
+    key: tuple[str, int]
+    vector: list[float]
+    response: QueryResponse
+
+
+class _Bucket:
+    """Entries sharing one (mode, top_k) key, with their similarity matrix built on demand."""
+
+    def __init__(self) -> None:
+        self.entries: dict[int, _Entry] = {}
+        self.matrix = None
+        self.matrix_ids: list[int] = []
+
+
+class SemanticQueryCache:
+    """Serves cached answers for paraphrases of recently answered questions.
+
+    Questions are embedded with the retrieval ``EmbeddingService`` and compared by cosine
+    similarity against the cached questions with the same mode and ``top_k``; at most
+    ``max_entries`` are kept overall (LRU eviction). A hit needs similarity >= ``threshold``.
+    The whole cache is dropped by ``clear`` (e.g. after a reindex job succeeds) or when the
+    optional ``version()`` callable returns a new value. A fraction
+    ``audit_sample_rate`` of hits is flagged for audit: the caller recomputes the answer and
+    ``audit`` records a false hit when the cited sources overlap less than ``min_source_overlap``.
+    """
+
+    def __init__(
+        self,
+        embedding_service,
+        threshold: float = 0.92,
+        max_entries: int = 1000,
+        version: Callable[[], int] | None = None,
+        audit_sample_rate: float = 0.01,
+        min_source_overlap: float = 0.5,
+        audit_history: int = 100,
+        seed: int | None = None,
+    ) -> None:
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        if max_entries <= 0:
+            raise ValueError("max_entries must be > 0")
+        self.embedding_service = embedding_service
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.version = version
+        self.audit_sample_rate = audit_sample_rate
+        self.min_source_overlap = min_source_overlap
+        self._lru: OrderedDict[int, tuple[str, int]] = OrderedDict()
+        self._buckets: dict[tuple[str, int], _Bucket] = {}
+        self._next_id = 0
+        self._generation = 0
+        self._version: int | None = None
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._audits: deque[AuditSample] = deque(maxlen=audit_history)
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    def lookup(self, request: QueryRequest) -> CacheLookup:
+        """Embed the question and return the best cached response above the threshold, if any."""
+        question = " ".join(request.question.split())
+        key = (request.mode, request.top_k)
+        vector = self._normalize(self.embedding_service.embed([question])[0])
+        version = self.version() if self.version is not None else None
+
+        with self._lock:
+            if version != self._version:
+                self._clear()
+                self._version = version
+            probe = CacheLookup(key=key, question=question, vector=vector, generation=self._generation)
+            entry_id, similarity = self._best_match(vector, key)
+            if entry_id is None or similarity < self.threshold:
+                METRICS.record_cache_lookup("semantic", hit=False)
+                return probe
+            self._lru.move_to_end(entry_id)
+            entry = self._buckets[key].entries[entry_id]
+            audit = self._random.random() < self.audit_sample_rate
+
+        METRICS.record_cache_lookup("semantic", hit=True)
+        METRICS.observe("semantic_cache_similarity", similarity)
+        return CacheLookup(
+            key=key,
+            question=question,
+            vector=vector,
+            generation=probe.generation,
+            response=entry.response,
+            matched_question=entry.question,
+            similarity=similarity,
+            audit=audit,
+        )
+
+    def store(self, lookup: CacheLookup, response: QueryResponse) -> None:
+        """Cache ``response`` for the probed question.
+
+        Degraded answers are not cached, nor answers probed before the last ``clear``.
+        """
+        if response.degraded:
+            return
+        with self._lock:
+            if lookup.generation != self._generation:
+                return
+            entry_id = self._next_id
+            self._next_id += 1
+            self._bucket_changed(lookup.key).entries[entry_id] = _Entry(lookup.question, lookup.key, lookup.vector, response)
+            self._lru[entry_id] = lookup.key
+            while len(self._lru) > self.max_entries:
+                evicted_id, evicted_key = self._lru.popitem(last=False)
+                bucket = self._bucket_changed(evicted_key)
+                del bucket.entries[evicted_id]
+                if not bucket.entries:
+                    del self._buckets[evicted_key]
+            METRICS.set_gauge("semantic_cache_entries", len(self._lru))
+
+    def audit(self, lookup: CacheLookup, fresh: QueryResponse) -> AuditSample:
+        """Compare a sampled hit with a freshly computed answer and record the outcome."""
+        cached_sources = self._source_ids(lookup.response)
+        fresh_sources = self._source_ids(fresh)
+        union = cached_sources | fresh_sources
+        overlap = len(cached_sources & fresh_sources) / len(union) if union else 1.0
+        sample = AuditSample(
+            question=lookup.question,
+            matched_question=lookup.matched_question or "",
+            similarity=lookup.similarity,
+            source_overlap=overlap,
+            false_hit=overlap < self.min_source_overlap,
+        )
+        with self._lock:
+            self._audits.append(sample)
+        METRICS.inc("semantic_cache_audits_total", result="false_hit" if sample.false_hit else "ok")
+        return sample
+
+    def audit_samples(self) -> list[AuditSample]:
+        with self._lock:
+            return list(self._audits)
+
+    def clear(self) -> None:
+        """Drop every entry, including answers still being computed for earlier lookups."""
+        with self._lock:
+            self._clear()
+
+    def _clear(self) -> None:
+        self._lru.clear()
+        self._buckets.clear()
+        self._generation += 1
+        METRICS.set_gauge("semantic_cache_entries", 0)
+
+    def _bucket_changed(self, key: tuple[str, int]) -> _Bucket:
+        bucket = self._buckets.setdefault(key, _Bucket())
+        bucket.matrix = None
+        return bucket
+
+    def _best_match(self, vector: list[float], key: tuple[str, int]) -> tuple[int | None, float]:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return None, 0.0
+        try:
+            import numpy as np
+        except ImportError:
+            scores = {
+                entry_id: sum(a * b for a, b in zip(vector, entry.vector)) for entry_id, entry in bucket.entries.items()
+            }
+            best = max(scores, key=scores.__getitem__)
+            return best, scores[best]
+
+        if bucket.matrix is None:
+            bucket.matrix_ids = list(bucket.entries)
+            bucket.matrix = np.asarray([bucket.entries[entry_id].vector for entry_id in bucket.matrix_ids], dtype=np.float32)
+        scores = bucket.matrix @ np.asarray(vector, dtype=np.float32)
+        best = int(scores.argmax())
+        return bucket.matrix_ids[best], float(scores[best])
+
+    @staticmethod
+    def _normalize(vector: list[float]) -> list[float]:
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [float(value) / norm for value in vector]
+
+    @staticmethod
+    def _source_ids(response: QueryResponse | None) -> set[str]:
+        if response is None:
+            return set()
+        return {
+            str(chunk_id) for source in response.sources for chunk_id in source.get("chunk_ids") or [source.get("chunk_id", "")]
+        }
+
+
+class SemanticCacheFactory:
+    """Build the semantic query cache from the ``semantic_cache`` configuration section."""
+
+    @staticmethod
+    def create(
+        config: dict[str, Any], embedding_service, version: Callable[[], int] | None = None
+    ) -> SemanticQueryCache | None:
+        if not config.get("enabled", True):
+            return None
+        return SemanticQueryCache(
+            embedding_service,
+            threshold=float(config.get("threshold", 0.92)),
+            max_entries=int(config.get("max_entries", 1000)),
+            version=version,
+            audit_sample_rate=float(config.get("audit_sample_rate", 0.01)),
+            min_source_overlap=float(config.get("min_source_overlap", 0.5)),
+        )
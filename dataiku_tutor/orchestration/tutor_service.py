@@ -1,19 +1,176 @@
 """Application service orchestrating retrieval and generation flows."""
 
+from dataiku_tutor.config.settings import Settings
 from dataiku_tutor.domain.models import QueryRequest, QueryResponse
+from dataiku_tutor.embeddings.embedding_service import EmbeddingFactory, EmbeddingService
+from dataiku_tutor.generation.context_packer import ContextPacker
+from dataiku_tutor.generation.llm_client import LLMClientFactory
+from dataiku_tutor.generation.response_generator import ResponseGenerator
+from dataiku_tutor.observability.metrics import METRICS
+from dataiku_tutor.orchestration.admission import AdmissionFactory
+from dataiku_tutor.orchestration.semantic_cache import SemanticCacheFactory
+from dataiku_tutor.retrieval.hybrid_retriever import HybridRetriever
+from dataiku_tutor.retrieval.keyword_retriever import KeywordRetriever
+from dataiku_tutor.retrieval.reranker import RerankerFactory, RerankingRetriever
+from dataiku_tutor.retrieval.semantic_retriever import SemanticRetriever
+from dataiku_tutor.vectorstore.faiss_store import VectorStoreFactory
 
 
 class TutorService:
-    """Coordinates retriever selection and response generation."""
+    """Coordinates retriever selection and response generation.
 
-    def __init__(self, retrievers: dict[str, object], response_generator) -> None:
+    With an ``AdmissionController``, each request first takes a slot (or is rejected with
+    ``Overloaded``) and may be downgraded to a cheaper mode or run without reranking. With a
+    ``SemanticQueryCache``, admitted requests whose retriever embeds the question are looked up
+    first, and the lookup's embedding is reused for retrieval on a miss; keyword retrieval
+    bypasses the cache so it never pays for an embedding. ``reload`` swaps in retrievers over a
+    rebuilt index.
+    """
+
+    def __init__(self, retrievers: dict[str, object], response_generator, admission=None, semantic_cache=None) -> None:
         self.retrievers = retrievers
         self.response_generator = response_generator
+        self.admission = admission
+        self.semantic_cache = semantic_cache
 
     def answer(self, request: QueryRequest) -> QueryResponse:
         """Process user question and return grounded answer + sources."""
-        raise NotImplementedError
+        retrievers = self.retrievers
+        if self.admission is None:
+            return self._answer(request, retrievers, request.mode, skip_rerank=False)
+
+        deadline = request.deadline_ms / 1000.0 if request.deadline_ms is not None else None
+        admit = self.admission.admit(
+            request.client_id, request.mode, deadline=deadline, priority=request.priority, modes=retrievers
+        )
+        with admit as admitted:
+            return self._answer(request, retrievers, admitted.mode, skip_rerank=admitted.skip_rerank)
+
+    def reload(self, retrievers: dict[str, object]) -> None:
+        """Serve later queries from ``retrievers`` and drop answers cached from the old index."""
+        self.retrievers = retrievers
+        if self.semantic_cache is not None:
+            self.semantic_cache.clear()
+
+    def publish_index_stats(self, registry) -> None:
+        """Metrics collector: export the size of the index queries are served from."""
+        vector_store = self._vector_store()
+        if vector_store is None:
+            return
+        for name, value in vector_store.stats().items():
+            registry.set_gauge(f"index_{name}", value)
+
+    def index_version(self) -> int | None:
+        """Mutation counter of the index queries are served from, for cache invalidation."""
+        vector_store = self._vector_store()
+        return getattr(vector_store, "version", None)
+
+    def close(self) -> None:
+        close = getattr(self.response_generator.llm_client, "close", None)
+        if close is not None:
+            close()
+
+    def _vector_store(self):
+        return getattr(self.retrievers.get("semantic"), "vector_store", None)
 
-    def _select_retriever(self, mode: str):
+    def _answer(self, request: QueryRequest, retrievers: dict[str, object], mode: str, skip_rerank: bool) -> QueryResponse:
+        retriever = self._select_retriever(retrievers, mode)
+        if skip_rerank and isinstance(retriever, RerankingRetriever):
+            retriever = retriever.retriever
+        if self.semantic_cache is None or isinstance(retriever, KeywordRetriever):
+            return self._generate(request, retrievers, retriever, mode, skip_rerank)
+
+        lookup = self.semantic_cache.lookup(request)
+        if lookup.response is not None and not lookup.audit:
+            return lookup.response
+        response = self._generate(request, retrievers, retriever, mode, skip_rerank, query_embedding=lookup.vector)
+        if lookup.response is not None:
+            self.semantic_cache.audit(lookup, response)
+        else:
+            self.semantic_cache.store(lookup, response)
+        return response
+
+    def _generate(
+        self,
+        request: QueryRequest,
+        retrievers: dict[str, object],
+        retriever,
+        mode: str,
+        skip_rerank: bool,
+        query_embedding: list[float] | None = None,
+    ) -> QueryResponse:
+        with METRICS.profile("query"), METRICS.timer("query_seconds", mode=mode):
+            if query_embedding is None:
+                retrieved = retriever.retrieve(request.question, request.top_k)
+            else:
+                retrieved = retriever.retrieve(request.question, request.top_k, query_embedding=query_embedding)
+            context = self.response_generator.pack_context(retrieved)
+            answer = self.response_generator.generate(request.question, retrieved, context=context)
+            degraded = mode != request.mode or (skip_rerank and retriever is not retrievers[mode])
+            if degraded:
+                METRICS.inc("query_degraded_total", mode=mode, rerank="skipped" if skip_rerank else "kept")
+            return QueryResponse(
+                answer=answer,
+                sources=self.response_generator.format_sources(retrieved, context=context),
+                usage={"context_tokens": context.tokens_used, "context_tokens_saved": context.tokens_saved},
+                mode=mode,
+                degraded=degraded,
+            )
+
+    @staticmethod
+    def _select_retriever(retrievers: dict[str, object], mode: str):
         """Route retrieval mode to semantic, keyword, or hybrid strategy."""
-        raise NotImplementedError
+        retriever = retrievers.get(mode)
+        if retriever is None:
+            raise ValueError(f"Unsupported retrieval mode: {mode}")
+        return retriever
+
+
+class TutorServiceFactory:
+    """Build the query service from application settings."""
+
+    @staticmethod
+    def create(settings: Settings, embedding_service: EmbeddingService | None = None) -> TutorService:
+        if embedding_service is None:
+            embedding_service = TutorServiceFactory.create_embedding_service(settings)
+        generation_cfg = settings.section("generation")
+        max_sources = int(generation_cfg.get("max_sources", 5))
+        service = TutorService(
+            retrievers=TutorServiceFactory.create_retrievers(settings, embedding_service),
+            response_generator=ResponseGenerator(
+                LLMClientFactory.create(settings.section("llm")),
+                max_sources=max_sources,
+                context_packer=ContextPacker(
+                    token_budget=int(generation_cfg.get("context_token_budget", 2000)), max_segments=max_sources
+                ),
+            ),
+            admission=AdmissionFactory.create(settings.section("admission")),
+        )
+        service.semantic_cache = SemanticCacheFactory.create(
+            settings.section("semantic_cache"), embedding_service, version=service.index_version
+        )
+        return service
+
+    @staticmethod
+    def create_embedding_service(settings: Settings) -> EmbeddingService:
+        embedding_cfg = settings.section("embeddings")
+        return EmbeddingFactory.create(
+            provider=str(embedding_cfg.get("provider", "sentence_transformers")),
+            model_name=str(embedding_cfg.get("model_name", "all-MiniLM-L6-v2")),
+        )
+
+    @staticmethod
+    def create_retrievers(settings: Settings, embedding_service: EmbeddingService) -> dict[str, object]:
+        """Open the configured vector store and build the semantic, keyword and hybrid retrievers."""
+        retrieval_cfg = settings.section("retrieval")
+        vector_store = VectorStoreFactory.create(settings.section("vectorstore"))
+        semantic = SemanticRetriever(embedding_service, vector_store)
+        keyword = KeywordRetriever()
+        keyword.build_index(vector_store.chunks())
+        hybrid = HybridRetriever(semantic, keyword, semantic_weight=float(retrieval_cfg.get("hybrid_weight", 0.6)))
+        reranker = RerankerFactory.create(retrieval_cfg)
+        return {
+            "semantic": semantic,
+            "keyword": keyword,
+            "hybrid": RerankingRetriever(hybrid, reranker) if reranker is not None else hybrid,
+        }
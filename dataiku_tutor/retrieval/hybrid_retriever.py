@@ -1,6 +1,7 @@
 """Hybrid retrieval merging semantic and keyword results."""
 
 from dataiku_tutor.domain.models import RetrievedChunk
+from dataiku_tutor.observability.metrics import METRICS
 
 
 class HybridRetriever:
@@ -11,10 +12,41 @@ class HybridRetriever:
         self.keyword_retriever = keyword_retriever
         self.semantic_weight = semantic_weight
 
-    def retrieve(self, query: str, k: int) -> list[RetrievedChunk]:
-        """Merge and rerank semantic and keyword outputs."""
-        raise NotImplementedError
+    def retrieve(self, query: str, k: int, query_embedding: list[float] | None = None) -> list[RetrievedChunk]:
+        """Merge and rerank semantic and keyword outputs; ``query_embedding`` is passed to the semantic side."""
+        if k <= 0:
+            return []
+        if query_embedding is None:
+            semantic = self.semantic_retriever.retrieve(query, k)
+        else:
+            semantic = self.semantic_retriever.retrieve(query, k, query_embedding=query_embedding)
+        keyword = self.keyword_retriever.retrieve(query, k)
+
+        with METRICS.timer("query_stage_seconds", stage="fusion"):
+            fused: dict[str, list] = {}
+            for weight, results in (
+                (self.semantic_weight, self._normalize_scores(semantic)),
+                (1.0 - self.semantic_weight, self._normalize_scores(keyword)),
+            ):
+                for result in results:
+                    entry = fused.setdefault(result.chunk.id, [result.chunk, 0.0])
+                    entry[1] += weight * result.score
+
+            ranked = sorted(fused.values(), key=lambda entry: entry[1], reverse=True)[:k]
+            return [RetrievedChunk(chunk=chunk, score=score, source="hybrid") for chunk, score in ranked]
 
     def _normalize_scores(self, results: list[RetrievedChunk]) -> list[RetrievedChunk]:
         """Normalize retriever-specific score ranges before fusion."""
-        raise NotImplementedError
+        if not results:
+            return []
+        scores = [result.score for result in results]
+        low, high = min(scores), max(scores)
+        spread = high - low
+        return [
+            RetrievedChunk(
+                chunk=result.chunk,
+                score=(result.score - low) / spread if spread > 0 else 1.0,
+                source=result.source,
+            )
+            for result in results
+        ]
@@ -1,18 +1,69 @@
 """Keyword retrieval component (BM25 or equivalent sparse index)."""
 
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from collections import Counter
+
 from dataiku_tutor.domain.models import Chunk, RetrievedChunk
+from dataiku_tutor.observability.metrics import METRICS
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
 
 
 class KeywordRetriever:
     """Performs lexical retrieval to capture exact Dataiku terminology matches."""
 
-    def __init__(self) -> None:
+    METADATA_FIELDS = ("title", "section", "topic", "subtopic", "recipe_name")
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
         self._index_ready = False
+        self._chunks: list[Chunk] = []
+        self._postings: dict[str, list[tuple[int, int]]] = {}
+        self._lengths: list[int] = []
+        self._average_length = 0.0
 
     def build_index(self, chunks: list[Chunk]) -> None:
         """Create sparse index over chunk text and metadata keywords."""
-        raise NotImplementedError
+        postings: dict[str, list[tuple[int, int]]] = {}
+        lengths: list[int] = []
+        for position, chunk in enumerate(chunks):
+            fields = [chunk.content] + [str(chunk.metadata.get(name, "")) for name in self.METADATA_FIELDS]
+            terms = self.tokenize(" ".join(fields))
+            lengths.append(len(terms))
+            for term, frequency in Counter(terms).items():
+                postings.setdefault(term, []).append((position, frequency))
+
+        self._chunks = list(chunks)
+        self._postings = postings
+        self._lengths = lengths
+        self._average_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+        self._index_ready = True
 
     def retrieve(self, query: str, k: int) -> list[RetrievedChunk]:
         """Return top-k keyword matches from sparse index."""
-        raise NotImplementedError
+        if not self._index_ready or k <= 0:
+            return []
+
+        with METRICS.timer("query_stage_seconds", stage="keyword_search"):
+            total = len(self._chunks)
+            scores: dict[int, float] = {}
+            for term in set(self.tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1.0 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+                for position, frequency in postings:
+                    norm = self.k1 * (1.0 - self.b + self.b * self._lengths[position] / (self._average_length or 1.0))
+                    scores[position] = scores.get(position, 0.0) + idf * frequency * (self.k1 + 1.0) / (frequency + norm)
+
+            top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+            return [RetrievedChunk(chunk=self._chunks[position], score=score, source="keyword") for position, score in top]
+
+    @staticmethod
+    def tokenize(text: str) -> list[str]:
+        return _TOKEN_PATTERN.findall(text.lower())
@@ -0,0 +1,236 @@
+"""Budgeted cross-encoder reranking applied after hybrid retrieval."""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Protocol
+
+from dataiku_tutor.domain.models import RetrievedChunk
+from dataiku_tutor.observability.metrics import METRICS
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+class RerankScorer(Protocol):
+    """Scores (query, passage) pairs in a single batched call; higher is more relevant."""
+
+    def score(self, query: str, passages: list[str]) -> list[float]:
+        ...
+
+
+class CrossEncoderScorer:
+    """sentence-transformers ``CrossEncoder`` scorer; the model loads on first use."""
+
+    def __init__(self, model_name: str) -> None:
+        self.model_name = model_name
+        self._model = None
+        self._lock = threading.Lock()
+
+    def score(self, query: str, passages: list[str]) -> list[float]:
+        if not passages:
+            return []
+        with self._lock:
+            if self._model is None:
+                from sentence_transformers import CrossEncoder  # type: ignore
+
+                self._model = CrossEncoder(self.model_name)
+        scores = self._model.predict([(query, passage) for passage in passages])
+        return [float(score) for score in scores]
+
+
+class LexicalOverlapScorer:
+    """Deterministic local stand-in for a cross-encoder, for offline tests and benchmarks.
+
+    Scores by query-term coverage plus a bonus for matching query bigrams. ``cost_per_pair``
+    optionally sleeps to simulate model latency.
+    """
+
+    def __init__(self, cost_per_pair: float = 0.0) -> None:
+        self.cost_per_pair = cost_per_pair
+
+    def score(self, query: str, passages: list[str]) -> list[float]:
+        if self.cost_per_pair > 0 and passages:
+            time.sleep(self.cost_per_pair * len(passages))
+        query_terms = _TOKEN_PATTERN.findall(query.lower())
+        query_set = set(query_terms)
+        query_bigrams = set(zip(query_terms, query_terms[1:]))
+        scores: list[float] = []
+        for passage in passages:
+            terms = _TOKEN_PATTERN.findall(passage.lower())
+            coverage = len(query_set.intersection(terms)) / len(query_set) if query_set else 0.0
+            bigrams = len(query_bigrams.intersection(zip(terms, terms[1:]))) / len(query_bigrams) if query_bigrams else 0.0
+            scores.append(coverage + 0.5 * bigrams)
+        return scores
+
+
+class BudgetedReranker:
+    """Rescores the top-N fused candidates within a strict latency budget.
+
+    Pair scores are cached per (query, chunk id). If the batched scorer call does not finish
+    within ``budget_ms`` the fused order is returned unchanged; a call that has not started yet
+    is cancelled, a running one still caches its late scores. At most ``max_pending`` scorer
+    calls may be outstanding (default ``max_workers``); past that, reranking is skipped rather
+    than queueing behind stale work. N shrinks when the measured per-pair cost or concurrent
+    reranks would exceed the budget, and grows back to ``top_n`` as load drops.
+
+    In a reranked list the head carries rerank scores; the remaining fused candidates keep their
+    order and spacing but are shifted below the lowest rerank score, so ``score`` never
+    increases down the list. Scores are only comparable within one result list.
+    """
+
+    def __init__(
+        self,
+        scorer: RerankScorer,
+        top_n: int = 20,
+        min_top_n: int = 5,
+        budget_ms: float = 150.0,
+        cache_size: int = 10000,
+        max_workers: int = 2,
+        budget_headroom: float = 0.8,
+        max_pending: int | None = None,
+    ) -> None:
+        if top_n <= 0 or min_top_n <= 0:
+            raise ValueError("top_n and min_top_n must be > 0")
+        self.scorer = scorer
+        self.top_n = top_n
+        self.min_top_n = min(min_top_n, top_n)
+        self.budget_seconds = budget_ms / 1000.0
+        self.cache_size = cache_size
+        self.budget_headroom = budget_headroom
+        self.max_pending = max_pending or max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rerank")
+        self._cache: OrderedDict[tuple[str, str], float] = OrderedDict()
+        self._lock = threading.Lock()
+        self._pair_cost: float | None = None
+        self._active = 0
+
+    def current_top_n(self) -> int:
+        """Number of candidates the next call will rescore, adapted to cost and load."""
+        with self._lock:
+            pair_cost = self._pair_cost
+            active = self._active
+        n = self.top_n
+        if pair_cost:
+            n = min(n, int(self.budget_seconds * self.budget_headroom / pair_cost))
+        n = n // (1 + active)
+        return max(self.min_top_n, min(self.top_n, n))
+
+    def rerank(self, query: str, candidates: list[RetrievedChunk], k: int) -> list[RetrievedChunk]:
+        """Return the top ``k`` candidates ordered by rerank score, or fused order on timeout."""
+        if k <= 0 or not candidates:
+            return []
+        started = time.perf_counter()
+        head = candidates[: self.current_top_n()]
+
+        scores: dict[str, float] = {}
+        missing: list[RetrievedChunk] = []
+        with self._lock:
+            for result in head:
+                cached = self._cache.get((query, result.chunk.id))
+                if cached is None:
+                    missing.append(result)
+                else:
+                    self._cache.move_to_end((query, result.chunk.id))
+                    scores[result.chunk.id] = cached
+        for result in head:
+            METRICS.record_cache_lookup("rerank", hit=result.chunk.id in scores)
+
+        if missing:
+            future = self._submit(query, missing)
+            if future is None:
+                METRICS.inc("rerank_fallbacks_total", reason="saturated")
+                return candidates[:k]
+            remaining = self.budget_seconds - (time.perf_counter() - started)
+            try:
+                fresh = future.result(timeout=max(0.0, remaining))
+            except FutureTimeoutError:
+                if future.cancel():
+                    self._finish()
+                METRICS.inc("rerank_fallbacks_total", reason="budget")
+                return candidates[:k]
+            except Exception:
+                METRICS.inc("rerank_fallbacks_total", reason="error")
+                return candidates[:k]
+            scores.update(fresh)
+
+        METRICS.observe("query_stage_seconds", time.perf_counter() - started, stage="rerank")
+        reranked = sorted(head, key=lambda result: scores[result.chunk.id], reverse=True)
+        results = [
+            RetrievedChunk(chunk=result.chunk, score=scores[result.chunk.id], source="rerank") for result in reranked
+        ]
+        tail = candidates[len(head) : k]
+        if results and tail:
+            shift = results[-1].score - 1.0 - tail[0].score
+            results += [RetrievedChunk(chunk=r.chunk, score=r.score + shift, source=r.source) for r in tail]
+        return results[:k]
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+    def _submit(self, query: str, missing: list[RetrievedChunk]) -> Future | None:
+        """Queue a scorer call, or return ``None`` when ``max_pending`` calls are outstanding."""
+        with self._lock:
+            if self._active >= self.max_pending:
+                return None
+            self._active += 1
+        return self._executor.submit(self._score, query, missing)
+
+    def _finish(self) -> None:
+        with self._lock:
+            self._active -= 1
+
+    def _score(self, query: str, missing: list[RetrievedChunk]) -> dict[str, float]:
+        try:
+            started = time.perf_counter()
+            values = self.scorer.score(query, [result.chunk.content for result in missing])
+            pair_cost = (time.perf_counter() - started) / len(missing)
+            scores = {result.chunk.id: float(value) for result, value in zip(missing, values)}
+            with self._lock:
+                self._pair_cost = pair_cost if self._pair_cost is None else 0.8 * self._pair_cost + 0.2 * pair_cost
+                for chunk_id, value in scores.items():
+                    self._cache[(query, chunk_id)] = value
+                    self._cache.move_to_end((query, chunk_id))
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            return scores
+        finally:
+            self._finish()
+
+
+class RerankingRetriever:
+    """Wraps a retriever (typically ``HybridRetriever``) and reranks its top candidates."""
+
+    def __init__(self, retriever, reranker: BudgetedReranker) -> None:
+        self.retriever = retriever
+        self.reranker = reranker
+
+    def retrieve(self, query: str, k: int, query_embedding: list[float] | None = None) -> list[RetrievedChunk]:
+        top_n = max(k, self.reranker.top_n)
+        if query_embedding is None:
+            candidates = self.retriever.retrieve(query, top_n)
+        else:
+            candidates = self.retriever.retrieve(query, top_n, query_embedding=query_embedding)
+        return self.reranker.rerank(query, candidates, k)
+
+
+class RerankerFactory:
+    """Build the reranking stage from the ``retrieval`` configuration section."""
+
+    @staticmethod
+    def create(config: dict[str, Any]) -> BudgetedReranker | None:
+        if not config.get("rerank", False):
+            return None
+        model = str(config.get("rerank_model", "cross-encoder/ms-marco-MiniLM-L-6-v2")).strip()
+        scorer: RerankScorer = LexicalOverlapScorer() if model.lower() == "lexical" else CrossEncoderScorer(model)
+        return BudgetedReranker(
+            scorer=scorer,
+            top_n=int(config.get("rerank_top_n", 20)),
+            min_top_n=int(config.get("rerank_min_top_n", 5)),
+            budget_ms=float(config.get("rerank_budget_ms", 150)),
+            cache_size=int(config.get("rerank_cache_size", 10000)),
+        )
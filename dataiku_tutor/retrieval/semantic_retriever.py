@@ -1,6 +1,7 @@
 """Dense retrieval component for semantic matching."""
 
 from dataiku_tutor.domain.models import RetrievedChunk
+from dataiku_tutor.observability.metrics import METRICS
 
 
 class SemanticRetriever:
@@ -10,6 +11,10 @@ class SemanticRetriever:
         self.embedding_service = embedding_service
         self.vector_store = vector_store
 
-    def retrieve(self, query: str, k: int) -> list[RetrievedChunk]:
-        """Return top-k semantically similar documentation chunks."""
-        raise NotImplementedError
+    def retrieve(self, query: str, k: int, query_embedding: list[float] | None = None) -> list[RetrievedChunk]:
+        """Return top-k semantically similar documentation chunks; ``query_embedding`` skips embedding ``query``."""
+        if query_embedding is None:
+            with METRICS.timer("query_stage_seconds", stage="query_embedding"):
+                query_embedding = self.embedding_service.embed([query])[0]
+        with METRICS.timer("query_stage_seconds", stage="vector_search"):
+            return self.vector_store.search(query_embedding, k)
@@ -1,6 +1,11 @@
 """Gradio UI skeleton for local operator experience."""
 
-import gradio as gr
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import gradio as gr
 
 
 class TutorUI:
@@ -15,6 +20,8 @@ class TutorUI:
 
     def build(self) -> gr.Blocks:
         """Build a local Gradio app with retrieval mode and top-k controls."""
+        import gradio as gr
+
         with gr.Blocks() as app:
             gr.Markdown("# Dataiku Tutor Assistant")
             query_input = gr.Textbox(label="Ask a Dataiku question", lines=3)
@@ -3,7 +3,7 @@
 from abc import ABC, abstractmethod
 from typing import Any
 
-from dataiku_tutor.domain.models import RetrievedChunk
+from dataiku_tutor.domain.models import Chunk, RetrievedChunk
 
 
 class BaseVectorStore(ABC):
@@ -24,3 +24,19 @@ class BaseVectorStore(ABC):
     @abstractmethod
     def save(self) -> None:
         """Persist in-memory state to durable storage."""
+
+    def chunks(self) -> list[Chunk]:
+        """Return every live chunk, e.g. to build a keyword index over the same corpus."""
+        raise NotImplementedError(f"{type(self).__name__} does not support listing chunks")
+
+    def stats(self) -> dict[str, int]:
+        """Report size counters (vectors, deleted ids, bytes on disk) for monitoring."""
+        return {}
+
+    def staging(self) -> "BaseVectorStore":
+        """Return an empty store at a private location to rebuild into, for ``promote``."""
+        raise NotImplementedError(f"{type(self).__name__} does not support staged rebuilds")
+
+    def promote(self, staged: "BaseVectorStore") -> None:
+        """Atomically replace this store's persisted contents with a store from ``staging``."""
+        raise NotImplementedError(f"{type(self).__name__} does not support staged rebuilds")
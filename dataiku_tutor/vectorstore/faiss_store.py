@@ -2,30 +2,59 @@
 
 from __future__ import annotations
 
+import importlib.util
 import json
 import math
+import os
 from pathlib import Path
 from typing import Any
 
 from dataiku_tutor.domain.models import Chunk, RetrievedChunk
 from dataiku_tutor.vectorstore.base_store import BaseVectorStore
+from dataiku_tutor.vectorstore.durability import fsync_dir, fsync_file
 
 
 class FaissVectorStore(BaseVectorStore):
-    """Local FAISS implementation with metadata persistence."""
-
-    def __init__(self, index_path: str, metadata_path: str) -> None:
+    """Local FAISS implementation with metadata persistence.
+
+    Mutations are recorded in an append-only write-ahead log (WAL) on ``save()``, so small
+    incremental updates cost I/O proportional to the change. Once ``checkpoint_interval``
+    logged rows accumulate, the index and metadata are rewritten to temp files and renamed
+    atomically; ``_load_existing`` finishes interrupted checkpoints and replays the WAL.
+    """
+
+    def __init__(
+        self,
+        index_path: str,
+        metadata_path: str,
+        wal_path: str | None = None,
+        checkpoint_interval: int = 10000,
+    ) -> None:
         self.index_path = Path(index_path)
         self.metadata_path = Path(metadata_path)
+        self.wal_path = Path(wal_path) if wal_path else self.metadata_path.with_suffix(".wal")
+        self.checkpoint_interval = checkpoint_interval
+        self._reset()
+        self._load_runtime_backend()
+        self._load_existing()
+
+    def _reset(self) -> None:
+        self._seq = 0
+        self._wal_rows = 0
+        self._pending_ops: list[dict[str, Any]] = []
+        self._pending_rows = 0
+        self._needs_checkpoint = False
         self._dim: int | None = None
         self._metadata: list[dict[str, Any]] = []
         self._deleted_ids: set[str] = set()
         self._index = None
         self._vectors: list[list[float]] = []
-        self._use_faiss = False
+        self._index_loaded = False
 
-        self._load_runtime_backend()
-        self._load_existing()
+    @property
+    def version(self) -> int:
+        """Sequence number of the last applied mutation; changes whenever the index does."""
+        return self._seq
 
     def add(self, embeddings: list[list[float]], metadata: list[dict[str, Any]]) -> None:
         if len(embeddings) != len(metadata):
@@ -33,20 +62,25 @@ class FaissVectorStore(BaseVectorStore):
         if not embeddings:
             return
 
+        self._apply_add(embeddings, metadata)
+        self._log({"op": "add", "vectors": embeddings, "metadata": metadata}, rows=len(embeddings))
+
+    def _apply_add(self, embeddings: list[list[float]], metadata: list[dict[str, Any]]) -> None:
         dim = len(embeddings[0])
         if any(len(vector) != dim for vector in embeddings):
             raise ValueError("all embeddings must have consistent dimensions")
         if self._dim is None:
             self._dim = dim
-            if self._use_faiss:
+            if self._faiss_available():
                 self._index = self._faiss().IndexFlatIP(dim)
+                self._index_loaded = True
         elif self._dim != dim:
             raise ValueError(f"expected embedding dimension {self._dim}, got {dim}")
 
         normalized = [self._normalize(v) for v in embeddings]
 
-        if self._use_faiss:
-            self._index.add(self._to_faiss_matrix(normalized))
+        if self._faiss_available():
+            self._faiss_index().add(self._to_faiss_matrix(normalized))
         else:
             self._vectors.extend(normalized)
 
@@ -62,8 +96,8 @@ class FaissVectorStore(BaseVectorStore):
 
         query = self._normalize(query_embedding)
 
-        if self._use_faiss:
-            scores, indices = self._index.search(self._to_faiss_matrix([query]), min(k, len(self._metadata)))
+        if self._faiss_available():
+            scores, indices = self._faiss_index().search(self._to_faiss_matrix([query]), min(k, len(self._metadata)))
             scored = [(int(idx), float(score)) for idx, score in zip(indices[0].tolist(), scores[0].tolist())]
         else:
             scored = [(idx, self._dot(query, vector)) for idx, vector in enumerate(self._vectors)]
@@ -75,62 +109,250 @@ class FaissVectorStore(BaseVectorStore):
             if idx < 0 or idx >= len(self._metadata):
                 continue
             row = self._metadata[idx]
-            chunk_id = str(row.get("id", ""))
-            if chunk_id and chunk_id in self._deleted_ids:
+            if self._is_deleted(row):
                 continue
-            chunk = Chunk(
-                id=chunk_id,
-                document_id=str(row.get("document_id", "")),
-                content=str(row.get("content", "")),
-                metadata=row.get("metadata", {}),
-            )
-            results.append(RetrievedChunk(chunk=chunk, score=float(score), source="faiss"))
+            results.append(RetrievedChunk(chunk=self._chunk(row), score=float(score), source="faiss"))
         return results
 
+    def chunks(self) -> list[Chunk]:
+        return [self._chunk(row) for row in self._metadata if not self._is_deleted(row)]
+
     def delete(self, ids: list[str]) -> None:
+        if not ids:
+            return
         self._deleted_ids.update(ids)
+        self._log({"op": "delete", "ids": list(ids)}, rows=len(ids))
 
     def save(self) -> None:
+        """Append pending mutations to the WAL, or checkpoint when the log grows too large."""
+        has_checkpoint = self.metadata_path.exists() and self.index_path.exists()
+        if (
+            self._needs_checkpoint
+            or not has_checkpoint
+            or self._wal_rows + self._pending_rows >= self.checkpoint_interval
+        ):
+            self.checkpoint()
+        elif self._pending_ops:
+            self._append_wal(self._pending_ops)
+            self._wal_rows += self._pending_rows
+
+        self._pending_ops = []
+        self._pending_rows = 0
+
+    def stats(self) -> dict[str, int]:
+        files = [self.index_path, self.metadata_path, self.wal_path]
+        return {
+            "vectors": len(self._metadata),
+            "deleted": len(self._deleted_ids),
+            "bytes": sum(path.stat().st_size for path in files if path.exists()),
+        }
+
+    def staging(self) -> FaissVectorStore:
+        """Empty store in ``*.staging`` files beside this one; leftovers of an aborted rebuild are removed.
+
+        Its sequence numbers continue from this store's, so ``version`` still increases after
+        ``promote`` and the old WAL records are never replayed over the promoted checkpoint.
+        """
+        paths = [self._staging_path(path) for path in (self.index_path, self.metadata_path, self.wal_path)]
+        for path in paths + [self._tmp_path(path) for path in paths[:2]]:
+            path.unlink(missing_ok=True)
+        staged = FaissVectorStore(
+            index_path=str(paths[0]),
+            metadata_path=str(paths[1]),
+            wal_path=str(paths[2]),
+            checkpoint_interval=self.checkpoint_interval,
+        )
+        staged._seq = self._seq + 1
+        return staged
+
+    def promote(self, staged: BaseVectorStore) -> None:
+        """Swap ``staged``'s checkpoint in with the checkpoint protocol and reload from it."""
+        if not isinstance(staged, FaissVectorStore):
+            raise TypeError("can only promote a FaissVectorStore")
+        staged.save()
+        if staged.wal_path.exists() or not staged.metadata_path.exists():
+            staged.checkpoint()
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        self.metadata_path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(staged.index_path, self._tmp_path(self.index_path))
+        # Once the complete metadata temp file is in place, _recover_checkpoint rolls the swap forward.
+        os.replace(staged.metadata_path, self._tmp_path(self.metadata_path))
+        fsync_dir(self.metadata_path.parent)
+        os.replace(self._tmp_path(self.index_path), self.index_path)
+        os.replace(self._tmp_path(self.metadata_path), self.metadata_path)
+        fsync_dir(self.metadata_path.parent)
+        # Every logged op has a lower seq than the promoted checkpoint, so the old WAL is dead.
+        self.wal_path.unlink(missing_ok=True)
+
+        self._reset()
+        self._load_existing()
+
+    def checkpoint(self) -> None:
+        """Atomically rewrite index and metadata files, then discard the WAL."""
         self.index_path.parent.mkdir(parents=True, exist_ok=True)
         self.metadata_path.parent.mkdir(parents=True, exist_ok=True)
+        index_tmp = self._tmp_path(self.index_path)
+        metadata_tmp = self._tmp_path(self.metadata_path)
 
-        if self._use_faiss:
-            self._faiss().write_index(self._index, str(self.index_path))
+        if self._faiss_available():
+            self._faiss().write_index(self._faiss_index(), str(index_tmp))
         else:
             # Persist fallback vectors as JSON for dependency-free local execution.
-            payload = {"vectors": self._vectors}
-            self.index_path.write_text(json.dumps(payload), encoding="utf-8")
+            index_tmp.write_text(json.dumps({"vectors": self._vectors}), encoding="utf-8")
+        fsync_file(index_tmp)
 
         payload = {
             "dim": self._dim,
+            "checkpoint_seq": self._seq,
             "metadata": self._metadata,
             "deleted_ids": sorted(self._deleted_ids),
         }
-        self.metadata_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        metadata_tmp.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        fsync_file(metadata_tmp)
+
+        # The metadata temp file is the commit marker: once it is complete, recovery rolls forward.
+        os.replace(index_tmp, self.index_path)
+        os.replace(metadata_tmp, self.metadata_path)
+        fsync_dir(self.metadata_path.parent)
+
+        self.wal_path.unlink(missing_ok=True)
+        self._wal_rows = 0
+        self._pending_ops = []
+        self._pending_rows = 0
+        self._needs_checkpoint = False
+
+    def _log(self, op: dict[str, Any], rows: int) -> None:
+        self._seq += 1
+        if self._needs_checkpoint:
+            return
+        self._pending_ops.append({"seq": self._seq, **op})
+        self._pending_rows += rows
+        if self._wal_rows + self._pending_rows >= self.checkpoint_interval:
+            # Bulk loads go straight to a checkpoint; stop retaining their log records.
+            self._needs_checkpoint = True
+            self._pending_ops = []
+            self._pending_rows = 0
+
+    def _append_wal(self, ops: list[dict[str, Any]]) -> None:
+        self.wal_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.wal_path.open("a", encoding="utf-8") as handle:
+            for op in ops:
+                handle.write(json.dumps(op, ensure_ascii=False) + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+
+    def _replay_wal(self) -> None:
+        if not self.wal_path.exists():
+            return
+
+        valid_bytes = 0
+        with self.wal_path.open("rb") as handle:
+            for line in handle:
+                try:
+                    op = json.loads(line)
+                except ValueError:
+                    break  # torn tail from a crash during append
+                if not line.endswith(b"\n"):
+                    break
+                valid_bytes += len(line)
+                seq = int(op.get("seq", 0))
+                if seq <= self._seq:
+                    continue
+                if op.get("op") == "add":
+                    self._apply_add(op.get("vectors", []), op.get("metadata", []))
+                    self._wal_rows += len(op.get("metadata", []))
+                elif op.get("op") == "delete":
+                    self._deleted_ids.update(op.get("ids", []))
+                    self._wal_rows += len(op.get("ids", []))
+                self._seq = seq
+
+        if valid_bytes < self.wal_path.stat().st_size:
+            os.truncate(self.wal_path, valid_bytes)
+
+    def _recover_checkpoint(self) -> None:
+        """Finish or discard a checkpoint interrupted between temp-file writes and renames."""
+        index_tmp = self._tmp_path(self.index_path)
+        metadata_tmp = self._tmp_path(self.metadata_path)
+        if metadata_tmp.exists():
+            try:
+                json.loads(metadata_tmp.read_text(encoding="utf-8"))
+                complete = True
+            except ValueError:
+                complete = False
+            if complete:
+                if index_tmp.exists():
+                    os.replace(index_tmp, self.index_path)
+                os.replace(metadata_tmp, self.metadata_path)
+                return
+            metadata_tmp.unlink()
+        index_tmp.unlink(missing_ok=True)
+
+    @staticmethod
+    def _tmp_path(path: Path) -> Path:
+        return path.with_name(path.name + ".tmp")
+
+    @staticmethod
+    def _staging_path(path: Path) -> Path:
+        return path.with_name(path.name + ".staging")
 
     def _load_runtime_backend(self) -> None:
-        try:
-            self._faiss()
-            self._use_faiss = True
-        except Exception:
-            self._use_faiss = False
+        # Only check that faiss is installed; importing it is deferred to _faiss_available().
+        self._use_faiss = importlib.util.find_spec("faiss") is not None
+        self._faiss_imported = False
+
+    def _faiss_available(self) -> bool:
+        """Import faiss on first use, switching to the pure-Python index if the import fails."""
+        if self._use_faiss and not self._faiss_imported:
+            try:
+                self._faiss()
+                self._faiss_imported = True
+            except ImportError:
+                # Installed but broken, e.g. its numpy dependency is missing.
+                self._use_faiss = False
+                self._load_fallback_vectors()
+        return self._use_faiss
+
+    def _faiss_index(self):
+        """FAISS index, read from the checkpoint (or created empty) on first use."""
+        if not self._index_loaded:
+            if self.index_path.exists():
+                self._index = self._faiss().read_index(str(self.index_path))
+            else:
+                self._index = self._faiss().IndexFlatIP(self._dim or 1)
+            self._index_loaded = True
+        return self._index
 
     def _load_existing(self) -> None:
+        self._recover_checkpoint()
         if self.metadata_path.exists():
             payload = json.loads(self.metadata_path.read_text(encoding="utf-8"))
             self._dim = payload.get("dim")
+            self._seq = int(payload.get("checkpoint_seq", 0))
             self._metadata = payload.get("metadata", [])
             self._deleted_ids = set(payload.get("deleted_ids", []))
 
-        if self._use_faiss:
-            if self.index_path.exists():
-                self._index = self._faiss().read_index(str(self.index_path))
-            else:
-                self._index = self._faiss().IndexFlatIP(self._dim or 1)
-        else:
-            if self.index_path.exists():
-                payload = json.loads(self.index_path.read_text(encoding="utf-8"))
-                self._vectors = payload.get("vectors", [])
+        if not self._use_faiss:
+            self._load_fallback_vectors()
+
+        self._replay_wal()
+
+    def _load_fallback_vectors(self) -> None:
+        if self.index_path.exists():
+            payload = json.loads(self.index_path.read_text(encoding="utf-8"))
+            self._vectors = payload.get("vectors", [])
+
+    def _is_deleted(self, row: dict[str, Any]) -> bool:
+        chunk_id = str(row.get("id", ""))
+        return bool(chunk_id) and chunk_id in self._deleted_ids
+
+    @staticmethod
+    def _chunk(row: dict[str, Any]) -> Chunk:
+        return Chunk(
+            id=str(row.get("id", "")),
+            document_id=str(row.get("document_id", "")),
+            content=str(row.get("content", "")),
+            metadata=row.get("metadata", {}),
+        )
 
     @staticmethod
     def _normalize(vector: list[float]) -> list[float]:
@@ -170,9 +392,20 @@ class VectorStoreFactory:
     @staticmethod
     def create(config: dict[str, Any]) -> BaseVectorStore:
         store_type = str(config.get("type", "faiss")).lower().strip()
+        if store_type == "sharded":
+            from dataiku_tutor.vectorstore.sharded_store import ShardedVectorStore
+
+            return ShardedVectorStore(
+                shard_dir=str(config.get("shard_dir", "./storage/shards")),
+                shard_key=str(config.get("shard_key", "version")),
+                search_workers=int(config.get("search_workers", 4)),
+                checkpoint_interval=int(config.get("checkpoint_interval", 10000)),
+            )
         if store_type != "faiss":
             raise ValueError(f"Unsupported vectorstore type: {store_type}")
         return FaissVectorStore(
             index_path=str(config.get("index_path", "./storage/faiss.index")),
             metadata_path=str(config.get("metadata_path", "./storage/faiss_metadata.json")),
+            wal_path=str(config.get("wal_path", "")) or None,
+            checkpoint_interval=int(config.get("checkpoint_interval", 10000)),
         )
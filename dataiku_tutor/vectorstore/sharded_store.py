@@ -0,0 +1,298 @@
+"""Sharded vector store partitioning chunks by a metadata key, with scatter-gather search."""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import json
+import os
+import re
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from dataiku_tutor.domain.models import Chunk, RetrievedChunk
+from dataiku_tutor.vectorstore.base_store import BaseVectorStore
+from dataiku_tutor.vectorstore.durability import fsync_dir, fsync_file
+from dataiku_tutor.vectorstore.faiss_store import FaissVectorStore
+
+
+class ShardedVectorStore(BaseVectorStore):
+    """Keeps one ``FaissVectorStore`` per shard key value (e.g. product ``version``).
+
+    Shards live in their own sub-directories of ``shard_dir`` and are opened lazily on first
+    use. Searches fan out to the requested shards on a thread pool (FAISS releases the GIL
+    while searching) and the per-shard top-k lists are merged by score. The ``shards.json``
+    manifest lists the shard directories and their size counters, so ``stats`` does not open
+    any shard. Each shard directory also keeps an append-only ``chunk_ids.txt``; deletes read
+    those (once, on first delete) and only open the shards holding the ids.
+    """
+
+    DEFAULT_SHARD = "_default"
+    IDS_FILE = "chunk_ids.txt"
+
+    def __init__(
+        self,
+        shard_dir: str,
+        shard_key: str = "version",
+        search_workers: int = 4,
+        checkpoint_interval: int = 10000,
+        manifest_name: str = "shards.json",
+    ) -> None:
+        self.shard_dir = Path(shard_dir)
+        self.shard_key = shard_key
+        self.search_workers = max(1, search_workers)
+        self.checkpoint_interval = checkpoint_interval
+        self.manifest_path = self.shard_dir / manifest_name
+        self._generation = 0
+        self._directories: dict[str, str] = {}
+        self._shards: dict[str, FaissVectorStore] = {}
+        self._ids: dict[str, set[str]] = {}
+        self._unsaved_ids: dict[str, list[str]] = {}
+        self._shard_stats: dict[str, dict[str, int]] = {}
+        self._version = 0
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self._load_manifest()
+
+    @property
+    def shard_names(self) -> list[str]:
+        return sorted(self._directories)
+
+    @property
+    def version(self) -> int:
+        """Monotonic mutation counter across all shards."""
+        return self._version
+
+    def shard_for(self, row: dict[str, Any]) -> str:
+        """Resolve the shard of a metadata row from its chunk metadata or top-level fields."""
+        nested = row.get("metadata") if isinstance(row.get("metadata"), dict) else {}
+        value = nested.get(self.shard_key, row.get(self.shard_key, ""))
+        return str(value).strip() or self.DEFAULT_SHARD
+
+    def add(self, embeddings: list[list[float]], metadata: list[dict[str, Any]]) -> None:
+        if len(embeddings) != len(metadata):
+            raise ValueError("embeddings and metadata must have the same length")
+        if not embeddings:
+            return
+
+        grouped: dict[str, tuple[list[list[float]], list[dict[str, Any]]]] = {}
+        for vector, row in zip(embeddings, metadata):
+            vectors, rows = grouped.setdefault(self.shard_for(row), ([], []))
+            vectors.append(vector)
+            rows.append(row)
+
+        for name, (vectors, rows) in grouped.items():
+            self._shard(name, create=True).add(embeddings=vectors, metadata=rows)
+            ids = [str(row.get("id", "")) for row in rows]
+            self._unsaved_ids.setdefault(name, []).extend(ids)
+            if name in self._ids:
+                self._ids[name].update(ids)
+        self._version += 1
+
+    def search(
+        self,
+        query_embedding: list[float],
+        k: int,
+        shard_names: list[str] | None = None,
+    ) -> list[RetrievedChunk]:
+        """Search ``shard_names`` (all shards by default) in parallel and merge the top-k."""
+        if k <= 0:
+            return []
+        targets = [name for name in (shard_names or self.shard_names) if name in self._directories]
+        if not targets:
+            return []
+
+        if len(targets) == 1 or self.search_workers == 1:
+            partials = [self._shard(name).search(query_embedding, k) for name in targets]
+        else:
+            executor = self._get_executor()
+            partials = list(executor.map(lambda name: self._shard(name).search(query_embedding, k), targets))
+
+        return heapq.nlargest(k, (result for partial in partials for result in partial), key=lambda r: r.score)
+
+    def delete(self, ids: list[str]) -> None:
+        """Tombstone ``ids`` in the shards that hold them, per each shard's chunk id file."""
+        if not ids:
+            return
+        wanted = set(ids)
+        for name in self.shard_names:
+            matched = sorted(wanted & self._shard_ids(name))
+            if matched:
+                self._shard(name).delete(matched)
+        self._version += 1
+
+    def save(self) -> None:
+        """Save open shards, bracketed by manifest writes so no saved shard is ever unlisted.
+
+        The first write lists every shard (including new ones) and forgets the size counters of
+        the shards about to be saved; the second records their fresh counters. After a crash in
+        between, those shards are simply opened to report ``stats``. New chunk ids are appended
+        to a shard's id file before the shard itself is saved, so the file never misses an id.
+        """
+        with self._lock:
+            shards = dict(self._shards)
+        for name in shards:
+            self._shard_stats.pop(name, None)
+        self._write_manifest()
+        for name, shard in shards.items():
+            self._append_ids(name)
+            shard.save()
+            self._shard_stats[name] = shard.stats()
+        self._write_manifest()
+
+    def chunks(self) -> list[Chunk]:
+        """Chunks of every shard; opens all of them."""
+        return [chunk for name in self.shard_names for chunk in self._shard(name).chunks()]
+
+    def stats(self) -> dict[str, int]:
+        totals = {"vectors": 0, "deleted": 0, "bytes": 0, "shards": len(self._directories)}
+        for name in self.shard_names:
+            with self._lock:
+                shard = self._shards.get(name)
+            counters = shard.stats() if shard is not None else self._shard_stats.get(name)
+            if counters is None:
+                counters = self._shard(name).stats()
+            for key, value in counters.items():
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def staging(self) -> ShardedVectorStore:
+        """Empty store writing next-generation shard directories and a ``shards.json.staging`` manifest.
+
+        Leftovers of an aborted rebuild of that generation are removed first.
+        """
+        generation = self._generation + 1
+        suffix = f"-g{generation}"
+        if self.shard_dir.exists():
+            for path in self.shard_dir.iterdir():
+                if path.is_dir() and path.name.endswith(suffix):
+                    shutil.rmtree(path)
+        staged_manifest = self.manifest_path.with_name(self.manifest_path.name + ".staging")
+        staged_manifest.unlink(missing_ok=True)
+        staged = ShardedVectorStore(
+            shard_dir=str(self.shard_dir),
+            shard_key=self.shard_key,
+            search_workers=self.search_workers,
+            checkpoint_interval=self.checkpoint_interval,
+            manifest_name=staged_manifest.name,
+        )
+        staged._generation = generation
+        staged._version = self._version + 1
+        return staged
+
+    def promote(self, staged: BaseVectorStore) -> None:
+        """Swap in ``staged`` by atomically replacing the manifest, then drop the old shard directories."""
+        if not isinstance(staged, ShardedVectorStore) or staged.shard_dir != self.shard_dir:
+            raise TypeError("can only promote a staging store of this shard directory")
+        staged.save()
+        staged.close()
+        os.replace(staged.manifest_path, self.manifest_path)
+        fsync_dir(self.shard_dir)
+
+        retired = set(self._directories.values()) - set(staged._directories.values())
+        with self._lock:
+            self._shards = {}
+        self._directories, self._ids, self._unsaved_ids, self._shard_stats = {}, {}, {}, {}
+        self._load_manifest()
+        for directory in retired:
+            shutil.rmtree(self.shard_dir / directory, ignore_errors=True)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _shard(self, name: str, create: bool = False) -> FaissVectorStore:
+        with self._lock:
+            shard = self._shards.get(name)
+            if shard is not None:
+                return shard
+            if name not in self._directories:
+                if not create:
+                    raise KeyError(f"unknown shard: {name}")
+                self._directories[name] = self._directory_name(name, self._generation)
+            directory = self.shard_dir / self._directories[name]
+            shard = FaissVectorStore(
+                index_path=str(directory / "faiss.index"),
+                metadata_path=str(directory / "faiss_metadata.json"),
+                checkpoint_interval=self.checkpoint_interval,
+            )
+            self._shards[name] = shard
+            return shard
+
+    def _ids_path(self, name: str) -> Path:
+        return self.shard_dir / self._directories[name] / self.IDS_FILE
+
+    def _shard_ids(self, name: str) -> set[str]:
+        """Chunk ids ever added to shard ``name`` (deletes do not remove them), loaded on first use."""
+        ids = self._ids.get(name)
+        if ids is not None:
+            return ids
+        path = self._ids_path(name)
+        if path.exists():
+            ids = set(path.read_text(encoding="utf-8").splitlines())
+            ids.update(self._unsaved_ids.get(name, []))
+        else:
+            # Shard never saved, or written before id files existed: list its rows once and
+            # write them all on the next save.
+            ids = {chunk.id for chunk in self._shard(name).chunks()}
+            self._unsaved_ids[name] = sorted(ids)
+        self._ids[name] = ids
+        return ids
+
+    def _append_ids(self, name: str) -> None:
+        if name not in self._unsaved_ids:
+            return
+        path = self._ids_path(name)
+        if not path.exists():
+            self._shard_ids(name)
+        ids = self._unsaved_ids.pop(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a", encoding="utf-8") as handle:
+            handle.write("".join(f"{chunk_id}\n" for chunk_id in ids))
+        fsync_file(path)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.search_workers, thread_name_prefix="shard-search"
+                )
+            return self._executor
+
+    @staticmethod
+    def _directory_name(name: str, generation: int = 0) -> str:
+        slug = re.sub(r"[^A-Za-z0-9._-]+", "_", name).strip("._") or "shard"
+        directory = f"{slug[:48]}-{hashlib.sha1(name.encode('utf-8')).hexdigest()[:8]}"
+        return f"{directory}-g{generation}" if generation else directory
+
+    def _load_manifest(self) -> None:
+        if not self.manifest_path.exists():
+            return
+        payload = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        if payload.get("shard_key", self.shard_key) != self.shard_key:
+            raise ValueError(
+                f"shard directory is partitioned by {payload.get('shard_key')!r}, not {self.shard_key!r}"
+            )
+        self._directories = dict(payload.get("shards", {}))
+        self._version = int(payload.get("version", 0))
+        self._generation = int(payload.get("generation", 0))
+        self._shard_stats = {name: dict(counters) for name, counters in payload.get("stats", {}).items()}
+
+    def _write_manifest(self) -> None:
+        self.shard_dir.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "shard_key": self.shard_key,
+            "version": self._version,
+            "generation": self._generation,
+            "shards": self._directories,
+            "stats": self._shard_stats,
+        }
+        tmp = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        fsync_file(tmp)
+        os.replace(tmp, self.manifest_path)
+        fsync_dir(self.shard_dir)
@@ -0,0 +1,243 @@
+import importlib.util
+import threading
+import time
+import unittest
+
+from dataiku_tutor.domain.models import Chunk, QueryRequest, RetrievedChunk
+from dataiku_tutor.generation.response_generator import ResponseGenerator
+from dataiku_tutor.orchestration.admission import AdmissionController, AdmissionFactory, Overloaded
+from dataiku_tutor.orchestration.tutor_service import TutorService
+from dataiku_tutor.retrieval.reranker import BudgetedReranker, LexicalOverlapScorer, RerankingRetriever
+
+
+class _StaticRetriever:
+    def __init__(self, source: str) -> None:
+        self.source = source
+
+    def retrieve(self, query, k):
+        chunk = Chunk(id=f"{self.source}:0", document_id=self.source, content="Join two datasets", metadata={})
+        return [RetrievedChunk(chunk=chunk, score=1.0, source=self.source)]
+
+
+class _EchoLLM:
+    def complete(self, prompt: str) -> str:
+        return "1. Open the flow."
+
+
+def _hold(controller: AdmissionController, client_id: str, release: threading.Event, held: threading.Event):
+    def run() -> None:
+        with controller.admit(client_id, "hybrid"):
+            held.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    held.wait(5)
+    return thread
+
+
+class AdmissionControllerTests(unittest.TestCase):
+    def test_admits_under_capacity_without_degrading(self):
+        controller = AdmissionController(max_concurrent=4)
+        with controller.admit("alice", "hybrid") as admitted:
+            self.assertEqual(admitted.mode, "hybrid")
+            self.assertFalse(admitted.degraded)
+            self.assertEqual(controller.snapshot()["active"], 1)
+        self.assertEqual(controller.snapshot()["active"], 0)
+        self.assertGreaterEqual(controller.estimated_service("hybrid"), 0.0)
+
+    def test_per_client_limit_and_full_queue_are_rejected(self):
+        controller = AdmissionController(max_concurrent=1, max_queue=0, per_client_limit=1)
+        release, held = threading.Event(), threading.Event()
+        thread = _hold(controller, "alice", release, held)
+        try:
+            with self.assertRaises(Overloaded) as client_limit:
+                with controller.admit("alice", "hybrid"):
+                    pass
+            with self.assertRaises(Overloaded) as queue_full:
+                with controller.admit("bob", "hybrid"):
+                    pass
+        finally:
+            release.set()
+            thread.join()
+
+        self.assertEqual((client_limit.exception.status_code, client_limit.exception.reason), (429, "client_limit"))
+        self.assertEqual((queue_full.exception.status_code, queue_full.exception.reason), (503, "queue_full"))
+        self.assertEqual(queue_full.exception.retry_after_header, "1")
+
+    def test_queued_requests_are_served_by_priority(self):
+        controller = AdmissionController(max_concurrent=1, skip_rerank_load=10, keyword_load=10)
+        release, held = threading.Event(), threading.Event()
+        thread = _hold(controller, "holder", release, held)
+        order: list[str] = []
+
+        def request(name: str, priority: int) -> threading.Thread:
+            def run() -> None:
+                with controller.admit(name, "hybrid", priority=priority):
+                    order.append(name)
+
+            worker = threading.Thread(target=run)
+            worker.start()
+            return worker
+
+        workers = [request("batch", 5)]
+        while controller.snapshot()["queued"] < 1:
+            time.sleep(0.005)
+        workers.append(request("interactive", 0))
+        while controller.snapshot()["queued"] < 2:
+            time.sleep(0.005)
+        release.set()
+        for worker in [thread, *workers]:
+            worker.join()
+
+        self.assertEqual(order, ["interactive", "batch"])
+
+    def test_rejects_early_when_deadline_cannot_be_met(self):
+        controller = AdmissionController(max_concurrent=1)
+        with controller.admit("warmup", "keyword"):
+            time.sleep(0.1)
+
+        release, held = threading.Event(), threading.Event()
+        thread = _hold(controller, "holder", release, held)
+        try:
+            started = time.monotonic()
+            with self.assertRaises(Overloaded) as rejected:
+                with controller.admit("late", "hybrid", deadline=0.05):
+                    pass
+            elapsed = time.monotonic() - started
+        finally:
+            release.set()
+            thread.join()
+
+        self.assertEqual(rejected.exception.reason, "deadline")
+        self.assertGreater(rejected.exception.retry_after, 0)
+        self.assertLess(elapsed, 0.05)
+
+    def test_degrades_to_keyword_and_skips_rerank_under_load(self):
+        controller = AdmissionController(max_concurrent=2, skip_rerank_load=0.4, keyword_load=0.9)
+        with controller.admit("a", "hybrid") as first:
+            self.assertTrue(first.skip_rerank)
+            self.assertEqual(first.mode, "hybrid")
+            with controller.admit("b", "hybrid") as second:
+                self.assertEqual(second.mode, "keyword")
+                self.assertTrue(second.degraded)
+
+    def test_queued_request_is_degraded_by_load_when_granted_not_at_arrival(self):
+        controller = AdmissionController(max_concurrent=1, skip_rerank_load=0.75, keyword_load=1.5)
+        release, held = threading.Event(), threading.Event()
+        thread = _hold(controller, "holder", release, held)
+        admitted = []
+
+        def run() -> None:
+            with controller.admit("queued", "hybrid") as admission:
+                admitted.append(admission)
+
+        worker = threading.Thread(target=run)
+        worker.start()
+        while controller.snapshot()["queued"] < 1:
+            time.sleep(0.005)
+        release.set()
+        for waiting in (thread, worker):
+            waiting.join()
+
+        [admission] = admitted
+        self.assertEqual(admission.mode, "hybrid")
+        self.assertTrue(admission.skip_rerank)
+
+    def test_never_downgrades_to_a_mode_the_caller_cannot_run(self):
+        controller = AdmissionController(max_concurrent=1, keyword_load=0.5)
+        with controller.admit("a", "hybrid", modes={"hybrid"}) as admitted:
+            self.assertEqual(admitted.mode, "hybrid")
+        self.assertEqual(set(controller.snapshot()["service_seconds"]), {"hybrid"})
+
+    def test_factory_reads_admission_section(self):
+        self.assertIsNone(AdmissionFactory.create({"enabled": False}))
+        controller = AdmissionFactory.create({"max_concurrent": 3, "default_deadline_ms": 2500})
+        self.assertEqual(controller.max_concurrent, 3)
+        self.assertEqual(controller.default_deadline, 2.5)
+
+
+class TutorServiceAdmissionTests(unittest.TestCase):
+    def _service(self, controller: AdmissionController) -> TutorService:
+        reranked = RerankingRetriever(_StaticRetriever("hybrid"), BudgetedReranker(LexicalOverlapScorer(), top_n=5))
+        retrievers = {"hybrid": reranked, "keyword": _StaticRetriever("keyword")}
+        return TutorService(retrievers, ResponseGenerator(_EchoLLM()), admission=controller)
+
+    def test_reports_requested_mode_when_not_busy(self):
+        response = self._service(AdmissionController(max_concurrent=4)).answer(QueryRequest(question="join"))
+        self.assertEqual(response.mode, "hybrid")
+        self.assertFalse(response.degraded)
+        self.assertEqual(response.sources[0]["retriever"], "rerank")
+
+    def test_skips_rerank_and_reports_degraded_mode(self):
+        service = self._service(AdmissionController(max_concurrent=1, skip_rerank_load=0.5, keyword_load=5))
+        response = service.answer(QueryRequest(question="join"))
+        self.assertEqual(response.mode, "hybrid")
+        self.assertTrue(response.degraded)
+        self.assertEqual(response.sources[0]["retriever"], "hybrid")
+
+        service = self._service(AdmissionController(max_concurrent=1, keyword_load=0.5))
+        response = service.answer(QueryRequest(question="join"))
+        self.assertEqual((response.mode, response.degraded), ("keyword", True))
+
+    def test_records_service_time_under_the_mode_that_ran(self):
+        controller = AdmissionController(max_concurrent=1, keyword_load=0.5)
+        service = TutorService({"hybrid": _StaticRetriever("hybrid")}, ResponseGenerator(_EchoLLM()), controller)
+        response = service.answer(QueryRequest(question="join"))
+        self.assertEqual((response.mode, response.degraded), ("hybrid", False))
+        self.assertEqual(set(controller.snapshot()["service_seconds"]), {"hybrid"})
+
+
+@unittest.skipUnless(importlib.util.find_spec("fastapi"), "fastapi is not installed")
+class QueryRouteAdmissionTests(unittest.TestCase):
+    def test_overloaded_query_returns_503_with_retry_after(self):
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from dataiku_tutor.api.routes import build_router
+
+        controller = AdmissionController(max_concurrent=1, max_queue=0)
+        service = TutorService({"hybrid": _StaticRetriever("hybrid")}, ResponseGenerator(_EchoLLM()), controller)
+        app = FastAPI()
+        app.include_router(build_router(tutor_service=service, reindex_jobs=None))
+        client = TestClient(app)
+
+        ok = client.post("/query", json={"question": "join"})
+        self.assertEqual(ok.status_code, 200)
+        self.assertEqual(ok.json()["mode"], "hybrid")
+
+        release, held = threading.Event(), threading.Event()
+        thread = _hold(controller, "holder", release, held)
+        try:
+            busy = client.post("/query", json={"question": "join"})
+        finally:
+            release.set()
+            thread.join()
+        self.assertEqual(busy.status_code, 503)
+        self.assertEqual(busy.headers["retry-after"], "1")
+
+    def test_client_limit_is_keyed_on_the_peer_address_not_the_client_id_header(self):
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from dataiku_tutor.api.routes import build_router
+
+        controller = AdmissionController(max_concurrent=4, max_queue=4, per_client_limit=1)
+        service = TutorService({"hybrid": _StaticRetriever("hybrid")}, ResponseGenerator(_EchoLLM()), controller)
+        app = FastAPI()
+        app.include_router(build_router(tutor_service=service, reindex_jobs=None))
+        client = TestClient(app)
+
+        release, held = threading.Event(), threading.Event()
+        thread = _hold(controller, "testclient", release, held)
+        try:
+            limited = client.post("/query", json={"question": "join"}, headers={"X-Client-Id": "fresh-id"})
+        finally:
+            release.set()
+            thread.join()
+        self.assertEqual(limited.status_code, 429)
+        self.assertEqual(client.post("/query", json={"question": "join"}).status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import hashlib
+import io
+import json
+import tarfile
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from dataiku_tutor.embeddings.embedding_service import HashEmbeddingService
+from dataiku_tutor.ingestion.chunker import DocumentationChunker
+from dataiku_tutor.ingestion.loader import DocumentationLoader
+from dataiku_tutor.ingestion.staged import StagedIngestion
+
+MEMBERS = {
+    "docs/recipes/join.md": "# Join recipe\nCombine two datasets.",
+    "docs/export.json": json.dumps([{"id": "flow", "content": "The Flow shows datasets"}]),
+    "docs/notes.jsonl": json.dumps({"id": "scenario", "content": "Scenarios automate builds"}),
+    "docs/image.png": "not documentation",
+}
+
+
+def _write_tar(path: Path, mode: str) -> None:
+    with tarfile.open(path, mode) as archive:
+        for name, text in MEMBERS.items():
+            data = text.encode("utf-8")
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+
+
+def _write_zip(path: Path) -> None:
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("docs/", "")
+        for name, text in MEMBERS.items():
+            archive.writestr(name, text)
+
+
+class _ListStore:
+    def __init__(self) -> None:
+        self.rows: list[dict] = []
+
+    def add(self, embeddings, metadata) -> None:
+        self.rows.extend(metadata)
+
+    def save(self) -> None:
+        pass
+
+    def stats(self) -> dict[str, int]:
+        return {"vectors": len(self.rows)}
+
+
+class ArchiveLoaderTests(unittest.TestCase):
+    def test_loads_supported_members_from_each_archive_format(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            archives = [Path(tmp) / "docs.tar.gz", Path(tmp) / "docs.tar", Path(tmp) / "docs.zip"]
+            _write_tar(archives[0], "w:gz")
+            _write_tar(archives[1], "w")
+            _write_zip(archives[2])
+
+            loader = DocumentationLoader()
+            for archive in archives:
+                documents = {document.id: document for document in loader.load_documents(str(archive))}
+                join_id = hashlib.sha1(f"{archive}!/docs/recipes/join.md".encode("utf-8")).hexdigest()
+                self.assertEqual(set(documents), {"flow", "scenario", join_id})
+
+                flow = documents["flow"]
+                self.assertEqual(flow.metadata["source_path"], f"{archive}!/docs/export.json")
+                self.assertEqual(flow.metadata["archive_path"], str(archive))
+                self.assertEqual(
+                    flow.metadata["content_hash"],
+                    hashlib.sha256(MEMBERS["docs/export.json"].encode("utf-8")).hexdigest(),
+                )
+
+    def test_directory_sources_include_archives_and_corrupt_archives_are_skipped(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            _write_tar(Path(tmp) / "bundle.tgz", "w:gz")
+            (Path(tmp) / "broken.zip").write_bytes(b"not a zip")
+            (Path(tmp) / "page.md").write_text("Standalone page", encoding="utf-8")
+
+            documents = DocumentationLoader().load_documents(tmp)
+
+        self.assertEqual(len(documents), 4)
+        self.assertEqual(sum("content_hash" in document.metadata for document in documents), 3)
+
+    def test_staged_ingestion_reads_archive_members(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            archive = Path(tmp) / "docs.tar.gz"
+            _write_tar(archive, "w:gz")
+            store = _ListStore()
+            staged = StagedIngestion(
+                DocumentationLoader(),
+                DocumentationChunker(chunk_size=50, overlap=5),
+                HashEmbeddingService(dimension=8),
+                store,
+                batch_size=2,
+            )
+            report = staged.run(str(archive))
+
+        self.assertEqual(report.indexed_chunks, 3)
+        self.assertTrue(all(row["metadata"]["source_path"].startswith(f"{archive}!/") for row in store.rows))
+
+
+if __name__ == "__main__":
+    unittest.main()
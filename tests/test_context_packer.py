@@ -0,0 +1,83 @@
+import unittest
+
+from dataiku_tutor.domain.models import Chunk, Document, RetrievedChunk
+from dataiku_tutor.generation.context_packer import ContextPacker
+from dataiku_tutor.generation.response_generator import ResponseGenerator
+from dataiku_tutor.ingestion.chunker import DocumentationChunker
+
+
+def _retrieved(chunks: list[Chunk], scores: list[float]) -> list[RetrievedChunk]:
+    return [RetrievedChunk(chunk=chunk, score=score, source="hybrid") for chunk, score in zip(chunks, scores)]
+
+
+class ContextPackerTests(unittest.TestCase):
+    def setUp(self):
+        words = " ".join(f"w{idx}" for idx in range(20))
+        chunker = DocumentationChunker(chunk_size=8, overlap=2)
+        self.doc_chunks = chunker.chunk([Document(id="doc", content=words, metadata={"title": "Join"})])
+        self.other = Chunk(id="other:0", document_id="other", content="group recipe steps", metadata={"chunk_index": 0})
+
+    def test_adjacent_chunks_merge_without_repeated_overlap(self):
+        first, second, third = self.doc_chunks
+        packed = ContextPacker(token_budget=100).pack(_retrieved([third, first, second], [0.9, 0.8, 0.7]))
+
+        self.assertEqual(len(packed.segments), 1)
+        segment = packed.segments[0]
+        self.assertEqual(segment.chunk_ids, ("doc:0", "doc:1", "doc:2"))
+        self.assertEqual(segment.content, " ".join(f"w{idx}" for idx in range(20)))
+        self.assertEqual(packed.tokens_used, 20)
+        self.assertEqual(packed.tokens_unpacked, 24)
+        self.assertEqual(packed.tokens_saved, 4)
+
+    def test_non_adjacent_chunks_stay_separate_and_budget_is_respected(self):
+        first, _, third = self.doc_chunks
+        retrieved = _retrieved([first, third, self.other], [0.9, 0.2, 0.5])
+
+        packed = ContextPacker(token_budget=11).pack(retrieved)
+        self.assertLessEqual(packed.tokens_used, 11)
+        self.assertEqual([segment.chunk_ids for segment in packed.segments], [("doc:0",), ("other:0",)])
+
+        duplicated = _retrieved([first, Chunk(id="v2:0", document_id="v2", content=first.content, metadata={})], [0.9, 0.8])
+        self.assertEqual(len(ContextPacker().pack(duplicated).segments), 1)
+
+    def test_oversized_segment_is_truncated_to_budget(self):
+        packed = ContextPacker(token_budget=5).pack(_retrieved(self.doc_chunks[:1], [1.0]))
+        self.assertEqual(packed.tokens_used, 5)
+
+    def test_prompt_uses_packed_segments(self):
+        generator = ResponseGenerator(llm_client=None, context_packer=ContextPacker(token_budget=100))
+        prompt = generator.build_prompt("How do I join?", _retrieved(self.doc_chunks[:2], [0.9, 0.8]))
+        self.assertIn("[1] Join\nw0 w1", prompt)
+        self.assertNotIn("[2]", prompt)
+        self.assertEqual(prompt.count("w6 w7"), 1)
+
+    def test_short_chunk_is_not_a_duplicate_of_a_longer_word(self):
+        short = Chunk(id="short:0", document_id="short", content="join", metadata={})
+        longer = Chunk(id="long:0", document_id="long", content="joining datasets", metadata={})
+        packed = ContextPacker().pack(_retrieved([longer, short], [0.9, 0.8]))
+        self.assertEqual(len(packed.segments), 2)
+
+    def test_zero_overlap_hint_keeps_repeated_words(self):
+        first = Chunk(id="doc:0", document_id="doc", content="click run", metadata={"chunk_index": 0, "chunk_overlap": 0})
+        second = Chunk(id="doc:1", document_id="doc", content="run again", metadata={"chunk_index": 1, "chunk_overlap": 0})
+        packed = ContextPacker().pack(_retrieved([first, second], [0.9, 0.8]))
+        self.assertEqual(packed.segments[0].content, "click run run again")
+
+    def test_sources_follow_citation_numbers_after_duplicate_is_dropped(self):
+        first = self.doc_chunks[0]
+        duplicate = Chunk(id="v2:0", document_id="v2", content=first.content, metadata={"title": "Join v2"})
+        other = Chunk(id="other:0", document_id="other", content="group recipe steps", metadata={"title": "Group"})
+        retrieved = _retrieved([first, duplicate, other], [0.9, 0.8, 0.7])
+
+        generator = ResponseGenerator(llm_client=None, context_packer=ContextPacker(token_budget=100))
+        context = generator.pack_context(retrieved)
+        prompt = generator.build_prompt("How do I join?", retrieved, context=context)
+        sources = generator.format_sources(retrieved, context=context)
+
+        self.assertIn("[2] Group\ngroup recipe steps", prompt)
+        self.assertEqual([source["chunk_id"] for source in sources], ["doc:0", "other:0"])
+        self.assertEqual(sources[1]["title"], "Group")
+
+
+if __name__ == "__main__":
+    unittest.main()
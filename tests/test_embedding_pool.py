@@ -0,0 +1,70 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from dataiku_tutor.config.settings import Settings
+from dataiku_tutor.embeddings.embedding_pool import EmbeddingPool
+from dataiku_tutor.embeddings.embedding_service import HashEmbeddingService
+from dataiku_tutor.ingestion.pipeline import IngestionPipeline
+
+
+class EmbeddingPoolTests(unittest.TestCase):
+    def test_pool_preserves_order_across_workers(self):
+        texts = [f"Dataiku recipe step {idx}" for idx in range(23)]
+        with EmbeddingPool(provider="hash", model_name="unused", workers=2, batch_size=4, max_pending=2) as pool:
+            vectors = pool.embed(texts)
+            self.assertEqual(pool.embed([]), [])
+
+        self.assertEqual(vectors, HashEmbeddingService().embed(texts))
+
+    def test_worker_startup_failure_is_raised(self):
+        with EmbeddingPool(provider="unknown", model_name="unused", workers=1) as pool:
+            with self.assertRaises(RuntimeError):
+                pool.embed(["text"])
+
+
+class _RecordingPipeline(IngestionPipeline):
+    def build_index_updater(self):
+        self.updater = super().build_index_updater()
+        return self.updater
+
+
+class PipelineEmbeddingPoolTests(unittest.TestCase):
+    def test_reindex_keeps_several_worker_batches_in_flight(self):
+        for pipelined in (True, False):
+            with self.subTest(pipelined=pipelined), tempfile.TemporaryDirectory() as tmp:
+                tmp_path = Path(tmp)
+                docs = tmp_path / "docs"
+                docs.mkdir()
+                for idx in range(4):
+                    (docs / f"page_{idx}.md").write_text(" ".join(f"w{idx}_{n}" for n in range(80)), encoding="utf-8")
+                settings = tmp_path / "settings.yaml"
+                settings.write_text(
+                    "\n".join(
+                        [
+                            "embeddings:",
+                            "  provider: hash",
+                            "  batch_size: 4",
+                            "  workers: 2",
+                            "vectorstore:",
+                            f"  index_path: {tmp_path / 'faiss.index'}",
+                            f"  metadata_path: {tmp_path / 'faiss_metadata.json'}",
+                            "ingestion:",
+                            "  chunk_size: 10",
+                            "  chunk_overlap: 2",
+                            f"  pipelined: {'true' if pipelined else 'false'}",
+                        ]
+                    ),
+                    encoding="utf-8",
+                )
+                pipeline = _RecordingPipeline(settings=Settings(str(settings)))
+                self.assertGreater(pipeline.run_full_reindex(str(docs)), 0)
+
+                pool = pipeline.updater.embedding_service
+                self.assertIsInstance(pool, EmbeddingPool)
+                self.assertEqual(pipeline.updater.batch_size, pool.max_pending * 4)
+                self.assertGreater(pool.peak_in_flight, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
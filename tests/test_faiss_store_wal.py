@@ -0,0 +1,154 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+from pathlib import Path
+
+from dataiku_tutor.vectorstore.faiss_store import FaissVectorStore
+
+
+def _rows(prefix: str, count: int) -> list[dict]:
+    return [{"id": f"{prefix}:{idx}", "document_id": prefix, "content": f"{prefix} {idx}", "metadata": {}} for idx in range(count)]
+
+
+def _vectors(count: int, offset: int = 0) -> list[list[float]]:
+    return [[1.0, float(idx + offset), 0.5] for idx in range(count)]
+
+
+class FaissVectorStoreWalTests(unittest.TestCase):
+    def _store(self, tmp_path: Path, checkpoint_interval: int = 100) -> FaissVectorStore:
+        return FaissVectorStore(
+            index_path=str(tmp_path / "faiss.index"),
+            metadata_path=str(tmp_path / "faiss_metadata.json"),
+            checkpoint_interval=checkpoint_interval,
+        )
+
+    def test_small_updates_append_to_wal_and_replay_on_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            store = self._store(tmp_path)
+            store.add(_vectors(3), _rows("a", 3))
+            store.save()
+            checkpoint = (tmp_path / "faiss_metadata.json").read_text(encoding="utf-8")
+
+            store.delete(["a:0"])
+            store.add(_vectors(2, offset=10), _rows("b", 2))
+            store.save()
+
+            self.assertEqual((tmp_path / "faiss_metadata.json").read_text(encoding="utf-8"), checkpoint)
+            self.assertEqual(len(store.wal_path.read_text(encoding="utf-8").splitlines()), 2)
+
+            reloaded = self._store(tmp_path)
+            self.assertEqual(reloaded.version, store.version)
+            self.assertEqual(len(reloaded._metadata), 5)
+            self.assertEqual(reloaded._deleted_ids, {"a:0"})
+            ids = {result.chunk.id for result in reloaded.search([1.0, 1.0, 0.5], k=10)}
+            self.assertNotIn("a:0", ids)
+            self.assertIn("b:1", ids)
+
+    def test_checkpoint_compacts_wal(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            store = self._store(tmp_path, checkpoint_interval=4)
+            store.add(_vectors(1), _rows("a", 1))
+            store.save()
+            store.add(_vectors(2), _rows("b", 2))
+            store.save()
+            self.assertTrue(store.wal_path.exists())
+
+            store.add(_vectors(2), _rows("c", 2))
+            store.save()
+            self.assertFalse(store.wal_path.exists())
+            payload = json.loads((tmp_path / "faiss_metadata.json").read_text(encoding="utf-8"))
+            self.assertEqual(len(payload["metadata"]), 5)
+            self.assertEqual(payload["checkpoint_seq"], store.version)
+
+    def test_torn_wal_tail_is_ignored_and_truncated(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            store = self._store(tmp_path)
+            store.add(_vectors(1), _rows("a", 1))
+            store.save()
+            store.add(_vectors(1), _rows("b", 1))
+            store.save()
+            with store.wal_path.open("a", encoding="utf-8") as handle:
+                handle.write('{"seq": 99, "op": "add", "vec')
+
+            reloaded = self._store(tmp_path)
+            self.assertEqual([row["id"] for row in reloaded._metadata], ["a:0", "b:0"])
+            reloaded.add(_vectors(1), _rows("c", 1))
+            reloaded.save()
+            self.assertEqual(len(self._store(tmp_path)._metadata), 3)
+
+    def test_interrupted_checkpoint_rolls_forward_or_is_discarded(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            store = self._store(tmp_path)
+            store.add(_vectors(1), _rows("a", 1))
+            store.save()
+
+            # Crash after both temp files were complete but before the metadata rename.
+            store.add(_vectors(1), _rows("b", 1))
+            store.checkpoint()
+            os.replace(tmp_path / "faiss_metadata.json", tmp_path / "faiss_metadata.json.tmp")
+            (tmp_path / "faiss_metadata.json").write_text(
+                json.dumps({"dim": 3, "checkpoint_seq": 1, "metadata": _rows("a", 1), "deleted_ids": []}),
+                encoding="utf-8",
+            )
+            self.assertEqual(len(self._store(tmp_path)._metadata), 2)
+
+            # Crash while the metadata temp file was still being written.
+            (tmp_path / "faiss.index.tmp").write_text("partial", encoding="utf-8")
+            (tmp_path / "faiss_metadata.json.tmp").write_text('{"dim": 3, "meta', encoding="utf-8")
+            self.assertEqual(len(self._store(tmp_path)._metadata), 2)
+            self.assertFalse((tmp_path / "faiss.index.tmp").exists())
+            self.assertFalse((tmp_path / "faiss_metadata.json.tmp").exists())
+
+    def test_broken_faiss_install_falls_back_to_python_index(self):
+        def broken_import():
+            raise ImportError("numpy.core.multiarray failed to import")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            installed = mock.patch.object(FaissVectorStore, "_load_runtime_backend", _pretend_faiss_installed)
+            broken = mock.patch.object(FaissVectorStore, "_faiss", staticmethod(broken_import))
+            with installed, broken:
+                store = self._store(tmp_path)
+                store.add(_vectors(2), _rows("a", 2))
+                store.save()
+                self.assertFalse(store._use_faiss)
+                self.assertEqual([r.chunk.id for r in store.search([1.0, 1.0, 0.5], k=1)], ["a:1"])
+
+                reloaded = self._store(tmp_path)
+                self.assertEqual(len(reloaded.search([1.0, 0.0, 0.5], k=5)), 2)
+
+    def test_promote_swaps_in_staged_rebuild_and_discards_old_wal(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            live = self._store(tmp_path)
+            live.add(_vectors(3), _rows("a", 3))
+            live.save()
+            live.add(_vectors(1, offset=3), _rows("b", 1))
+            live.save()
+            self.assertTrue(live.wal_path.exists())
+            version = live.version
+
+            staged = live.staging()
+            staged.add(_vectors(2), _rows("c", 2))
+            live.promote(staged)
+
+            self.assertGreater(live.version, version)
+            self.assertFalse(live.wal_path.exists())
+            self.assertEqual(sorted(path.name for path in tmp_path.iterdir()), ["faiss.index", "faiss_metadata.json"])
+            for store in (live, self._store(tmp_path)):
+                self.assertEqual({r.chunk.id for r in store.search([1.0, 0.0, 0.5], k=10)}, {"c:0", "c:1"})
+
+
+def _pretend_faiss_installed(store: FaissVectorStore) -> None:
+    store._use_faiss = True
+    store._faiss_imported = False
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import hashlib
+import importlib.util
+import math
+import unittest
+
+from dataiku_tutor.embeddings.embedding_service import (
+    EmbeddingFactory,
+    HashEmbeddingService,
+    SentenceTransformerEmbeddingService,
+)
+
+
+def _reference_hash_embedding(text: str, dim: int) -> list[float]:
+    seed = text.encode("utf-8")
+    values: list[float] = []
+    counter = 0
+    while len(values) < dim:
+        digest = hashlib.sha256(seed + counter.to_bytes(4, "big")).digest()
+        for idx in range(0, len(digest), 4):
+            values.append((int.from_bytes(digest[idx : idx + 4], "big") / 2**32) * 2.0 - 1.0)
+            if len(values) >= dim:
+                break
+        counter += 1
+    norm = sum(v * v for v in values) ** 0.5 or 1.0
+    return [v / norm for v in values]
+
+
+class HashEmbeddingServiceTests(unittest.TestCase):
+    def test_matches_reference_scheme_and_is_deterministic(self):
+        texts = ["Create a join recipe", "", "Préparer un dataset"]
+        for dim in (384, 10):
+            service = HashEmbeddingService(dimension=dim)
+            vectors = service.embed(texts)
+            self.assertEqual(vectors, service.embed(texts))
+            for text, vector in zip(texts, vectors):
+                self.assertEqual(len(vector), dim)
+                expected = _reference_hash_embedding(text, dim)
+                for got, want in zip(vector, expected):
+                    self.assertAlmostEqual(got, want, places=5)
+                self.assertAlmostEqual(math.sqrt(sum(v * v for v in vector)), 1.0, places=5)
+
+    def test_factory_exposes_hash_provider(self):
+        service = EmbeddingFactory.create(provider="hash", model_name="unused")
+        self.assertIsInstance(service, HashEmbeddingService)
+        self.assertEqual(service.embed([]), [])
+
+    def test_sentence_transformer_fallback_uses_hash_embeddings(self):
+        if importlib.util.find_spec("sentence_transformers") is not None:
+            self.skipTest("sentence-transformers is installed")
+        service = SentenceTransformerEmbeddingService("all-MiniLM-L6-v2")
+        self.assertEqual(service.embed(["flow"]), HashEmbeddingService().embed(["flow"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
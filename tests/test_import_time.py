@@ -0,0 +1,51 @@
+import importlib.util
+import subprocess
+import sys
+import unittest
+
+from benchmarks.import_time import HEAVY_MODULES, REPO_ROOT, profile_imports
+
+# Generous enough for slow CI hosts; importing torch or faiss alone takes far longer.
+IMPORT_BUDGET_MS = 500.0
+
+
+class ImportTimeBudgetTest(unittest.TestCase):
+    def test_ingestion_cli_import_is_light(self) -> None:
+        profile = profile_imports("dataiku_tutor.ingestion.pipeline")
+        self.assertEqual(profile.heavy_modules(), [])
+        self.assertNotIn("multiprocessing", profile.cumulative_us)
+        self.assertLess(profile.total_ms, IMPORT_BUDGET_MS)
+
+    def test_main_and_ui_do_not_import_frameworks(self) -> None:
+        for target in ("dataiku_tutor.main", "dataiku_tutor.ui.app"):
+            profile = profile_imports(target)
+            self.assertEqual(profile.heavy_modules(), [], target)
+            self.assertNotIn("fastapi", profile.cumulative_us, target)
+            self.assertLess(profile.total_ms, IMPORT_BUDGET_MS, target)
+
+    def test_building_services_defers_model_and_index_imports(self) -> None:
+        code = (
+            "import sys, tempfile\n"
+            "from dataiku_tutor.embeddings.embedding_service import EmbeddingFactory\n"
+            "from dataiku_tutor.vectorstore.faiss_store import VectorStoreFactory\n"
+            "root = tempfile.mkdtemp()\n"
+            "EmbeddingFactory.create('sentence_transformers', 'all-MiniLM-L6-v2')\n"
+            "VectorStoreFactory.create({'index_path': root + '/i', 'metadata_path': root + '/m.json'})\n"
+            "print(','.join(sorted(m for m in sys.modules if m.split('.')[0] in %r)))\n" % (HEAVY_MODULES,)
+        )
+        completed = subprocess.run(
+            [sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        )
+        self.assertEqual(completed.stdout.strip(), "")
+
+    @unittest.skipUnless(importlib.util.find_spec("fastapi"), "fastapi is not installed")
+    def test_app_is_built_on_first_access(self) -> None:
+        import dataiku_tutor.main as main
+
+        self.assertNotIn("app", vars(main))
+        self.assertEqual(main.app.title, "dataiku_tutor")
+        self.assertIs(main.app, vars(main)["app"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import importlib.util
+import json
+import threading
+import unittest
+
+from dataiku_tutor.generation.llm_client import HTTPLLMClient, LLMClientError, LLMClientFactory, _HttpxTransport
+from dataiku_tutor.generation.mock_llm_server import MockLLMServer
+
+
+class LLMClientTests(unittest.TestCase):
+    def test_complete_reuses_keep_alive_connection(self):
+        with MockLLMServer(latency=0.0, token_delay=0.0) as server:
+            client = HTTPLLMClient(server.url, model="mock", max_connections=2)
+            first = client.complete("Question: how do I join datasets?")
+            second = client.complete("Question: how do I join datasets?")
+            client.close()
+
+        self.assertIn("join datasets", first)
+        self.assertEqual(first, second)
+        self.assertEqual(server.requests, 2)
+        self.assertEqual(server.connections, 1)
+
+    def test_identical_concurrent_prompts_are_coalesced(self):
+        with MockLLMServer(latency=0.2, token_delay=0.0) as server:
+            client = HTTPLLMClient(server.url, model="mock", max_connections=4)
+            barrier = threading.Barrier(5)
+            results: list[str] = []
+
+            def call():
+                barrier.wait()
+                results.append(client.complete("Question: same prompt"))
+
+            threads = [threading.Thread(target=call) for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            client.close()
+
+        self.assertEqual(len(set(results)), 1)
+        self.assertEqual(len(results), 5)
+        self.assertEqual(server.requests, 1)
+
+    def test_retries_retryable_status_then_fails(self):
+        with MockLLMServer(latency=0.0, fail_rate=1.0) as server:
+            client = HTTPLLMClient(server.url, model="mock", max_retries=2, backoff_base=0.001)
+            with self.assertRaises(LLMClientError) as raised:
+                client.complete("Question: anything")
+            client.close()
+
+        self.assertEqual(raised.exception.status, 503)
+        self.assertEqual(server.requests, 3)
+
+    def test_stream_yields_tokens_in_order(self):
+        with MockLLMServer(latency=0.0, token_delay=0.0) as server:
+            client = HTTPLLMClient(server.url, model="mock")
+            tokens = list(client.stream("Question: stream this"))
+            full = client.complete("Question: stream this")
+            client.close()
+
+        self.assertGreater(len(tokens), 1)
+        self.assertEqual("".join(tokens).strip(), full)
+
+    def test_factory_reads_llm_section(self):
+        client = LLMClientFactory.create({"base_url": "http://127.0.0.1:9", "max_retries": 0, "backoff_base_ms": 10})
+        self.assertEqual(client.max_retries, 0)
+        self.assertAlmostEqual(client.backoff_base, 0.01)
+        with self.assertRaises(LLMClientError):
+            client.complete("unreachable")
+
+
+@unittest.skipIf(importlib.util.find_spec("httpx") is None, "httpx is not installed")
+class HttpxTransportTests(unittest.TestCase):
+    def _client(self, handler, max_retries=2):
+        import httpx
+
+        client = HTTPLLMClient("http://llm.test", model="mock", max_retries=max_retries, backoff_base=0.001)
+        client._transport = _HttpxTransport("http://llm.test", 1.0, 2, transport=httpx.MockTransport(handler))
+        return client
+
+    def test_transport_errors_are_retried(self):
+        import httpx
+
+        from dataiku_tutor.observability.metrics import METRICS
+
+        METRICS.reset()
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                raise httpx.ConnectError("connection refused", request=request)
+            return httpx.Response(200, content=json.dumps({"choices": [{"text": "ok"}]}))
+
+        client = self._client(handler)
+        self.assertEqual(client.complete("Question: retry"), "ok")
+        client.close()
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(METRICS.counter_value("llm_retries_total"), 1)
+
+    def test_timeouts_raise_llm_client_error_after_retries(self):
+        import httpx
+
+        def handler(request):
+            raise httpx.ReadTimeout("timed out", request=request)
+
+        client = self._client(handler, max_retries=1)
+        with self.assertRaises(LLMClientError):
+            client.complete("Question: timeout")
+        with self.assertRaises(LLMClientError):
+            list(client.stream("Question: timeout"))
+        client.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
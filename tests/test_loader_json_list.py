@@ -1,9 +1,12 @@
+import io
 import json
 import tempfile
+import tracemalloc
 import unittest
 from pathlib import Path
 
-from dataiku_tutor.ingestion.loader import DocumentationLoader
+from dataiku_tutor.ingestion.chunker import DocumentationChunker
+from dataiku_tutor.ingestion.loader import DocumentationLoader, iter_json_array
 
 
 class DocumentationLoaderJsonListTests(unittest.TestCase):
@@ -49,5 +52,74 @@ class DocumentationLoaderJsonListTests(unittest.TestCase):
             self.assertEqual(documents[1].metadata["topic"], "ml")
 
 
+class StreamingJsonParserTests(unittest.TestCase):
+    def test_iter_json_array_matches_json_loads_across_tiny_reads(self):
+        payload = [
+            {"id": "a", "content": "brackets ] and [ commas , \"quotes\" and \u00e9"},
+            12345678901234567890,
+            -1.5e10,
+            [1, [2, 3]],
+            "plain",
+            None,
+            True,
+        ]
+        text = "  [\n" + ",\n  ".join(json.dumps(item) for item in payload) + "\n]  "
+        for read_size in (1, 3, 7, 4096):
+            self.assertEqual(list(iter_json_array(io.StringIO(text), read_size=read_size)), payload)
+        self.assertEqual(list(iter_json_array(io.StringIO(" [ ] "))), [])
+
+    def test_iter_json_array_rejects_malformed_input(self):
+        items = iter_json_array(io.StringIO('[{"id": 1} {"id": 2}]'), read_size=4)
+        self.assertEqual(next(items), {"id": 1})
+        with self.assertRaises(json.JSONDecodeError):
+            next(items)
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_json_array(io.StringIO('{"id": 1}')))
+
+    def test_streams_json_array_and_jsonl_exports_lazily(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            rows = [{"id": f"doc-{idx}", "content": f"page {idx} content", "version": "13"} for idx in range(3)]
+            (Path(tmp) / "a.json").write_text(json.dumps(rows), encoding="utf-8")
+            (Path(tmp) / "b.jsonl").write_text(
+                "\n".join([json.dumps({"content": "line one"}), "not json", "", json.dumps({"content": "line two"})]),
+                encoding="utf-8",
+            )
+            (Path(tmp) / "c.json").write_text('[{"id": "ok", "content": "kept"}, {"id": broken', encoding="utf-8")
+
+            loader = DocumentationLoader()
+            documents = loader.iter_documents(tmp)
+            first = next(documents)
+            remaining = list(documents)
+
+        ids = [first.id] + [document.id for document in remaining]
+        self.assertEqual(ids[:3], ["doc-0", "doc-1", "doc-2"])
+        self.assertEqual([document.content for document in remaining[2:4]], ["line one", "line two"])
+        self.assertEqual(remaining[2].metadata["extension"], ".jsonl")
+        self.assertEqual(ids[-1], "ok")
+        self.assertEqual(first.metadata["version"], "13")
+
+    def test_streaming_memory_stays_flat(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source_file = Path(tmp) / "export.json"
+            with source_file.open("w", encoding="utf-8") as handle:
+                handle.write("[")
+                for idx in range(20000):
+                    handle.write("," if idx else "")
+                    handle.write(json.dumps({"id": f"doc-{idx}", "content": f"step {idx} " * 40}))
+                handle.write("]")
+            file_size = source_file.stat().st_size
+
+            chunker = DocumentationChunker(chunk_size=50, overlap=10)
+            tracemalloc.start()
+            try:
+                count = sum(1 for _ in chunker.iter_chunks(DocumentationLoader().iter_documents(str(source_file))))
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+        self.assertEqual(count, 20000 * 2)
+        self.assertLess(peak, file_size / 10)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,101 @@
+import time
+import unittest
+
+from dataiku_tutor.domain.models import Chunk, QueryRequest
+from dataiku_tutor.embeddings.embedding_service import HashEmbeddingService
+from dataiku_tutor.generation.response_generator import ResponseGenerator
+from dataiku_tutor.observability.metrics import METRICS, MetricsRegistry
+from dataiku_tutor.orchestration.tutor_service import TutorService
+from dataiku_tutor.retrieval.hybrid_retriever import HybridRetriever
+from dataiku_tutor.retrieval.keyword_retriever import KeywordRetriever
+from dataiku_tutor.retrieval.semantic_retriever import SemanticRetriever
+from dataiku_tutor.vectorstore.base_store import BaseVectorStore
+
+
+class _MemoryStore(BaseVectorStore):
+    def __init__(self, chunks, embeddings):
+        self.chunks = chunks
+        self.embeddings = embeddings
+
+    def add(self, embeddings, metadata):
+        raise NotImplementedError
+
+    def search(self, query_embedding, k):
+        from dataiku_tutor.domain.models import RetrievedChunk
+
+        scored = [
+            RetrievedChunk(chunk=chunk, score=sum(a * b for a, b in zip(query_embedding, vector)), source="memory")
+            for chunk, vector in zip(self.chunks, self.embeddings)
+        ]
+        return sorted(scored, key=lambda result: result.score, reverse=True)[:k]
+
+    def delete(self, ids):
+        raise NotImplementedError
+
+    def save(self):
+        return None
+
+
+class _EchoLLM:
+    def complete(self, prompt: str) -> str:
+        return "1. Open the flow."
+
+
+def build_service() -> TutorService:
+    chunks = [
+        Chunk(id="a:0", document_id="a", content="Create a join recipe from the flow", metadata={"title": "Join"}),
+        Chunk(id="b:0", document_id="b", content="Group recipe aggregates values", metadata={"title": "Group"}),
+    ]
+    embeddings = HashEmbeddingService()
+    semantic = SemanticRetriever(embeddings, _MemoryStore(chunks, embeddings.embed([c.content for c in chunks])))
+    keyword = KeywordRetriever()
+    keyword.build_index(chunks)
+    retrievers = {"semantic": semantic, "keyword": keyword, "hybrid": HybridRetriever(semantic, keyword)}
+    return TutorService(retrievers, ResponseGenerator(_EchoLLM()))
+
+
+class MetricsTests(unittest.TestCase):
+    def setUp(self):
+        METRICS.reset()
+        METRICS.configure(enabled=True)
+
+    def tearDown(self):
+        METRICS.reset()
+        METRICS.configure(enabled=True)
+
+    def test_answer_records_every_query_stage(self):
+        response = build_service().answer(QueryRequest(question="join recipe", mode="hybrid"))
+
+        self.assertEqual(response.answer, "1. Open the flow.")
+        self.assertEqual(response.sources[0]["chunk_id"], "a:0")
+        for stage in ("query_embedding", "vector_search", "keyword_search", "fusion", "prompt_build", "llm_call"):
+            self.assertEqual(METRICS.histogram_count("query_stage_seconds", stage=stage), 1, stage)
+
+        METRICS.record_cache_lookup("semantic", hit=True)
+        METRICS.record_cache_lookup("semantic", hit=False)
+        text = METRICS.render()
+        self.assertIn("# TYPE dataiku_tutor_query_stage_seconds histogram", text)
+        self.assertIn('dataiku_tutor_query_stage_seconds_count{stage="fusion"} 1', text)
+        self.assertIn('dataiku_tutor_query_seconds_bucket{mode="hybrid",le="+Inf"} 1', text)
+        self.assertIn('dataiku_tutor_cache_hit_ratio{cache="semantic"} 0.5', text)
+
+    def test_disabled_registry_records_nothing(self):
+        METRICS.configure(enabled=False)
+        build_service().answer(QueryRequest(question="group", mode="keyword"))
+        self.assertEqual(METRICS.render().strip(), "")
+
+    def test_slow_request_profiler_keeps_stacks(self):
+        registry = MetricsRegistry()
+        registry.configure(enabled=True, profile_slow_seconds=0.01, profile_interval_seconds=0.001)
+        with registry.profile("fast"):
+            pass
+        with self.assertLogs("dataiku_tutor.observability.metrics", level="WARNING"):
+            with registry.profile("slow"):
+                time.sleep(0.05)
+
+        self.assertEqual([profile["name"] for profile in registry.profiler.profiles], ["slow"])
+        self.assertTrue(any("test_metrics.py" in stack for stack in registry.profiler.profiles[0]["stacks"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,291 @@
+import importlib.util
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from dataiku_tutor.config.settings import Settings
+from dataiku_tutor.embeddings.embedding_service import HashEmbeddingService
+from dataiku_tutor.ingestion.chunker import DocumentationChunker
+from dataiku_tutor.ingestion.loader import DocumentationLoader
+from dataiku_tutor.ingestion.pipeline import IngestionPipeline
+from dataiku_tutor.ingestion.updater import IndexUpdater
+from dataiku_tutor.orchestration.reindex_jobs import (
+    CANCELLED,
+    FAILED,
+    QUEUED,
+    RUNNING,
+    SUCCEEDED,
+    CpuThrottle,
+    ReindexJobManager,
+)
+from dataiku_tutor.vectorstore.faiss_store import FaissVectorStore
+
+
+class _GatedEmbeddings(HashEmbeddingService):
+    """Blocks every batch until released, so tests can observe a running job."""
+
+    def __init__(self) -> None:
+        super().__init__(dimension=8)
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.closed = False
+
+    def embed(self, texts):
+        self.started.set()
+        self.release.wait(5)
+        return super().embed(texts)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _ListStore:
+    def __init__(self) -> None:
+        self.rows: list[dict] = []
+        self.saved = False
+
+    def add(self, embeddings, metadata) -> None:
+        self.rows.extend(metadata)
+
+    def save(self) -> None:
+        self.saved = True
+
+    def stats(self) -> dict[str, int]:
+        return {"vectors": len(self.rows)}
+
+
+def _wait_for(job, states, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while job.status not in states and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return job.status
+
+
+class ReindexJobManagerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.docs = Path(self._tmp.name)
+        for idx in range(6):
+            (self.docs / f"page_{idx}.md").write_text(" ".join(f"w{idx}_{n}" for n in range(20)), encoding="utf-8")
+        self.embeddings = _GatedEmbeddings()
+        self.store = _ListStore()
+        self.manager = ReindexJobManager(self._reindex, default_source_path=str(self.docs), max_cpu_fraction=1.0, nice=0)
+
+    def tearDown(self) -> None:
+        self.embeddings.release.set()
+        self.manager.shutdown()
+        self._tmp.cleanup()
+
+    def _reindex(self, source_path, progress, pause) -> int:
+        chunker = DocumentationChunker(chunk_size=10, overlap=2)
+        updater = IndexUpdater(DocumentationLoader(), chunker, self.embeddings, self.store, batch_size=4)
+        return updater.run_full_reindex(source_path, progress=progress, pause=pause)
+
+    def test_job_runs_in_background_and_reports_progress(self):
+        job = self.manager.submit()
+        self.assertTrue(self.embeddings.started.wait(5))
+        self.assertEqual(job.status, "running")
+
+        self.embeddings.release.set()
+        self.assertEqual(_wait_for(job, {SUCCEEDED, FAILED}), SUCCEEDED)
+        self.assertEqual(job.indexed_chunks, 18)
+        self.assertEqual(job.progress, {"documents": 6, "chunks": 18, "embeddings": 18})
+        self.assertTrue(self.store.saved)
+        self.assertIs(self.manager.get(job.id), job)
+
+    def test_cancel_stops_running_job_without_saving_and_skips_queued_jobs(self):
+        running = self.manager.submit()
+        queued = self.manager.submit()
+        self.assertTrue(self.embeddings.started.wait(5))
+
+        self.manager.cancel(running.id)
+        self.assertEqual(self.manager.cancel(queued.id).status, CANCELLED)
+        self.embeddings.release.set()
+
+        self.assertEqual(_wait_for(running, {SUCCEEDED, FAILED, CANCELLED}), CANCELLED)
+        self.assertEqual(running.progress["embeddings"], 4)
+        self.assertFalse(self.store.saved)
+        self.assertIsNone(queued.started_at)
+        self.assertIsNone(self.manager.cancel("missing"))
+
+    def test_jobs_run_one_at_a_time(self):
+        first = self.manager.submit()
+        second = self.manager.submit()
+        self.assertTrue(self.embeddings.started.wait(5))
+        self.assertEqual((first.status, second.status), (RUNNING, QUEUED))
+
+        self.embeddings.release.set()
+        self.assertEqual(_wait_for(second, {SUCCEEDED, FAILED}), SUCCEEDED)
+        self.assertLessEqual(first.finished_at, second.started_at)
+
+    def test_source_path_is_confined_to_the_configured_root(self):
+        (self.docs / "guides").mkdir()
+        job = self.manager.submit("guides")
+        self.assertEqual(job.source_path, str((self.docs / "guides").resolve()))
+        for outside in ("/etc", "..", "guides/../../"):
+            with self.assertRaises(ValueError):
+                self.manager.submit(outside)
+        self.assertEqual(len(self.manager.jobs()), 1)
+
+    def test_failed_job_records_error(self):
+        manager = ReindexJobManager(lambda source_path, progress, pause: 1 / 0, nice=0)
+        job = manager.submit("unused")
+        self.assertEqual(_wait_for(job, {SUCCEEDED, FAILED}), FAILED)
+        self.assertIn("ZeroDivisionError", job.error)
+        manager.shutdown()
+
+
+class PipelineReindexJobTests(unittest.TestCase):
+    def _pipeline(self, tmp: Path, pipelined: bool) -> IngestionPipeline:
+        settings = tmp / "settings.yaml"
+        settings.write_text(
+            "\n".join(
+                [
+                    "embeddings:",
+                    "  provider: hash",
+                    "  batch_size: 4",
+                    "vectorstore:",
+                    f"  index_path: {tmp / 'faiss.index'}",
+                    f"  metadata_path: {tmp / 'faiss_metadata.json'}",
+                    "ingestion:",
+                    "  chunk_size: 10",
+                    "  chunk_overlap: 2",
+                    f"  pipelined: {'true' if pipelined else 'false'}",
+                ]
+            ),
+            encoding="utf-8",
+        )
+        return IngestionPipeline(settings=Settings(settings))
+
+    def _store(self, tmp: Path) -> FaissVectorStore:
+        return FaissVectorStore(index_path=str(tmp / "faiss.index"), metadata_path=str(tmp / "faiss_metadata.json"))
+
+    def test_repeated_jobs_replace_the_index_instead_of_appending(self):
+        for pipelined in (True, False):
+            with self.subTest(pipelined=pipelined), tempfile.TemporaryDirectory() as tmp:
+                tmp_path = Path(tmp)
+                docs = tmp_path / "docs"
+                docs.mkdir()
+                (docs / "page.md").write_text("Prepare recipe steps", encoding="utf-8")
+                pipeline = self._pipeline(tmp_path, pipelined)
+                manager = ReindexJobManager(pipeline.run_full_reindex, default_source_path=str(docs), nice=0)
+
+                sizes = []
+                for _ in range(2):
+                    job = manager.submit()
+                    self.assertEqual(_wait_for(job, {SUCCEEDED, FAILED}), SUCCEEDED, job.error)
+                    self.assertEqual(job.progress["embeddings"], 1)
+                    sizes.append(self._store(tmp_path).stats()["vectors"])
+                manager.shutdown()
+
+                self.assertEqual(sizes, [1, 1])
+                self.assertEqual(pipeline.last_report is not None, pipelined)
+                store = self._store(tmp_path)
+                self.assertEqual(len(store.search(HashEmbeddingService().embed(["Prepare recipe"])[0], k=5)), 1)
+                self.assertEqual(sorted(path.name for path in tmp_path.glob("faiss*")), ["faiss.index", "faiss_metadata.json"])
+
+    def test_cancelled_job_leaves_the_live_index_untouched(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            docs = tmp_path / "docs"
+            docs.mkdir()
+            (docs / "page.md").write_text("Prepare recipe steps", encoding="utf-8")
+            pipeline = self._pipeline(tmp_path, pipelined=True)
+            pipeline.run_full_reindex(str(docs))
+            version = self._store(tmp_path).version
+
+            for idx in range(5):
+                (docs / f"more_{idx}.md").write_text(" ".join(f"w{idx}_{n}" for n in range(30)), encoding="utf-8")
+            def cancel_after_first_batch(source_path, progress, pause):
+                def on_progress(counts):
+                    manager.cancel(manager.jobs()[0].id)
+                    progress(counts)
+
+                return pipeline.run_full_reindex(source_path, on_progress, pause)
+
+            manager = ReindexJobManager(cancel_after_first_batch, default_source_path=str(docs), nice=0)
+            job = manager.submit()
+            self.assertEqual(_wait_for(job, {SUCCEEDED, FAILED, CANCELLED}), CANCELLED)
+            manager.shutdown()
+
+            store = self._store(tmp_path)
+            self.assertEqual((store.stats()["vectors"], store.version), (1, version))
+
+
+class CpuThrottleTests(unittest.TestCase):
+    def test_sleeps_to_hold_duty_cycle(self):
+        throttle = CpuThrottle(max_cpu_fraction=0.5)
+        started = time.monotonic()
+        busy_until = time.thread_time() + 0.05
+        while time.thread_time() < busy_until:
+            pass
+        throttle.pause()
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
+        self.assertGreater(throttle.slept_seconds, 0.0)
+
+    def test_holds_combined_cpu_of_several_threads_and_carries_debt(self):
+        throttle = CpuThrottle(max_cpu_fraction=0.25, max_sleep=0.05)
+
+        def work():
+            for _ in range(4):
+                busy_until = time.thread_time() + 0.02
+                while time.thread_time() < busy_until:
+                    pass
+                throttle.pause()
+
+        cpu, started = time.process_time(), time.monotonic()
+        threads = [threading.Thread(target=work) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        while throttle.pause():
+            pass
+
+        used = time.process_time() - cpu
+        self.assertGreaterEqual(used, 0.24)
+        self.assertLessEqual(used / (time.monotonic() - started), 0.25 * 1.1)
+
+
+@unittest.skipUnless(importlib.util.find_spec("fastapi"), "fastapi is not installed")
+class ReindexRoutesTests(unittest.TestCase):
+    def test_reindex_endpoints(self):
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from dataiku_tutor.api.routes import build_router
+
+        with tempfile.TemporaryDirectory() as tmp:
+            (Path(tmp) / "page.md").write_text("Prepare recipe steps", encoding="utf-8")
+            store = _ListStore()
+            manager = ReindexJobManager(
+                lambda source_path, progress, pause: IndexUpdater(
+                    DocumentationLoader(), DocumentationChunker(10, 2), HashEmbeddingService(8), store
+                ).run_full_reindex(source_path, progress=progress, pause=pause),
+                default_source_path=tmp,
+                nice=0,
+            )
+            app = FastAPI()
+            app.include_router(build_router(tutor_service=None, reindex_jobs=manager))
+            client = TestClient(app)
+
+            created = client.post("/reindex")
+            self.assertEqual(created.status_code, 202)
+            job_id = created.json()["job_id"]
+            _wait_for(manager.get(job_id), {SUCCEEDED, FAILED})
+
+            status = client.get(f"/reindex/{job_id}").json()
+            self.assertEqual(status["status"], SUCCEEDED)
+            self.assertEqual(status["progress"]["documents"], 1)
+            self.assertEqual(client.delete(f"/reindex/{job_id}").json()["status"], SUCCEEDED)
+            self.assertEqual(client.get("/reindex/unknown").status_code, 404)
+            for outside in ("/etc", "../", f"{tmp}/../other"):
+                self.assertEqual(client.post("/reindex", json={"source_path": outside}).status_code, 400, outside)
+            self.assertEqual(len(manager.jobs()), 1)
+            manager.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
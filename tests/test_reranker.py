@@ -0,0 +1,129 @@
+import threading
+import time
+import unittest
+
+from dataiku_tutor.domain.models import Chunk, RetrievedChunk
+from dataiku_tutor.retrieval.reranker import (
+    BudgetedReranker,
+    LexicalOverlapScorer,
+    RerankerFactory,
+    RerankingRetriever,
+)
+
+
+def _candidates() -> list[RetrievedChunk]:
+    texts = [
+        "Dashboards display insights",
+        "Scenarios can rebuild datasets",
+        "Create a join recipe to join two datasets",
+        "Recipes transform datasets",
+    ]
+    return [
+        RetrievedChunk(chunk=Chunk(id=f"c{idx}", document_id=f"d{idx}", content=text, metadata={}), score=1.0 - idx * 0.1, source="hybrid")
+        for idx, text in enumerate(texts)
+    ]
+
+
+class _CountingScorer(LexicalOverlapScorer):
+    def __init__(self, cost_per_pair: float = 0.0) -> None:
+        super().__init__(cost_per_pair)
+        self.calls: list[int] = []
+
+    def score(self, query, passages):
+        self.calls.append(len(passages))
+        return super().score(query, passages)
+
+
+class _FixedRetriever:
+    def retrieve(self, query, k):
+        return _candidates()[:k]
+
+
+class BudgetedRerankerTests(unittest.TestCase):
+    def test_reranks_in_one_batched_call_and_caches_pair_scores(self):
+        scorer = _CountingScorer()
+        reranker = BudgetedReranker(scorer, top_n=4, min_top_n=2, budget_ms=1000)
+        results = reranker.rerank("join recipe", _candidates(), k=2)
+
+        self.assertEqual(results[0].chunk.id, "c2")
+        self.assertEqual(results[0].source, "rerank")
+        self.assertEqual(scorer.calls, [4])
+
+        reranker.rerank("join recipe", _candidates(), k=2)
+        self.assertEqual(scorer.calls, [4])
+        reranker.close()
+
+    def test_budget_overrun_falls_back_to_fused_order(self):
+        scorer = _CountingScorer(cost_per_pair=0.02)
+        reranker = BudgetedReranker(scorer, top_n=4, min_top_n=1, budget_ms=10)
+        results = reranker.rerank("join recipe", _candidates(), k=3)
+
+        self.assertEqual([r.chunk.id for r in results], ["c0", "c1", "c2"])
+        self.assertEqual({r.source for r in results}, {"hybrid"})
+
+        # Late scores land in the cache and the measured cost shrinks N for the next query.
+        time.sleep(0.15)
+        self.assertLess(reranker.current_top_n(), 4)
+        cached = reranker.rerank("join recipe", _candidates(), k=1)
+        self.assertEqual(cached[0].source, "rerank")
+        self.assertEqual(scorer.calls, [4])
+        reranker.close()
+
+    def test_slow_scorer_does_not_starve_later_requests(self):
+        release = threading.Event()
+
+        class _BlockingScorer(LexicalOverlapScorer):
+            def score(self, query, passages):
+                release.wait(2)
+                return super().score(query, passages)
+
+        reranker = BudgetedReranker(_BlockingScorer(), top_n=4, min_top_n=1, budget_ms=20, max_workers=1)
+        reranker.rerank("join recipe", _candidates(), k=2)
+
+        started = time.perf_counter()
+        results = reranker.rerank("scenario datasets", _candidates(), k=2)
+        self.assertLess(time.perf_counter() - started, reranker.budget_seconds)
+        self.assertEqual([r.chunk.id for r in results], ["c0", "c1"])
+
+        release.set()
+        time.sleep(0.05)
+        self.assertEqual(reranker.rerank("scenario datasets", _candidates(), k=1)[0].chunk.id, "c1")
+        reranker.close()
+
+    def test_timed_out_call_that_never_started_is_cancelled(self):
+        release = threading.Event()
+        scorer = _CountingScorer()
+        blocking_score = scorer.score
+        scorer.score = lambda query, passages: release.wait(2) and blocking_score(query, passages)
+
+        reranker = BudgetedReranker(scorer, top_n=4, min_top_n=1, budget_ms=20, max_workers=1, max_pending=2)
+        reranker.rerank("join recipe", _candidates(), k=2)
+        reranker.rerank("scenario datasets", _candidates(), k=2)
+        self.assertEqual(reranker._active, 1)
+
+        release.set()
+        time.sleep(0.05)
+        self.assertEqual(scorer.calls, [4])
+        reranker.close()
+
+    def test_unreranked_tail_scores_stay_below_reranked_head(self):
+        reranker = BudgetedReranker(LexicalOverlapScorer(), top_n=2, min_top_n=2, budget_ms=1000)
+        results = reranker.rerank("join recipe", _candidates(), k=4)
+
+        self.assertEqual([r.source for r in results], ["rerank", "rerank", "hybrid", "hybrid"])
+        scores = [r.score for r in results]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertAlmostEqual(scores[2] - scores[3], 0.1)
+        reranker.close()
+
+    def test_factory_and_retriever_wrapper(self):
+        self.assertIsNone(RerankerFactory.create({"rerank": False}))
+        reranker = RerankerFactory.create({"rerank": True, "rerank_model": "lexical", "rerank_top_n": 4})
+        self.assertIsInstance(reranker.scorer, LexicalOverlapScorer)
+        results = RerankingRetriever(_FixedRetriever(), reranker).retrieve("join recipe", k=1)
+        self.assertEqual([r.chunk.id for r in results], ["c2"])
+        reranker.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,235 @@
+import re
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from dataiku_tutor.config.settings import Settings
+from dataiku_tutor.domain.models import Chunk, QueryRequest, QueryResponse, RetrievedChunk
+from dataiku_tutor.generation.response_generator import ResponseGenerator
+from dataiku_tutor.ingestion.pipeline import IngestionPipeline
+from dataiku_tutor.observability.metrics import METRICS
+from dataiku_tutor.orchestration.admission import AdmissionController, Overloaded
+from dataiku_tutor.orchestration.reindex_jobs import FAILED, SUCCEEDED, ReindexJobManager
+from dataiku_tutor.orchestration.semantic_cache import SemanticCacheFactory, SemanticQueryCache
+from dataiku_tutor.orchestration.tutor_service import TutorService
+from dataiku_tutor.retrieval.hybrid_retriever import HybridRetriever
+from dataiku_tutor.retrieval.keyword_retriever import KeywordRetriever
+from dataiku_tutor.retrieval.semantic_retriever import SemanticRetriever
+
+_STOPWORDS = {"how", "do", "i", "to", "a", "the", "can", "you", "in"}
+_VOCABULARY = ["join", "two", "datasets", "scenario", "schedule", "model", "train", "combine"]
+
+
+class _BagOfWordsEmbeddings:
+    """Tiny deterministic embedding where paraphrases sharing content words are close."""
+
+    def embed(self, texts):
+        vectors = []
+        for text in texts:
+            words = [word for word in re.findall(r"[a-z]+", text.lower()) if word not in _STOPWORDS]
+            vectors.append([float(words.count(term)) for term in _VOCABULARY] + [0.01])
+        return vectors
+
+
+class _CountingEmbeddings(_BagOfWordsEmbeddings):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def embed(self, texts):
+        self.calls += 1
+        return super().embed(texts)
+
+
+_JOIN_CHUNK = Chunk(id="join:0", document_id="join", content="Use the join recipe to combine two datasets", metadata={})
+
+
+class _OneChunkStore:
+    def search(self, query_embedding, k):
+        return [RetrievedChunk(chunk=_JOIN_CHUNK, score=1.0, source="semantic")]
+
+
+class _CountingRetriever:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.chunk_id = "join:0"
+
+    def retrieve(self, query, k, query_embedding=None):
+        self.calls += 1
+        chunk = Chunk(id=self.chunk_id, document_id="join", content="Use the join recipe", metadata={})
+        return [RetrievedChunk(chunk=chunk, score=1.0, source="hybrid")]
+
+
+class _EchoLLM:
+    def complete(self, prompt: str) -> str:
+        return "1. Open the flow."
+
+
+def _response(text: str = "answer", degraded: bool = False) -> QueryResponse:
+    return QueryResponse(answer=text, sources=[{"chunk_id": "join:0"}], mode="hybrid", degraded=degraded)
+
+
+class SemanticQueryCacheTests(unittest.TestCase):
+    def setUp(self):
+        METRICS.reset()
+        METRICS.configure(enabled=True)
+
+    def test_paraphrase_hits_and_unrelated_question_misses(self):
+        cache = SemanticQueryCache(_BagOfWordsEmbeddings(), threshold=0.9)
+        cache.store(cache.lookup(QueryRequest(question="How do I join two datasets?")), _response())
+
+        hit = cache.lookup(QueryRequest(question="join   two datasets how to"))
+        self.assertEqual(hit.response.answer, "answer")
+        self.assertGreaterEqual(hit.similarity, 0.9)
+        self.assertEqual(hit.matched_question, "How do I join two datasets?")
+
+        self.assertIsNone(cache.lookup(QueryRequest(question="How do I schedule a scenario?")).response)
+        self.assertIsNone(cache.lookup(QueryRequest(question="How do I join two datasets?", mode="keyword")).response)
+        self.assertEqual(METRICS.counter_value("cache_requests_total", cache="semantic", result="hit"), 1)
+        self.assertEqual(METRICS.counter_value("cache_requests_total", cache="semantic", result="miss"), 3)
+
+    def test_index_version_change_invalidates_entries(self):
+        version = [1]
+        cache = SemanticQueryCache(_BagOfWordsEmbeddings(), version=lambda: version[0])
+        cache.store(cache.lookup(QueryRequest(question="join two datasets")), _response())
+        self.assertIsNotNone(cache.lookup(QueryRequest(question="join two datasets")).response)
+
+        version[0] = 2
+        self.assertIsNone(cache.lookup(QueryRequest(question="join two datasets")).response)
+        self.assertEqual(len(cache), 0)
+
+    def test_clear_drops_entries_and_answers_probed_before_it(self):
+        cache = SemanticQueryCache(_BagOfWordsEmbeddings())
+        cache.store(cache.lookup(QueryRequest(question="join two datasets")), _response())
+        in_flight = cache.lookup(QueryRequest(question="schedule scenario"))
+
+        cache.clear()
+        cache.store(in_flight, _response("stale"))
+        self.assertEqual(len(cache), 0)
+        self.assertIsNone(cache.lookup(QueryRequest(question="schedule scenario")).response)
+
+    def test_entries_are_matched_only_within_their_mode_and_top_k(self):
+        cache = SemanticQueryCache(_BagOfWordsEmbeddings(), threshold=0.9, max_entries=3)
+        cache.store(cache.lookup(QueryRequest(question="join two datasets", mode="keyword")), _response("keyword"))
+        cache.store(cache.lookup(QueryRequest(question="join two datasets", top_k=3)), _response("top3"))
+        cache.store(cache.lookup(QueryRequest(question="join two datasets")), _response("hybrid"))
+
+        self.assertEqual(cache.lookup(QueryRequest(question="join two datasets", mode="keyword")).response.answer, "keyword")
+        self.assertEqual(cache.lookup(QueryRequest(question="join two datasets", top_k=3)).response.answer, "top3")
+        cache.store(cache.lookup(QueryRequest(question="train model")), _response("train"))
+        self.assertIsNone(cache.lookup(QueryRequest(question="join two datasets")).response)
+        self.assertEqual(cache.lookup(QueryRequest(question="train model")).response.answer, "train")
+
+    def test_lru_eviction_and_degraded_answers_are_not_cached(self):
+        cache = SemanticQueryCache(_BagOfWordsEmbeddings(), max_entries=2)
+        for question in ("join two datasets", "schedule scenario"):
+            cache.store(cache.lookup(QueryRequest(question=question)), _response(question))
+        cache.lookup(QueryRequest(question="join two datasets"))
+        cache.store(cache.lookup(QueryRequest(question="train model")), _response("train"))
+        cache.store(cache.lookup(QueryRequest(question="combine datasets")), _response(degraded=True))
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNotNone(cache.lookup(QueryRequest(question="join two datasets")).response)
+        self.assertIsNone(cache.lookup(QueryRequest(question="schedule scenario")).response)
+        self.assertIsNone(cache.lookup(QueryRequest(question="combine datasets")).response)
+
+    def test_factory_reads_semantic_cache_section(self):
+        self.assertIsNone(SemanticCacheFactory.create({"enabled": False}, _BagOfWordsEmbeddings()))
+
+        cache = SemanticCacheFactory.create({"enabled": True, "threshold": 0.8}, _BagOfWordsEmbeddings(), lambda: 7)
+        self.assertEqual(cache.threshold, 0.8)
+        self.assertEqual(cache.version(), 7)
+        self.assertIsInstance(SemanticCacheFactory.create({}, _BagOfWordsEmbeddings()), SemanticQueryCache)
+
+
+class TutorServiceSemanticCacheTests(unittest.TestCase):
+    def test_paraphrase_is_served_from_cache_and_sampled_hits_are_audited(self):
+        retriever = _CountingRetriever()
+        cache = SemanticQueryCache(_BagOfWordsEmbeddings(), threshold=0.9, audit_sample_rate=0.0)
+        service = TutorService({"hybrid": retriever}, ResponseGenerator(_EchoLLM()), semantic_cache=cache)
+
+        first = service.answer(QueryRequest(question="How do I join two datasets?"))
+        second = service.answer(QueryRequest(question="how to join two datasets"))
+        self.assertIs(second, first)
+        self.assertEqual(retriever.calls, 1)
+
+        cache.audit_sample_rate = 1.0
+        retriever.chunk_id = "other:0"
+        audited = service.answer(QueryRequest(question="join two datasets"))
+        self.assertIsNot(audited, first)
+        self.assertEqual(retriever.calls, 2)
+        [sample] = cache.audit_samples()
+        self.assertTrue(sample.false_hit)
+        self.assertEqual(sample.source_overlap, 0.0)
+        self.assertEqual(METRICS.counter_value("semantic_cache_audits_total", result="false_hit"), 1)
+
+    def test_question_is_embedded_once_and_only_when_retrieval_needs_it(self):
+        embeddings = _CountingEmbeddings()
+        semantic = SemanticRetriever(embeddings, _OneChunkStore())
+        keyword = KeywordRetriever()
+        keyword.build_index([_JOIN_CHUNK])
+        retrievers = {"semantic": semantic, "keyword": keyword, "hybrid": HybridRetriever(semantic, keyword)}
+        controller = AdmissionController(max_concurrent=1, max_queue=0)
+        cache = SemanticQueryCache(embeddings, threshold=0.9, audit_sample_rate=0.0)
+        service = TutorService(retrievers, ResponseGenerator(_EchoLLM()), controller, semantic_cache=cache)
+
+        for mode in ("semantic", "hybrid"):
+            embeddings.calls = 0
+            response = service.answer(QueryRequest(question="join two datasets", mode=mode))
+            self.assertEqual(response.sources[0]["chunk_id"], "join:0")
+            self.assertEqual(embeddings.calls, 1, mode)
+
+        embeddings.calls = 0
+        service.answer(QueryRequest(question="join two datasets", mode="keyword"))
+        self.assertEqual((embeddings.calls, len(cache)), (0, 2))
+
+        with controller.admit("holder", "hybrid"), self.assertRaises(Overloaded):
+            service.answer(QueryRequest(question="schedule a scenario"))
+        self.assertEqual(embeddings.calls, 0)
+
+    def test_successful_reindex_job_invalidates_cached_answers(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            docs = tmp_path / "docs"
+            docs.mkdir()
+            (docs / "page.md").write_text("Use the join recipe", encoding="utf-8")
+            settings = tmp_path / "settings.yaml"
+            settings.write_text(
+                "\n".join(
+                    [
+                        "embeddings:",
+                        "  provider: hash",
+                        "vectorstore:",
+                        f"  index_path: {tmp_path / 'faiss.index'}",
+                        f"  metadata_path: {tmp_path / 'faiss_metadata.json'}",
+                    ]
+                ),
+                encoding="utf-8",
+            )
+            retriever = _CountingRetriever()
+            cache = SemanticQueryCache(_BagOfWordsEmbeddings(), threshold=0.9, audit_sample_rate=0.0)
+            service = TutorService({"hybrid": retriever}, ResponseGenerator(_EchoLLM()), semantic_cache=cache)
+            manager = ReindexJobManager(
+                IngestionPipeline(settings=Settings(str(settings))).run_full_reindex,
+                default_source_path=str(docs),
+                nice=0,
+                on_success=lambda job: cache.clear(),
+            )
+
+            service.answer(QueryRequest(question="How do I join two datasets?"))
+            service.answer(QueryRequest(question="join two datasets"))
+            self.assertEqual(retriever.calls, 1)
+
+            job = manager.submit()
+            deadline = time.monotonic() + 5
+            while job.status not in {SUCCEEDED, FAILED} and time.monotonic() < deadline:
+                time.sleep(0.01)
+            manager.shutdown()
+            self.assertEqual(job.status, SUCCEEDED, job.error)
+
+            service.answer(QueryRequest(question="join two datasets"))
+            self.assertEqual(retriever.calls, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from dataiku_tutor.vectorstore.faiss_store import VectorStoreFactory
+from dataiku_tutor.vectorstore.sharded_store import ShardedVectorStore
+
+
+def _row(chunk_id: str, version: str) -> dict:
+    return {"id": chunk_id, "document_id": chunk_id, "content": chunk_id, "metadata": {"version": version}}
+
+
+class ShardedVectorStoreTests(unittest.TestCase):
+    def test_partitions_by_key_and_merges_top_k(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = VectorStoreFactory.create({"type": "sharded", "shard_dir": tmp, "search_workers": 2})
+            self.assertIsInstance(store, ShardedVectorStore)
+            store.add(
+                embeddings=[[1.0, 0.0], [0.9, 0.1], [0.0, 1.0], [0.8, 0.2]],
+                metadata=[_row("a", "12"), _row("b", "13"), _row("c", "13"), _row("d", "")],
+            )
+            self.assertEqual(store.shard_names, ["12", "13", ShardedVectorStore.DEFAULT_SHARD])
+
+            results = store.search([1.0, 0.0], k=3)
+            self.assertEqual([r.chunk.id for r in results], ["a", "b", "d"])
+            self.assertEqual([r.chunk.id for r in store.search([1.0, 0.0], k=5, shard_names=["13"])], ["b", "c"])
+            self.assertEqual(store.search([1.0, 0.0], k=2, shard_names=["missing"]), [])
+
+            store.delete(["b"])
+            store.save()
+            store.close()
+
+            reloaded = ShardedVectorStore(shard_dir=tmp)
+            self.assertEqual(reloaded.shard_names, store.shard_names)
+            self.assertEqual(reloaded._shards, {})
+            self.assertEqual([r.chunk.id for r in reloaded.search([1.0, 0.0], k=5, shard_names=["13"])], ["c"])
+            self.assertEqual(list(reloaded._shards), ["13"])
+            self.assertTrue((Path(tmp) / "shards.json").exists())
+            reloaded.close()
+
+    def test_deletes_and_stats_only_open_shards_that_need_it(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = ShardedVectorStore(shard_dir=tmp)
+            store.add(
+                embeddings=[[1.0, 0.0], [0.0, 1.0], [0.5, 0.5]],
+                metadata=[_row("a", "12"), _row("b", "13"), _row("c", "14")],
+            )
+            store.save()
+
+            reloaded = ShardedVectorStore(shard_dir=tmp)
+            self.assertEqual(reloaded.stats()["vectors"], 3)
+            self.assertEqual(reloaded._shards, {})
+
+            reloaded.delete(["b", "unknown"])
+            self.assertEqual(list(reloaded._shards), ["13"])
+            reloaded.save()
+            self.assertEqual(ShardedVectorStore(shard_dir=tmp).stats()["deleted"], 1)
+
+    def test_incremental_save_does_not_rewrite_chunk_ids_into_the_manifest(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = ShardedVectorStore(shard_dir=tmp, checkpoint_interval=100000)
+            store.add(
+                embeddings=[[1.0, float(idx)] for idx in range(500)],
+                metadata=[_row(f"chunk-{idx}", str(idx % 2)) for idx in range(500)],
+            )
+            store.save()
+            manifest = Path(tmp) / "shards.json"
+            size = manifest.stat().st_size
+            self.assertNotIn("chunk-1", manifest.read_text(encoding="utf-8"))
+
+            store.delete(["chunk-1"])
+            store.add(embeddings=[[1.0, 0.0]], metadata=[_row("chunk-new", "0")])
+            store.save()
+            self.assertLess(abs(manifest.stat().st_size - size), 50)
+
+            reloaded = ShardedVectorStore(shard_dir=tmp)
+            reloaded.delete(["chunk-new"])
+            self.assertEqual(list(reloaded._shards), ["0"])
+
+    def test_shard_without_id_file_is_listed_once_for_deletes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = ShardedVectorStore(shard_dir=tmp)
+            store.add(embeddings=[[1.0, 0.0], [0.0, 1.0]], metadata=[_row("a", "12"), _row("b", "13")])
+            store.save()
+            for path in Path(tmp).glob(f"*/{ShardedVectorStore.IDS_FILE}"):
+                path.unlink()
+
+            reloaded = ShardedVectorStore(shard_dir=tmp)
+            reloaded.delete(["b"])
+            reloaded.save()
+            self.assertEqual(len(list(Path(tmp).glob(f"*/{ShardedVectorStore.IDS_FILE}"))), 2)
+            self.assertEqual([r.chunk.id for r in ShardedVectorStore(shard_dir=tmp).search([0.0, 1.0], k=2)], ["a"])
+
+    def test_new_shard_saved_before_a_crash_stays_listed(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = ShardedVectorStore(shard_dir=tmp)
+            store.add(embeddings=[[1.0, 0.0]], metadata=[_row("a", "12")])
+            store.save()
+            store.add(embeddings=[[0.0, 1.0]], metadata=[_row("b", "13")])
+
+            writes = []
+            original = store._write_manifest
+
+            def crash_on_second_write():
+                writes.append(True)
+                if len(writes) == 2:
+                    raise OSError("simulated crash")
+                original()
+
+            store._write_manifest = crash_on_second_write
+            with self.assertRaises(OSError):
+                store.save()
+
+            reloaded = ShardedVectorStore(shard_dir=tmp)
+            self.assertEqual(reloaded.shard_names, ["12", "13"])
+            self.assertEqual(reloaded.stats()["vectors"], 2)
+            self.assertEqual([r.chunk.id for r in reloaded.search([0.0, 1.0], k=1)], ["b"])
+
+    def test_staged_rebuild_replaces_shards_through_the_manifest(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            live = ShardedVectorStore(shard_dir=tmp)
+            live.add(embeddings=[[1.0, 0.0], [0.0, 1.0]], metadata=[_row("a", "12"), _row("b", "13")])
+            live.save()
+            old_directories = sorted(path.name for path in Path(tmp).iterdir() if path.is_dir())
+
+            for _ in range(2):
+                staged = live.staging()
+                staged.add(embeddings=[[1.0, 0.0]], metadata=[_row("a", "12")])
+                self.assertEqual(live.stats()["vectors"], 2 if _ == 0 else 1)
+                live.promote(staged)
+
+            self.assertEqual(live.shard_names, ["12"])
+            self.assertEqual(live.stats()["vectors"], 1)
+            directories = [path.name for path in Path(tmp).iterdir() if path.is_dir()]
+            self.assertEqual(len(directories), 1)
+            self.assertNotIn(directories[0], old_directories)
+            reloaded = ShardedVectorStore(shard_dir=tmp)
+            self.assertEqual([r.chunk.id for r in reloaded.search([1.0, 0.0], k=5)], ["a"])
+            self.assertGreater(reloaded.version, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from dataiku_tutor.embeddings.embedding_service import HashEmbeddingService
+from dataiku_tutor.ingestion.chunker import DocumentationChunker
+from dataiku_tutor.ingestion.loader import DocumentationLoader
+from dataiku_tutor.ingestion.staged import StagedIngestion
+from dataiku_tutor.ingestion.updater import IndexUpdater
+from dataiku_tutor.vectorstore.faiss_store import FaissVectorStore
+
+
+class _FailingEmbeddings(HashEmbeddingService):
+    def embed(self, texts):
+        raise RuntimeError("embedding backend down")
+
+
+class StagedIngestionTests(unittest.TestCase):
+    def _write_docs(self, docs_path: Path) -> None:
+        docs_path.mkdir()
+        for idx in range(6):
+            (docs_path / f"page_{idx}.md").write_text(
+                " ".join(f"word{idx}_{n}" for n in range(30)), encoding="utf-8"
+            )
+        (docs_path / "pages.json").write_text(
+            json.dumps([{"id": f"json-{n}", "content": f"Join recipe step {n}"} for n in range(5)]),
+            encoding="utf-8",
+        )
+
+    def _store(self, tmp_path: Path, name: str) -> FaissVectorStore:
+        return FaissVectorStore(
+            index_path=str(tmp_path / f"{name}.index"),
+            metadata_path=str(tmp_path / f"{name}_metadata.json"),
+        )
+
+    def test_staged_run_matches_sequential_reindex(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            docs_path = tmp_path / "docs"
+            self._write_docs(docs_path)
+            loader = DocumentationLoader()
+            chunker = DocumentationChunker(chunk_size=8, overlap=2)
+            embeddings = HashEmbeddingService()
+
+            sequential_store = self._store(tmp_path, "sequential")
+            expected = IndexUpdater(loader, chunker, embeddings, sequential_store).run_full_reindex(str(docs_path))
+
+            staged_store = self._store(tmp_path, "staged")
+            staged = StagedIngestion(loader, chunker, embeddings, staged_store, queue_size=2, batch_size=5)
+            report = staged.run(str(docs_path))
+
+            self.assertEqual(report.indexed_chunks, expected)
+            self.assertEqual(staged_store._metadata, sequential_store._metadata)
+            self.assertEqual([stage.name for stage in report.stages], list(StagedIngestion.STAGES))
+            self.assertEqual(report.stages[0].items, 7)
+            self.assertLessEqual(max(stage.max_queue_depth for stage in report.stages), 2)
+            self.assertIn(report.bottleneck, StagedIngestion.STAGES)
+            self.assertTrue((tmp_path / "staged.index").exists())
+
+    def test_stage_failure_is_raised(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            docs_path = tmp_path / "docs"
+            self._write_docs(docs_path)
+            staged = StagedIngestion(
+                DocumentationLoader(),
+                DocumentationChunker(chunk_size=8, overlap=2),
+                _FailingEmbeddings(),
+                self._store(tmp_path, "failed"),
+                queue_size=1,
+                batch_size=2,
+            )
+            with self.assertRaises(RuntimeError):
+                staged.run(str(docs_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import importlib.util
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from dataiku_tutor.config.settings import Settings
+from dataiku_tutor.domain.models import QueryRequest
+from dataiku_tutor.generation.mock_llm_server import MockLLMServer
+from dataiku_tutor.ingestion.pipeline import IngestionPipeline
+from dataiku_tutor.orchestration.admission import AdmissionController
+from dataiku_tutor.orchestration.reindex_jobs import FAILED, SUCCEEDED, ReindexJobManager
+from dataiku_tutor.orchestration.semantic_cache import SemanticQueryCache
+from dataiku_tutor.orchestration.tutor_service import TutorServiceFactory
+from dataiku_tutor.retrieval.reranker import RerankingRetriever
+
+
+def _write_settings(tmp: Path, llm_url: str) -> Path:
+    settings = tmp / "settings.yaml"
+    settings.write_text(
+        "\n".join(
+            [
+                "embeddings:",
+                "  provider: hash",
+                "vectorstore:",
+                f"  index_path: {tmp / 'faiss.index'}",
+                f"  metadata_path: {tmp / 'faiss_metadata.json'}",
+                "retrieval:",
+                "  rerank: true",
+                "  rerank_model: lexical",
+                "semantic_cache:",
+                "  enabled: true",
+                "admission:",
+                "  enabled: true",
+                "llm:",
+                f"  base_url: {llm_url}",
+                "  max_retries: 0",
+                "ingestion:",
+                f"  source_path: {tmp / 'docs'}",
+                "  chunk_size: 50",
+                "  chunk_overlap: 5",
+            ]
+        ),
+        encoding="utf-8",
+    )
+    return settings
+
+
+class TutorServiceFactoryTests(unittest.TestCase):
+    def test_builds_configured_service_and_reloads_after_reindex_job(self):
+        with tempfile.TemporaryDirectory() as tmp, MockLLMServer(latency=0.0, token_delay=0.0) as server:
+            tmp_path = Path(tmp)
+            docs = tmp_path / "docs"
+            docs.mkdir()
+            (docs / "join.md").write_text("Use the join recipe to combine two datasets", encoding="utf-8")
+            settings = Settings(str(_write_settings(tmp_path, server.url)))
+            pipeline = IngestionPipeline(settings=settings)
+            pipeline.run_full_reindex()
+
+            embedding_service = TutorServiceFactory.create_embedding_service(settings)
+            service = TutorServiceFactory.create(settings, embedding_service)
+            self.assertIsInstance(service.admission, AdmissionController)
+            self.assertIsInstance(service.semantic_cache, SemanticQueryCache)
+            self.assertEqual(service.semantic_cache.version(), service.retrievers["semantic"].vector_store.version)
+            self.assertIsInstance(service.retrievers["hybrid"], RerankingRetriever)
+
+            response = service.answer(QueryRequest(question="join recipe", mode="keyword"))
+            self.assertEqual([Path(source["source_path"]).name for source in response.sources], ["join.md"])
+
+            (docs / "scenario.md").write_text("Schedule a scenario trigger", encoding="utf-8")
+            manager = ReindexJobManager(
+                pipeline.run_full_reindex,
+                default_source_path=str(docs),
+                nice=0,
+                on_success=lambda job: service.reload(TutorServiceFactory.create_retrievers(settings, embedding_service)),
+            )
+            job = manager.submit()
+            deadline = time.monotonic() + 5
+            while job.status not in {SUCCEEDED, FAILED} and time.monotonic() < deadline:
+                time.sleep(0.01)
+            manager.shutdown()
+            self.assertEqual(job.status, SUCCEEDED, job.error)
+
+            self.assertEqual(len(service.semantic_cache), 0)
+            response = service.answer(QueryRequest(question="scenario trigger", mode="keyword"))
+            self.assertEqual([Path(source["source_path"]).name for source in response.sources], ["scenario.md"])
+            service.close()
+
+
+@unittest.skipUnless(importlib.util.find_spec("fastapi"), "fastapi is not installed")
+class CreateAppQueryTests(unittest.TestCase):
+    def test_query_is_served_by_the_configured_service(self):
+        from fastapi.testclient import TestClient
+
+        from dataiku_tutor.main import create_app
+
+        with tempfile.TemporaryDirectory() as tmp, MockLLMServer(latency=0.0, token_delay=0.0) as server:
+            tmp_path = Path(tmp)
+            (tmp_path / "docs").mkdir()
+            (tmp_path / "docs" / "join.md").write_text("Use the join recipe to combine two datasets", encoding="utf-8")
+            settings = _write_settings(tmp_path, server.url)
+            IngestionPipeline(settings=Settings(str(settings))).run_full_reindex()
+
+            with TestClient(create_app(str(settings))) as client:
+                response = client.post("/query", json={"question": "How do I join two datasets?"})
+
+        self.assertEqual(response.status_code, 200, response.text)
+        body = response.json()
+        self.assertEqual(body["mode"], "hybrid")
+        self.assertEqual(Path(body["sources"][0]["source_path"]).name, "join.md")
+        self.assertTrue(body["answer"])
+
+    def test_fresh_app_reports_serving_index_size_on_metrics(self):
+        from fastapi.testclient import TestClient
+
+        from dataiku_tutor.main import create_app
+        from dataiku_tutor.observability.metrics import METRICS
+
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            (tmp_path / "docs").mkdir()
+            (tmp_path / "docs" / "join.md").write_text("Use the join recipe to combine two datasets", encoding="utf-8")
+            settings = _write_settings(tmp_path, "http://127.0.0.1:9")
+            IngestionPipeline(settings=Settings(str(settings))).run_full_reindex()
+            METRICS.reset()
+
+            with TestClient(create_app(str(settings))) as client:
+                body = client.get("/metrics").text
+
+        self.assertIn("dataiku_tutor_index_vectors 1", body)
+        self.assertRegex(body, r"dataiku_tutor_index_bytes [1-9]")
+
+
+if __name__ == "__main__":
+    unittest.main()